@@ -0,0 +1,177 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import print_function
+
+import argparse
+import json
+import sys
+import time
+
+from vitrage.common.constants import EdgeLabel
+from vitrage.common.constants import EntityCategory
+from vitrage.common import payload_codec
+from vitrage.common.utils import compress_obj
+from vitrage.common.utils import decompress_obj
+from vitrage.datasources.nova.host import NOVA_HOST_DATASOURCE
+from vitrage.datasources.nova.instance import NOVA_INSTANCE_DATASOURCE
+from vitrage.graph.driver.networkx_graph import NXGraph
+from vitrage.graph import utils as graph_utils
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+"""
+Graph Benchmark Tool:
+
+Measures the memory and the time of building, copying and pickling a large
+mock entity graph, and of creating and hashing its elements, e.g. to compare
+changes of the graph elements representation.
+
+Measures also the encoding of its topology by the API handler, the size of
+the encoded topology on the RPC wire and the time it takes the API to turn
+it into a JSON response, per RPC payload codec.
+
+Usage:
+    python -m tools.graph_benchmark.graph_benchmark --hosts 1000 \\
+        --instances-per-host 100 [--memory]
+
+The results are printed as json.
+"""
+
+SAMPLE_TIMESTAMP = '2019-01-01T00:00:00Z'
+
+# tracing the memory slows the allocations, so the times are measured in a
+# separate run
+trace_memory = False
+
+
+def create_elements(hosts, instances_per_host, alarms_per_instance):
+    vertices = []
+    edges = []
+    for h in range(hosts):
+        host_id = 'host-%s' % h
+        vertices.append(graph_utils.create_vertex(
+            host_id, vitrage_category=EntityCategory.RESOURCE,
+            vitrage_type=NOVA_HOST_DATASOURCE, entity_id=host_id,
+            entity_state='available',
+            vitrage_sample_timestamp=SAMPLE_TIMESTAMP))
+        for i in range(instances_per_host):
+            instance_id = '%s-instance-%s' % (host_id, i)
+            vertices.append(graph_utils.create_vertex(
+                instance_id, vitrage_category=EntityCategory.RESOURCE,
+                vitrage_type=NOVA_INSTANCE_DATASOURCE, entity_id=instance_id,
+                entity_state='active', project_id='project-%s' % (i % 10),
+                vitrage_sample_timestamp=SAMPLE_TIMESTAMP))
+            edges.append(graph_utils.create_edge(
+                host_id, instance_id, EdgeLabel.CONTAINS))
+            for a in range(alarms_per_instance):
+                alarm_id = '%s-alarm-%s' % (instance_id, a)
+                vertices.append(graph_utils.create_vertex(
+                    alarm_id, vitrage_category=EntityCategory.ALARM,
+                    vitrage_type='vitrage', entity_id=alarm_id,
+                    vitrage_sample_timestamp=SAMPLE_TIMESTAMP,
+                    metadata={'name': 'alarm-%s' % a,
+                              'severity': 'WARNING'}))
+                edges.append(graph_utils.create_edge(
+                    alarm_id, instance_id, EdgeLabel.ON))
+    return vertices, edges
+
+
+def measure(results, name, func, *args):
+    """Run func, and record its time and the memory it allocated"""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.time()
+    result = func(*args)
+    results[name] = {'seconds': round(time.time() - start, 3)}
+    if trace_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name]['allocated_mb'] = round(current / 1024.0 / 1024, 1)
+        results[name]['peak_mb'] = round(peak / 1024.0 / 1024, 1)
+    return result
+
+
+def build_graph(vertices, edges):
+    graph = NXGraph('benchmark')
+    for v in vertices:
+        graph.add_vertex(v)
+    for e in edges:
+        graph.add_edge(e)
+    return graph
+
+
+def read_elements(graph):
+    vertices = graph.get_vertices()
+    edges = set()
+    for v in vertices:
+        edges.update(graph.get_edges(v.vertex_id))
+    return vertices, edges
+
+
+def pickle_graph(graph):
+    return NXGraph.read_gpickle(graph.write_gpickle())
+
+
+def measure_payloads(results, graph):
+    data = graph.json_output_graph(raw=True)
+
+    # the previous encoding, that the API decodes and encodes to JSON again
+    payload = measure(results, 'encode_compress_obj', compress_obj, data, 1)
+    measure(results, 'respond_compress_obj',
+            lambda p: json.dumps(decompress_obj(p)), payload)
+    results['encode_compress_obj']['wire_bytes'] = len(payload) + 2
+
+    for codec_name in sorted(payload_codec.CODECS):
+        payload = measure(results, 'encode_' + codec_name,
+                          payload_codec.encode, data, codec_name)
+        measure(results, 'respond_' + codec_name,
+                payload_codec.to_json, payload)
+        results['encode_' + codec_name]['wire_bytes'] = \
+            len(json.dumps(payload))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--hosts', type=int, default=200)
+    parser.add_argument('--instances-per-host', type=int, default=100)
+    parser.add_argument('--alarms-per-instance', type=int, default=1)
+    parser.add_argument('--memory', action='store_true',
+                        help='Measure the allocated memory (slower)')
+    args = parser.parse_args()
+
+    global trace_memory
+    trace_memory = args.memory and tracemalloc is not None
+
+    results = {}
+    vertices, edges = measure(results, 'create_elements', create_elements,
+                              args.hosts, args.instances_per_host,
+                              args.alarms_per_instance)
+    graph = measure(results, 'build_graph', build_graph, vertices, edges)
+    del vertices, edges
+    measure(results, 'read_elements', read_elements, graph)
+    measure(results, 'copy_graph', graph.copy)
+    measure(results, 'pickle_graph', pickle_graph, graph)
+    measure_payloads(results, graph)
+    results['vertices'] = graph.num_vertices()
+    results['edges'] = graph.num_edges()
+
+    json.dump(results, sys.stdout, indent=2, sort_keys=True)
+    print()
+
+
+if __name__ == '__main__':
+    main()
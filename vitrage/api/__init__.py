@@ -29,4 +29,8 @@ OPTS = [
                                                          'noauth',
                                                          'keycloak'},
                help='Authentication mode to use.'),
+    cfg.IntOpt('gc_interval', default=60, min=0,
+               help='Minimal interval (in seconds) between full garbage '
+                    'collections after API requests. 0 runs a full '
+                    'collection after every request'),
 ]
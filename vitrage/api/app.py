@@ -42,7 +42,7 @@ APPCONFIGS = {}
 def setup_app(root, conf=None):
     app_hooks = [hooks.ConfigHook(conf),
                  hooks.TranslationHook(),
-                 hooks.GCHook(),
+                 hooks.GCHook(conf),
                  hooks.RPCHook(conf),
                  hooks.ContextHook(),
                  hooks.DBHook(conf),
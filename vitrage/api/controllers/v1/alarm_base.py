@@ -22,7 +22,7 @@ from vitrage.api.controllers.rest import RootRestController
 from vitrage.api.policy import enforce
 from vitrage.common.constants import TenantProps
 from vitrage.common.constants import VertexProperties as Vprops
-from vitrage.common.utils import decompress_obj
+from vitrage.common import payload_codec
 
 LOG = log.getLogger(__name__)
 
@@ -70,7 +70,7 @@ class BaseAlarmsController(RootRestController):
                                       )
 
         try:
-            alarms_list = decompress_obj(alarms)['alarms']
+            alarms_list = payload_codec.decode(alarms)['alarms']
             return alarms_list
 
         except Exception:
@@ -0,0 +1,66 @@
+#  Copyright 2019 - Nokia Corporation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+import json
+
+from oslo_log import log
+import pecan
+from pecan.core import abort
+
+from vitrage.api.controllers.rest import RootRestController
+from vitrage.api.policy import enforce
+
+LOG = log.getLogger(__name__)
+
+
+# noinspection PyBroadException
+class ScenarioCostsController(RootRestController):
+
+    @pecan.expose('json')
+    def get_all(self, **kwargs):
+        enforce("get scenario costs", pecan.request.headers,
+                pecan.request.enforcer, {})
+
+        limit = kwargs.get('limit')
+        LOG.info('received get scenario costs, limit: %s', limit)
+
+        try:
+            costs_json = pecan.request.client.call(
+                pecan.request.context,
+                'get_scenario_costs',
+                limit=int(limit) if limit else None)
+            return json.loads(costs_json)
+        except Exception:
+            LOG.exception('failed to get scenario costs.')
+            abort(404, 'Failed to get scenario costs.')
+
+
+# noinspection PyBroadException
+class MetricsController(RootRestController):
+    scenarios = ScenarioCostsController()
+
+    @pecan.expose('json')
+    def get_all(self):
+        enforce("get metrics", pecan.request.headers,
+                pecan.request.enforcer, {})
+
+        LOG.info('received get metrics')
+
+        try:
+            metrics_json = pecan.request.client.call(pecan.request.context,
+                                                     'get_metrics')
+            return json.loads(metrics_json)
+        except Exception:
+            LOG.exception('failed to get metrics.')
+            abort(404, 'Failed to get metrics.')
@@ -21,7 +21,7 @@ from pecan.core import abort
 from vitrage.api.controllers.rest import RootRestController
 from vitrage.api.controllers.v1 import count
 from vitrage.api.policy import enforce
-from vitrage.common.utils import decompress_obj
+from vitrage.common import payload_codec
 
 LOG = log.getLogger(__name__)
 
@@ -87,7 +87,7 @@ class ResourcesController(RootRestController):
             resource_type=resource_type,
             all_tenants=all_tenants,
             query=query)
-        resources = decompress_obj(resources)['resources']
+        resources = payload_codec.decode(resources)['resources']
         return resources
 
     @pecan.expose('json')
@@ -9,10 +9,9 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
-import gc
-
 from vitrage.api.controllers.v1 import alarm
 from vitrage.api.controllers.v1 import event
+from vitrage.api.controllers.v1 import metrics
 from vitrage.api.controllers.v1 import rca
 from vitrage.api.controllers.v1 import resource
 from vitrage.api.controllers.v1 import service
@@ -23,8 +22,6 @@ from vitrage.api.controllers.v1 import webhook
 
 class V1Controller(object):
 
-    gc.set_threshold(1, 1, 1)
-
     topology = topology.TopologyController()
     resources = resource.ResourcesController()
     alarm = alarm.AlarmsController()
@@ -33,3 +30,4 @@ class V1Controller(object):
     template = template.TemplateController()
     event = event.EventController()
     service = service.ServiceController()
+    metrics = metrics.MetricsController()
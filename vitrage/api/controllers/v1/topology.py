@@ -24,9 +24,9 @@ from pecan.core import abort
 from vitrage.api.controllers.rest import RootRestController
 from vitrage.api.policy import enforce
 from vitrage.common.constants import VertexProperties as VProps
+from vitrage.common import payload_codec
 
 # noinspection PyProtectedMember
-from vitrage.common.utils import decompress_obj
 from vitrage.datasources.transformer_base import CLUSTER_ID
 
 
@@ -77,7 +77,13 @@ class TopologyController(RootRestController):
                                                    query=query,
                                                    root=root,
                                                    all_tenants=all_tenants)
-            graph = decompress_obj(graph_data)
+            if graph_type == 'graph' and payload_codec.is_encoded(graph_data):
+                # forward the graph JSON, without decoding and encoding it
+                pecan.response.text = payload_codec.to_json(graph_data)
+                pecan.response.content_type = 'application/json'
+                return pecan.response
+
+            graph = payload_codec.decode(graph_data)
             if graph_type == 'graph':
                 return graph
             if graph_type == 'tree':
@@ -9,7 +9,6 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
-import gc
 import oslo_messaging
 
 from oslo_context import context
@@ -21,6 +20,7 @@ from vitrage.coordination import coordination
 from vitrage import messaging
 from vitrage import rpc as vitrage_rpc
 from vitrage import storage
+from vitrage.utils import gc as gc_utils
 
 
 class ConfigHook(hooks.PecanHook):
@@ -94,8 +94,11 @@ class DBHook(hooks.PecanHook):
 
 class GCHook(hooks.PecanHook):
 
+    def __init__(self, conf):
+        self.collector = gc_utils.IntervalCollector(conf.api.gc_interval)
+
     def after(self, state):
-        gc.collect()
+        self.collector.maybe_collect()
 
 
 class CoordinatorHook(hooks.PecanHook):
@@ -22,7 +22,7 @@ from vitrage.common.constants import EntityCategory as ECategory
 from vitrage.common.constants import HistoryProps as HProps
 from vitrage.common.constants import TenantProps
 from vitrage.common.constants import VertexProperties as VProps
-from vitrage.common.utils import compress_obj
+from vitrage.common import payload_codec
 from vitrage.datasources.alarm_properties import AlarmProperties as AProps
 from vitrage.entity_graph.mappings.operational_alarm_severity import \
     OperationalAlarmSeverity
@@ -52,7 +52,7 @@ class AlarmApis(base.EntityGraphApisBase):
 
         alarms = self._get_alarms(*args, **kwargs)
         data = {'alarms': [v.payload for v in alarms]}
-        return compress_obj(data, level=1)
+        return payload_codec.encode(data, self.conf.rpc_payload_codec)
 
     # TODO(annarez): add db support
     @base.lock_graph
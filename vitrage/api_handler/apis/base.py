@@ -11,19 +11,25 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+from collections import OrderedDict
 import functools
+import json
 from oslo_log import log
 
 from vitrage.common.constants import EdgeProperties as EProps
 from vitrage.common.constants import EntityCategory
+from vitrage.common.constants import TenantProps
 from vitrage.common.constants import VertexProperties as VProps
 from vitrage.datasources.nova.host import NOVA_HOST_DATASOURCE
 from vitrage.datasources.nova.instance import NOVA_INSTANCE_DATASOURCE
 from vitrage.datasources.nova.zone import NOVA_ZONE_DATASOURCE
 from vitrage.datasources import OPENSTACK_CLUSTER
+from vitrage.metrics import registry as metrics
 
 LOG = log.getLogger(__name__)
 
+MAX_CACHED_RESPONSES = 100
+
 
 # Used for Sunburst to show only specific resources
 TREE_TOPOLOGY_QUERY = {
@@ -81,6 +87,25 @@ class EntityGraphApisBase(object):
         self.conf = conf
         self.db = db
         self.api_lock = api_lock
+        self._responses = OrderedDict()
+        self._responses_version = None
+
+    def _get_cached_response(self, key):
+        version = self.entity_graph.version
+        if version != self._responses_version:
+            # the graph has changed since the responses were cached
+            self._responses.clear()
+            self._responses_version = version
+            return None
+        response = self._responses.pop(key, None)
+        if response is not None:
+            self._responses[key] = response
+        return response
+
+    def _cache_response(self, key, response):
+        self._responses[key] = response
+        while len(self._responses) > MAX_CACHED_RESPONSES:
+            self._responses.popitem(last=False)
 
     @classmethod
     def _get_query_with_project(cls, vitrage_category, project_id, is_admin):
@@ -136,6 +161,35 @@ class EntityGraphApisBase(object):
         return query_with_project_id
 
 
+def cache_response(f):
+    """Cache the responses of a read-only api until the graph changes
+
+    Identical queries, e.g. of the dashboards of many users, are answered
+    from the cache. The responses are cached per api, arguments and tenant,
+    and are dropped on the first graph change after they were cached.
+    Must be used inside lock_graph, and the responses must not be modified.
+    """
+    @functools.wraps(f)
+    def api_backend_func(self, ctx, *args, **kwargs):
+        try:
+            key = (json.dumps([args, kwargs], sort_keys=True),
+                   ctx.get(TenantProps.TENANT, None),
+                   ctx.get(TenantProps.IS_ADMIN, False))
+        except TypeError:
+            return f(self, ctx, *args, **kwargs)
+
+        key = (f.__name__,) + key
+        response = self._get_cached_response(key)
+        if response is not None:
+            metrics.increment('api_cache_hits', f.__name__)
+            return response
+        metrics.increment('api_cache_misses', f.__name__)
+        response = f(self, ctx, *args, **kwargs)
+        self._cache_response(key, response)
+        return response
+    return api_backend_func
+
+
 def lock_graph(f):
     @functools.wraps(f)
     def api_backend_func(*args, **kwargs):
@@ -12,8 +12,14 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import json
+import os
+
 from oslo_log import log
 
+from vitrage.evaluator import scenario_costs
+from vitrage.metrics import registry as metrics
+
 LOG = log.getLogger(__name__)
 
 
@@ -31,3 +37,29 @@ class OperationalApis(object):
             LOG.exception("is_alive check failed.")
         LOG.warning("Api during initialization - graph not ready")
         return False
+
+    def get_metrics(self, ctx):
+        """The metrics of all the vitrage-graph processes
+
+        Every process periodically dumps its metrics to the metrics folder.
+        The metrics of this process are taken as they are now.
+        """
+        LOG.debug('OperationalApis get_metrics')
+        return json.dumps(self._get_metrics_snapshots())
+
+    def get_scenario_costs(self, ctx, limit=None):
+        """The costs of the scenarios, the most expensive first"""
+        LOG.debug('OperationalApis get_scenario_costs')
+        costs = scenario_costs.get_scenario_costs(
+            self._get_metrics_snapshots())
+        return json.dumps(scenario_costs.top_scenarios(costs, limit))
+
+    def _get_metrics_snapshots(self):
+        snapshots = []
+        interval = self.conf.metrics.dump_interval
+        if interval:
+            snapshots = [d for d in metrics.load_dumps(
+                self.conf.metrics.dump_folder, 3 * interval)
+                if d.get('pid') != os.getpid()]
+        snapshots.append(metrics.snapshot())
+        return sorted(snapshots, key=lambda d: d.get('service') or '')
@@ -21,7 +21,7 @@ from vitrage.api_handler.apis.base import RESOURCES_ALL_QUERY
 from vitrage.common.constants import EntityCategory
 from vitrage.common.constants import TenantProps
 from vitrage.common.constants import VertexProperties as VProps
-from vitrage.common.utils import compress_obj
+from vitrage.common import payload_codec
 from vitrage.common.utils import timed_method
 
 LOG = log.getLogger(__name__)
@@ -36,6 +36,7 @@ class ResourceApis(base.EntityGraphApisBase):
 
     @timed_method(log_results=True)
     @base.lock_graph
+    @base.cache_response
     def get_resources(self, ctx, resource_type=None, all_tenants=False,
                       query=None):
         LOG.debug(
@@ -48,10 +49,11 @@ class ResourceApis(base.EntityGraphApisBase):
         query = self._get_query(ctx, resource_type, all_tenants, query)
         resources = self.entity_graph.get_vertices(query_dict=query)
         data = {'resources': [r.properties for r in resources]}
-        return compress_obj(data, level=1)
+        return payload_codec.encode(data, self.conf.rpc_payload_codec)
 
     @timed_method(log_results=True)
     @base.lock_graph
+    @base.cache_response
     def count_resources(self, ctx, resource_type=None, all_tenants=False,
                         query=None, group_by=None):
         LOG.debug(
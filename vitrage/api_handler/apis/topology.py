@@ -23,7 +23,7 @@ from vitrage.common.constants import EntityCategory
 from vitrage.common.constants import TenantProps
 from vitrage.common.constants import VertexProperties as VProps
 from vitrage.common.exception import VitrageError
-from vitrage.common.utils import compress_obj
+from vitrage.common import payload_codec
 from vitrage.common.utils import timed_method
 from vitrage.datasources import OPENSTACK_CLUSTER
 
@@ -36,9 +36,12 @@ class TopologyApis(base.EntityGraphApisBase):
 
     def __init__(self, entity_graph, conf, api_lock):
         super(TopologyApis, self).__init__(entity_graph, conf, api_lock)
+        self._root_id = None
+        self._root_id_version = None
 
     @timed_method(log_results=True)
     @base.lock_graph
+    @base.cache_response
     def get_topology(self, ctx, graph_type, depth, query, root, all_tenants):
         LOG.debug("TopologyApis get_topology - root: %s, all_tenants=%s",
                   root, all_tenants)
@@ -84,7 +87,7 @@ class TopologyApis(base.EntityGraphApisBase):
                     root_id)
 
         data = graph.json_output_graph(raw=True)
-        return compress_obj(data, level=1)
+        return payload_codec.encode(data, self.conf.rpc_payload_codec)
 
     def _get_topology_for_specific_project(self,
                                            query,
@@ -193,6 +196,13 @@ class TopologyApis(base.EntityGraphApisBase):
         return vertices_ids
 
     def _default_root_id(self):
+        version = self.entity_graph.version
+        if version != self._root_id_version:
+            self._root_id = self._find_root_id()
+            self._root_id_version = version
+        return self._root_id
+
+    def _find_root_id(self):
         tmp_vertices = self.entity_graph.get_vertices(
             vertex_attr_filter={VProps.VITRAGE_TYPE: OPENSTACK_CLUSTER})
         if not tmp_vertices:
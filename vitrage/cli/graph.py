@@ -19,7 +19,10 @@ from vitrage.cli import VITRAGE_TITLE
 from vitrage.common.utils import spawn
 from vitrage.entity_graph.graph_init import VitrageGraphInit
 from vitrage.entity_graph.workers import GraphWorkersManager
+from vitrage.metrics import registry as metrics
+from vitrage.metrics import sampling_profiler
 from vitrage import service
+from vitrage.utils import gc as gc_utils
 
 LOG = log.getLogger(__name__)
 
@@ -31,6 +34,7 @@ def main():
     LOG.info(VITRAGE_TITLE)
 
     workers = GraphWorkersManager(conf)
+    sampling_profiler.register_signal(conf)
     spawn(init, conf, workers)
     workers.run()
 
@@ -39,6 +43,9 @@ def init(conf, workers):
     # Because fork duplicates the process memory.
     # We should only create master process resources after workers are forked.
     workers.wait_for_worker_start()
+    metrics.setup(conf, 'vitrage-graph')
+    gc_utils.register_pause_metrics()
+    workers.register_queue_gauges()
     VitrageGraphInit(conf, workers).run()
 
 if __name__ == "__main__":
@@ -26,6 +26,7 @@ class VertexProperties(ElementProperties):
     VITRAGE_STATE = 'vitrage_state'
     VITRAGE_IS_PLACEHOLDER = 'vitrage_is_placeholder'
     VITRAGE_SAMPLE_TIMESTAMP = 'vitrage_sample_timestamp'
+    VITRAGE_SAMPLE_EPOCH = 'vitrage_sample_epoch'
     VITRAGE_AGGREGATED_STATE = 'vitrage_aggregated_state'
     VITRAGE_OPERATIONAL_STATE = 'vitrage_operational_state'
     VITRAGE_AGGREGATED_SEVERITY = 'vitrage_aggregated_severity'
@@ -0,0 +1,101 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Encoding of the large responses of the API handler
+
+A response is encoded once to JSON, and the JSON text is sent on the RPC
+wire, possibly compressed, together with the name of its codec:
+
+    {'codec': 'json', 'data': '{"nodes": [...], "links": [...]}'}
+
+So the API may forward the JSON text to its client without decoding and
+encoding it again.
+"""
+
+import base64
+import json
+import zlib
+
+from oslo_serialization import jsonutils
+
+from vitrage.common.exception import VitrageError
+from vitrage.common.utils import decompress_obj
+
+CODEC = 'codec'
+DATA = 'data'
+
+
+class JsonCodec(object):
+    """The JSON text as is, for an API that runs next to the graph"""
+
+    @staticmethod
+    def encode(text):
+        return text
+
+    @staticmethod
+    def decode(data):
+        return data
+
+
+class ZlibCodec(object):
+    """The JSON text compressed, for an API that runs on other hosts
+
+    The RPC messages are JSON themselves, so the compressed data is base64
+    encoded.
+    """
+
+    LEVEL = 1
+
+    @classmethod
+    def encode(cls, text):
+        compressed = zlib.compress(text.encode('utf-8'), cls.LEVEL)
+        return base64.b64encode(compressed).decode('ascii')
+
+    @staticmethod
+    def decode(data):
+        return zlib.decompress(base64.b64decode(data)).decode('utf-8')
+
+
+CODECS = {
+    'json': JsonCodec,
+    'zlib': ZlibCodec,
+}
+
+
+def encode(obj, codec_name='zlib'):
+    text = jsonutils.dumps(obj, separators=(',', ':'))
+    return {CODEC: codec_name, DATA: _get_codec(codec_name).encode(text)}
+
+
+def decode(payload):
+    if not is_encoded(payload):
+        # a response of a previous version
+        return decompress_obj(payload)
+    return json.loads(to_json(payload))
+
+
+def to_json(payload):
+    """The JSON text of an encoded payload, without decoding it"""
+    return _get_codec(payload[CODEC]).decode(payload[DATA])
+
+
+def is_encoded(payload):
+    return isinstance(payload, dict) and CODEC in payload
+
+
+def _get_codec(codec_name):
+    codec = CODECS.get(codec_name)
+    if not codec:
+        raise VitrageError('Unknown payload codec %s' % codec_name)
+    return codec
@@ -14,6 +14,7 @@ import itertools
 
 from vitrage.common.policies import alarms
 from vitrage.common.policies import event
+from vitrage.common.policies import metrics
 from vitrage.common.policies import rca
 from vitrage.common.policies import resource
 from vitrage.common.policies import service
@@ -32,4 +33,5 @@ def list_rules():
         resource.list_rules(),
         webhook.list_rules(),
         service.list_rules(),
+        metrics.list_rules(),
     )
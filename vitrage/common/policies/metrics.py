@@ -0,0 +1,51 @@
+#  Copyright 2019 - Nokia Corporation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+from oslo_policy import policy
+
+from vitrage.common.policies import base
+
+METRICS = 'get metrics'
+SCENARIO_COSTS = 'get scenario costs'
+
+rules = [
+    policy.DocumentedRuleDefault(
+        name=METRICS,
+        check_str=base.ROLE_ADMIN,
+        description='Get the processing metrics of the vitrage-graph '
+                    'processes',
+        operations=[
+            {
+                'path': '/metrics',
+                'method': 'GET'
+            }
+        ]
+    ),
+    policy.DocumentedRuleDefault(
+        name=SCENARIO_COSTS,
+        check_str=base.ROLE_ADMIN,
+        description='Get the evaluation costs of the scenarios, the most '
+                    'expensive first',
+        operations=[
+            {
+                'path': '/metrics/scenarios',
+                'method': 'GET'
+            }
+        ]
+    )
+]
+
+
+def list_rules():
+    return rules
@@ -18,6 +18,7 @@
 # under the License.
 import base64
 from collections import defaultdict
+from collections import OrderedDict
 import copy
 import hashlib
 import itertools
@@ -155,3 +156,41 @@ def decompress_obj(blob):
     del decoded_blob
     del str_data
     return obj
+
+
+class TTLCache(object):
+    """A thread safe LRU cache whose entries expire after a time to live"""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            expiration, value = entry
+            if expiration < time.time():
+                return default
+            self._entries[key] = entry
+            return value
+
+    def put(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            while len(self._entries) >= self.max_size:
+                self._entries.popitem(last=False)
+            self._entries[key] = (time.time() + ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
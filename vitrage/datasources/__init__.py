@@ -53,4 +53,19 @@ OPTS = [
     cfg.StrOpt('notification_exchange',
                required=False,
                help='Exchange that is used for notifications.'),
+    cfg.IntOpt('notification_batch_size',
+               default=100,
+               min=1,
+               help='Maximal number of notifications that are enriched and '
+                    'processed together'),
+    cfg.IntOpt('notification_batch_timeout',
+               default=1,
+               min=0,
+               help='Maximal number of seconds to wait for a batch of '
+                    'notifications to fill up'),
+    cfg.IntOpt('notification_enrich_workers',
+               default=10,
+               min=1,
+               help='Number of threads that enrich the notifications of a '
+                    'batch concurrently'),
 ]
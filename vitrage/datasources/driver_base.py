@@ -99,6 +99,22 @@ class DriverBase(object):
 
         pass
 
+    @staticmethod
+    def get_event_entity_id(event):
+        """Return the id of the entity that a notification refers to
+
+        When notifications are handled in batches, a notification is
+        superseded by a later notification of the same event type with the
+        same entity id, and it is neither enriched nor processed. Drivers
+        whose enriched events depend only on the latest notification of an
+        entity can return its id here.
+
+        :param event: the event received by oslo
+        :return: the entity id, or None if the notification is never
+        superseded
+        """
+        return None
+
     @staticmethod
     def get_event_types():
         """Return a list of all event types relevant to this datasource
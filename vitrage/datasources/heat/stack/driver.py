@@ -89,6 +89,12 @@ class HeatStackDriver(DriverBase):
             DatasourceAction.UPDATE,
             *self.properties_to_filter_out())[0]
 
+    @staticmethod
+    def get_event_entity_id(event):
+        # The stack and its resources are retrieved when enriching, so only
+        # the latest notification of a stack matters
+        return event.get('stack_identity')
+
     def _is_nested_stack(self, _id):
         return self.client.stacks.get(_id).to_dict()['parent']
 
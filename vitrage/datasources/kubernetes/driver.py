@@ -12,9 +12,9 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-from kubernetes import client
-from kubernetes import config
 from oslo_log import log
+from oslo_utils import importutils as utils
+
 from vitrage.datasources.driver_base import DriverBase
 from vitrage.datasources.kubernetes.properties import KUBERNETES_DATASOURCE
 from vitrage.datasources.kubernetes.properties import KubernetesProperties\
@@ -28,6 +28,7 @@ class KubernetesDriver(DriverBase):
     def __init__(self, conf):
         super(KubernetesDriver, self).__init__()
         self._client = None
+        self._cached_nodes = {}
         self.conf = conf
 
     @property
@@ -43,6 +44,10 @@ class KubernetesDriver(DriverBase):
                 LOG.warning('kubernetes config file is not defined')
                 return
 
+            # the kubernetes client is needed only by this datasource
+            config = utils.import_module('kubernetes.config')
+            client = utils.import_module('kubernetes.client')
+
             kubeconf = conf.kubernetes.config_file
             config.load_kube_config(config_file=kubeconf)
             k8s_client = client.CoreV1Api()
@@ -55,21 +60,59 @@ class KubernetesDriver(DriverBase):
             LOG.exception('Create k8s client - Got Exception')
 
     def get_all(self, datasource_action):
-        return self.make_pickleable(self._prepare_entities(
-                                    self.client.list_node()),
+        nodes = self.client.list_node()
+        self._cache_nodes(nodes)
+        return self.make_pickleable(self._prepare_entities(),
+                                    KUBERNETES_DATASOURCE,
+                                    datasource_action)
+
+    def get_changes(self, datasource_action):
+        nodes = self.client.list_node()
+        if not self._cache_nodes(nodes):
+            return []
+        return self.make_pickleable(self._prepare_entities(),
                                     KUBERNETES_DATASOURCE,
                                     datasource_action)
 
-    def _prepare_entities(self, nodes):
-        entities = []
+    def _cache_nodes(self, nodes):
+        """Cache the details of the nodes by their uid
+
+        The details of a node are built again only if its resourceVersion
+        changed, and the kubelets update the status of their nodes all the
+        time, so a node counts as changed only if its details changed.
+
+        :return: whether a node was added, removed or changed
+        """
+        changed = False
+        cached_nodes = {}
         for item in nodes.items:
             metadata = item.metadata
-            node_details = {
-                kubProp.NAME: metadata.name,
-                kubProp.UID: metadata.uid,
-                kubProp.CREATION_TIMESTAMP: metadata.creation_timestamp,
-                kubProp.EXTERNALID: item.spec.external_id,
-                kubProp.PROVIDER_NAME: item.spec.provider_id.split(":///")[0],
-                }
-            entities.append(node_details)
+            cached = self._cached_nodes.get(metadata.uid)
+            if cached and cached[0] == metadata.resource_version:
+                cached_nodes[metadata.uid] = cached
+                continue
+
+            node_details = self._get_node_details(item)
+            changed = changed or not cached or cached[1] != node_details
+            cached_nodes[metadata.uid] = \
+                (metadata.resource_version, node_details)
+
+        changed = changed or len(cached_nodes) != len(self._cached_nodes)
+        self._cached_nodes = cached_nodes
+        return changed
+
+    @staticmethod
+    def _get_node_details(item):
+        metadata = item.metadata
+        return {
+            kubProp.NAME: metadata.name,
+            kubProp.UID: metadata.uid,
+            kubProp.CREATION_TIMESTAMP: metadata.creation_timestamp,
+            kubProp.EXTERNALID: item.spec.external_id,
+            kubProp.PROVIDER_NAME: item.spec.provider_id.split(":///")[0],
+        }
+
+    def _prepare_entities(self):
+        entities = [dict(node_details) for _, node_details
+                    in self._cached_nodes.values()]
         return [{'resources': entities}]
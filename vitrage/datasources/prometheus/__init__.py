@@ -45,4 +45,19 @@ OPTS = [
     cfg.StrOpt(PGAProps.RECEIVER,
                help='Receiver configured in Prometheus Alertmanager to send '
                     'alerts to Vitrage'),
+    cfg.IntOpt('ip_resolve_cache_ttl',
+               default=300,
+               min=0,
+               help='Number of seconds to cache the host name or instance id '
+                    'that an ip label value was resolved to. 0 disables '
+                    'the cache'),
+    cfg.IntOpt('ip_resolve_negative_cache_ttl',
+               default=60,
+               min=0,
+               help='Number of seconds to cache an ip label value that could '
+                    'not be resolved'),
+    cfg.IntOpt('ip_resolve_cache_size',
+               default=10000,
+               min=0,
+               help='Maximal number of cached ip label values'),
 ]
@@ -25,6 +25,7 @@ from vitrage.common.constants import DatasourceAction
 from vitrage.common.constants import DatasourceOpts as DSOpts
 from vitrage.common.constants import DatasourceProperties as DSProps
 from vitrage.common.constants import EventProperties as EProps
+from vitrage.common.utils import TTLCache
 from vitrage.datasources.alarm_driver_base import AlarmDriverBase
 from vitrage.datasources.prometheus import PROMETHEUS_DATASOURCE
 from vitrage.datasources.prometheus.properties import get_alarm_update_time
@@ -138,6 +139,11 @@ class PrometheusDriver(AlarmDriverBase):
         self._client = None
         self._nova_client = None
         self.conf_map = self._configuration_mapping(conf)
+        self._conf_index = self._build_conf_index(self.conf_map)
+        self._ip_cache = TTLCache(conf.prometheus.ip_resolve_cache_size,
+                                  conf.prometheus.ip_resolve_cache_ttl)
+        self._negative_cache_ttl = \
+            conf.prometheus.ip_resolve_negative_cache_ttl
 
     @property
     def nova_client(self):
@@ -271,20 +277,34 @@ class PrometheusDriver(AlarmDriverBase):
                                     DatasourceAction.UPDATE)
 
     def _enrich_alerts(self, alerts, event_type):
-        return [self._enrich_alert(alert, event_type) for alert in alerts]
+        resolved_ips = self._resolve_ips(self._get_alerts_ips(alerts))
+        return [self._enrich_alert(alert, event_type, resolved_ips)
+                for alert in alerts]
 
-    def _enrich_alert(self, alert, event_type):
+    def _get_alerts_ips(self, alerts):
+        ips = set()
+        for alert in alerts:
+            for prometheus_label in self._get_conf_resource(alert).values():
+                try:
+                    ips.add(str(self._validate_ip(
+                        str(get_label(alert, prometheus_label)))))
+                except ValueError:
+                    pass
+        return ips
+
+    def _enrich_alert(self, alert, event_type, resolved_ips=None):
         """Enrich prometheus alert.
 
         Adding fields to prometheus alert in order to map it to vitrage entity.
 
         :param alert: Prometheus alert
         :param event_type: The type of the event. Always 'prometheus.alert'.
+        :param resolved_ips: dict of the ips that were already resolved
         :return: Enriched prometheus alert
         """
         alert[DSProps.EVENT_TYPE] = event_type
         vitrage_entity_unique_props = \
-            self._calculate_vitrage_entity_unique_props(alert)
+            self._calculate_vitrage_entity_unique_props(alert, resolved_ips)
         alert[PDProps.ENTITY_UNIQUE_PROPS] = \
             vitrage_entity_unique_props
         old_alarm = self._old_alarm(alert)
@@ -294,13 +314,15 @@ class PrometheusDriver(AlarmDriverBase):
             get_alarm_update_time(alert))
         return alert
 
-    def _calculate_vitrage_entity_unique_props(self, alert):
+    def _calculate_vitrage_entity_unique_props(self, alert,
+                                               resolved_ips=None):
         """Build a vitrage entity unique props.
 
         The unique props are based on the alert and the conf file.
 
         :param alert: Prometheus alert
         :type alert: dict
+        :param resolved_ips: dict of the ips that were already resolved
         :return: Unique properties of vitrage entity
         ":rtype: dict
 
@@ -314,10 +336,10 @@ class PrometheusDriver(AlarmDriverBase):
             prometheus_label = resource_labels[vitrage_label]
             label_value = str(get_label(alert, prometheus_label))
             vitrage_entity_unique_props[vitrage_label] = \
-                self._adjust_label_value(label_value)
+                self._adjust_label_value(label_value, resolved_ips)
         return vitrage_entity_unique_props
 
-    def _adjust_label_value(self, label_value):
+    def _adjust_label_value(self, label_value, resolved_ips=None):
         """Adjust the given value of the alert's label
 
         First check if the value is ip.
@@ -327,6 +349,8 @@ class PrometheusDriver(AlarmDriverBase):
 
         :param label_value: Value of alert's label
         :type label_value: str
+        :param resolved_ips: dict of the ips that were already resolved,
+        the other ips are resolved now
         :return: Adjusted label's value of the alert as described.
         :rtype: str
 
@@ -338,26 +362,86 @@ class PrometheusDriver(AlarmDriverBase):
             try:
                 # Check if the value is ip
                 ip = str(self._validate_ip(label_value))
-                try:
-                    # Get hostname of the ip
-                    entity_hostname = socket.gethostbyaddr(ip)
-                    label_value = entity_hostname[0]
-
-                except socket.error:
-                    # If not ip of a host
-                    nova_instance = self.nova_client.servers.list(
-                        search_opts={'all_tenants': 1, 'ip': ip})
-                    if nova_instance:
-                        label_value = nova_instance[0].id
-                    else:
-                        label_value = ip
-
+                if resolved_ips is None or ip not in resolved_ips:
+                    resolved_ips = self._resolve_ips([ip])
+                label_value = resolved_ips[ip]
             except ValueError:
                 # If not ip value, leave it as is
                 pass
 
         return label_value
 
+    def _resolve_ips(self, ips):
+        """Resolve ips to their hostnames, or to ids of nova instances
+
+        The resolved values are cached, and so are the ips that could not be
+        resolved, for a shorter time. The ips that are not hostnames are
+        looked up in nova.
+
+        :return: dict of ip to its hostname, instance id or the ip itself
+        """
+        resolved = {}
+        unresolved = []
+        for ip in ips:
+            value = self._ip_cache.get(ip)
+            if value is not None:
+                resolved[ip] = value
+                continue
+            try:
+                # Get hostname of the ip
+                resolved[ip] = socket.gethostbyaddr(ip)[0]
+                self._ip_cache.put(ip, resolved[ip])
+            except socket.error:
+                # If not ip of a host
+                unresolved.append(ip)
+
+        if unresolved:
+            instance_ids = self._get_instance_ids_by_ips(unresolved)
+            for ip in unresolved:
+                instance_id = instance_ids.get(ip)
+                if instance_id:
+                    resolved[ip] = instance_id
+                    self._ip_cache.put(ip, instance_id)
+                else:
+                    resolved[ip] = ip
+                    self._ip_cache.put(ip, ip, self._negative_cache_ttl)
+        return resolved
+
+    def _get_instance_ids_by_ips(self, ips):
+        """Get the ids of the nova instances that have the given ips
+
+        Every ip is searched in its own call. Nova matches the ip search
+        option as a regular expression, but when neutron has the
+        ip-substring-filtering extension, nova matches it as a substring of
+        the port ips instead, so several ips can not be searched together.
+        """
+        instance_ids = {}
+        for ip in ips:
+            instance_id = self._get_instance_id_by_ip(ip)
+            if instance_id:
+                instance_ids[ip] = instance_id
+        return instance_ids
+
+    def _get_instance_id_by_ip(self, ip):
+        try:
+            instances = self.nova_client.servers.list(
+                search_opts={'all_tenants': 1, 'ip': ip}) or []
+        except Exception:
+            LOG.exception('Failed to get nova instances by ip %s', ip)
+            return None
+
+        # the search matches other ips that contain this ip as well
+        has_addresses = False
+        for instance in instances:
+            addresses = getattr(instance, 'addresses', None) or {}
+            for network_addresses in addresses.values():
+                has_addresses = True
+                for address in network_addresses:
+                    if address.get('addr') == ip:
+                        return instance.id
+        if instances and not has_addresses:
+            return instances[0].id
+
     def _get_resource_alert_values(self, alert):
         """Get values of the alert labels from alert's resource in config file.
 
@@ -389,15 +473,38 @@ class PrometheusDriver(AlarmDriverBase):
         For the example above. The function returns:
           {u'instance_name': u'domain', u'host_id': u'instance'}
         """
-        if self.conf_map:
-            for conf_alert in self.conf_map:
-                alert_key = conf_alert[PCFProps.KEY].items()
-                alert_labels = alert[PAlertProps.LABELS].items()
-                match = set(alert_key).issubset(set(alert_labels))
-                if match:
-                    return conf_alert[PCFProps.RESOURCE]
+        labels = alert[PAlertProps.LABELS]
+        candidates = self._conf_index.get(
+            labels.get(PAlertLabels.ALERT_NAME), self._conf_index[None])
+        for alert_key, resource in candidates:
+            if all(label in labels and labels[label] == value
+                   for label, value in alert_key):
+                return resource
         return {}
 
+    @staticmethod
+    def _build_conf_index(conf_map):
+        """Index the conf file alerts by the alert name in their key
+
+        :return: dict of alert name to the conf alerts that might match an
+        alert with this name, in the conf file order. The conf alerts without
+        an alert name in their key are indexed under None.
+        """
+        conf_alerts = [(list(conf_alert[PCFProps.KEY].items()),
+                        conf_alert[PCFProps.RESOURCE])
+                       for conf_alert in conf_map or []]
+        alert_names = set(dict(alert_key).get(PAlertLabels.ALERT_NAME)
+                          for alert_key, resource in conf_alerts)
+        alert_names.add(None)
+
+        conf_index = {}
+        for alert_name in alert_names:
+            conf_index[alert_name] = \
+                [(alert_key, resource) for alert_key, resource in conf_alerts
+                 if dict(alert_key).get(PAlertLabels.ALERT_NAME)
+                 in (alert_name, None)]
+        return conf_index
+
     @staticmethod
     def _validate_ip(value):
         """Check if the value is ip address.
@@ -12,9 +12,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from collections import OrderedDict
 from itertools import chain
 from jsonschema import validate
-from six.moves import reduce
+import os
 
 from oslo_log import log
 
@@ -39,6 +40,8 @@ class StaticDriver(DriverBase):
         super(StaticDriver, self).__init__()
         self.cfg = conf
         self.entities_cache = []
+        # path -> (file stamp, entities) of the files that were parsed
+        self._files_cache = OrderedDict()
 
     @staticmethod
     def _is_valid_config(config, path):
@@ -73,20 +76,25 @@ class StaticDriver(DriverBase):
         return True
 
     def _get_and_cache_all_entities(self):
+        self._read_files()
         self.entities_cache = self._get_all_entities()
         return self.entities_cache
 
     def _get_all_entities(self):
-        files = file_utils.list_files(self.cfg.static.directory, '.yaml', True)
-        return list(reduce(chain, [self._get_entities_from_file(path)
-                                   for path in files], []))
+        return list(chain.from_iterable(
+            entities for _, entities in self._files_cache.values()))
 
     def _get_and_cache_changed_entities(self):
+        if not self._read_files():
+            return []
+
         changed_entities = []
         new_entities = self._get_all_entities()
+        old_entities_index = self._index(self.entities_cache)
+        new_entities_index = self._index(new_entities)
 
-        for new_entity in new_entities:
-            old_entity = self._find_entity(new_entity, self.entities_cache)
+        for key, new_entity in new_entities_index.items():
+            old_entity = old_entities_index.get(key)
 
             if old_entity:
                 # Add modified entities
@@ -97,8 +105,8 @@ class StaticDriver(DriverBase):
                 changed_entities.append(new_entity.copy())
 
         # Add deleted entities
-        for old_entity in self.entities_cache:
-            if not self._find_entity(old_entity, new_entities):
+        for key, old_entity in old_entities_index.items():
+            if key not in new_entities_index:
                 old_entity_copy = old_entity.copy()
                 old_entity_copy[DSProps.EVENT_TYPE] = GraphAction.DELETE_ENTITY
                 changed_entities.append(old_entity_copy)
@@ -106,6 +114,46 @@ class StaticDriver(DriverBase):
         self.entities_cache = new_entities
         return changed_entities
 
+    def _read_files(self):
+        """Parse the files that were added or modified since the last read
+
+        A file is considered modified if its modification time, size or
+        inode changed, so an unchanged file costs a single stat.
+
+        :return: whether any file was added, modified or removed
+        """
+        files = file_utils.list_files(self.cfg.static.directory, '.yaml', True)
+        changed = len(files) != len(self._files_cache)
+        files_cache = OrderedDict()
+        for path in sorted(files):
+            stamp = self._get_file_stamp(path)
+            cached = self._files_cache.get(path)
+            if stamp and cached and cached[0] == stamp:
+                files_cache[path] = cached
+            else:
+                LOG.debug('Reading static datasource file %s', path)
+                files_cache[path] = \
+                    (stamp, self._get_entities_from_file(path))
+                changed = True
+        self._files_cache = files_cache
+        return changed
+
+    @staticmethod
+    def _get_file_stamp(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size, stat.st_ino
+
+    @staticmethod
+    def _index(entities):
+        entities_index = {}
+        for entity in entities:
+            key = (entity[StaticFields.TYPE], entity[StaticFields.ID])
+            entities_index.setdefault(key, entity)
+        return entities_index
+
     @classmethod
     def _get_entities_from_file(cls, path):
         config = file_utils.load_yaml_file(path)
@@ -127,7 +175,7 @@ class StaticDriver(DriverBase):
             cls._pack_entity(entities_dict, entity)
         for rel in relationships:
             cls._pack_rel(entities_dict, rel)
-        return entities_dict.values()
+        return list(entities_dict.values())
 
     @classmethod
     def _pack_entity(cls, entities_dict, entity):
@@ -178,15 +226,6 @@ class StaticDriver(DriverBase):
             return None
         return rel
 
-    @staticmethod
-    def _find_entity(search_entity, entities):
-        # naive implementation since we don't expect many static entities
-        for entity in entities:
-            if entity[StaticFields.TYPE] == search_entity[StaticFields.TYPE] \
-                    and entity[StaticFields.ID] == \
-                    search_entity[StaticFields.ID]:
-                return entity
-
     @staticmethod
     def _equal_entities(old_entity, new_entity):
         # TODO(iafek): compare also the relationships
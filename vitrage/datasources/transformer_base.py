@@ -219,6 +219,9 @@ class TransformerBase(object):
     def _create_update_neighbors(self, entity_event):
         return []
 
+    def get_entity_key(self, entity_event):
+        return self._create_entity_key(entity_event)
+
     @abc.abstractmethod
     def _create_entity_key(self, entity_event):
         """Create an entity key from given event
@@ -38,14 +38,12 @@ class TroveClusterDriver(TroveDriverBase):
         # TODO(bzurkowski): Add all_tenants option to Trove client
         return self.extract_entities(self.client.clusters.list())
 
-    def _find_entity(self, search_entity, entities):
-        for entity in entities:
-            if entity[TProps.ID] == search_entity[TProps.ID]:
-                return entity
+    def _get_entity_id(self, entity):
+        return entity[TProps.ID]
 
     def _equal_entities(self, old_entity, new_entity):
         old_state = extract_field_value(old_entity, *TProps.STATE)
-        new_state = extract_field_value(old_entity, *TProps.STATE)
+        new_state = extract_field_value(new_entity, *TProps.STATE)
         return old_entity[TProps.ID] == new_entity[TProps.ID] and \
             old_entity[TProps.NAME] == new_entity[TProps.NAME] and \
             old_state == new_state
@@ -38,10 +38,8 @@ class TroveInstanceDriver(TroveDriverBase):
         return self.extract_entities(
             self.client.instances.list(include_clustered=True, detailed=True))
 
-    def _find_entity(self, search_entity, entities):
-        for entity in entities:
-            if entity[TProps.ID] == search_entity[TProps.ID]:
-                return entity
+    def _get_entity_id(self, entity):
+        return entity[TProps.ID]
 
     def _equal_entities(self, old_entity, new_entity):
         return old_entity[TProps.ID] == new_entity[TProps.ID] and \
@@ -27,7 +27,7 @@ class TroveDriverBase(DriverBase):
         super(TroveDriverBase, self).__init__()
         self.conf = conf
         self.__client = None
-        self.__cached_entities = []
+        self.__cached_entities = {}
 
     @property
     def client(self):
@@ -48,33 +48,36 @@ class TroveDriverBase(DriverBase):
                                     *self.properties_to_filter_out())
 
     def _get_and_cache_all_entities(self):
-        self.__cached_entities = self._get_all_entities()
-        return self.__cached_entities
+        entities = self._get_all_entities()
+        self.__cached_entities = self._index(entities)
+        return entities
 
     def _get_changed_entities(self):
-        actual_entities = self._get_all_entities()
+        actual_entities = self._index(self._get_all_entities())
         changed_entities = []
 
-        for actual_entity in actual_entities:
-            cached_entity = self._find_entity(actual_entity,
-                                              self.__cached_entities)
+        for entity_id, actual_entity in actual_entities.items():
+            cached_entity = self.__cached_entities.get(entity_id)
             if cached_entity:
                 # Add modified entities
-                if not self._equal_entities(actual_entity, cached_entity):
+                if not self._equal_entities(cached_entity, actual_entity):
                     changed_entities.append(actual_entity)
             else:
                 # Add new entities
                 changed_entities.append(actual_entity)
 
         # Delete removed entities
-        for cached_entity in self.__cached_entities:
-            if not self._find_entity(cached_entity, actual_entities):
+        for entity_id, cached_entity in self.__cached_entities.items():
+            if entity_id not in actual_entities:
                 cached_entity[DSProps.EVENT_TYPE] = GraphAction.DELETE_ENTITY
                 changed_entities.append(cached_entity)
 
         self.__cached_entities = actual_entities
         return changed_entities
 
+    def _index(self, entities):
+        return {self._get_entity_id(e): e for e in entities}
+
     @abc.abstractmethod
     def _get_vitrage_type(self):
         pass
@@ -84,7 +87,7 @@ class TroveDriverBase(DriverBase):
         pass
 
     @abc.abstractmethod
-    def _find_entity(self, search_entity, entities):
+    def _get_entity_id(self, entity):
         pass
 
     @abc.abstractmethod
@@ -24,14 +24,20 @@ from vitrage.common.constants import VertexProperties as VProps
 from vitrage.datasources.consistency import CONSISTENCY_DATASOURCE
 from vitrage.datasources import OPENSTACK_CLUSTER
 from vitrage.datasources import utils
+from vitrage.entity_graph.consistency.expiry_index import ExpiryIndex
 from vitrage.entity_graph import EVALUATOR_TOPIC
+from vitrage.entity_graph.processor.processor_utils import is_deleted
 from vitrage.evaluator.actions.evaluator_event_transformer \
     import VITRAGE_DATASOURCE
+from vitrage.graph.utils import get_sample_epoch
 from vitrage.messaging import VitrageNotifier
+from vitrage.utils.datetime import datetime_to_epoch
 from vitrage.utils.datetime import utcnow
 
 LOG = log.getLogger(__name__)
 
+EVENTS_CHUNK_SIZE = 1000
+
 
 class ConsistencyEnforcer(object):
 
@@ -44,6 +50,9 @@ class ConsistencyEnforcer(object):
             conf, 'vitrage_consistency', [EVALUATOR_TOPIC]).notify
         self.graph = entity_graph
         self._init_datasources_to_mark_deleted()
+        self._expiry_index = ExpiryIndex()
+        self._index_built = False
+        self.graph.subscribe(self._on_graph_update)
 
     # noinspection PyBroadException
     def periodic_process(self):
@@ -71,35 +80,78 @@ class ConsistencyEnforcer(object):
         except Exception:
             LOG.exception('Error in deleting vertices from entity_graph.')
 
+    def _on_graph_update(self, before, current, is_vertex, graph):
+        if not is_vertex:
+            return
+        if current:
+            self._expiry_index.update(current)
+        elif before:
+            self._expiry_index.remove(before.vertex_id)
+
+    def _build_expiry_index(self):
+        """Index the vertices that are already in the graph
+
+        The graph may be loaded without update notifications (e.g. from a
+        database snapshot), so all of its vertices are indexed once, and from
+        then on the index is kept up to date by the graph notifications.
+        """
+        if self._index_built:
+            return
+        for vertex in self.graph.get_vertices():
+            self._expiry_index.add(vertex)
+        self._index_built = True
+        LOG.info('Consistency indexed %s vertices', len(self._expiry_index))
+
     def _find_outdated_entities_to_mark_as_deleted(self):
-        vitrage_sample_tstmp = str(utcnow() - timedelta(
+        vitrage_sample_epoch = datetime_to_epoch(utcnow() - timedelta(
             seconds=2 * self.conf.datasources.snapshots_interval))
-        query = {
-            'and': [
-                {'!=': {VProps.VITRAGE_TYPE: VITRAGE_DATASOURCE}},
-                {'<': {VProps.VITRAGE_SAMPLE_TIMESTAMP: vitrage_sample_tstmp}},
-                {'==': {VProps.VITRAGE_IS_DELETED: False}},
-            ]
-        }
 
-        vertices = self.graph.get_vertices(query_dict=query)
-        return set(self._filter_vertices_to_be_marked_as_deleted(vertices))
+        def is_outdated(vertex):
+            return not is_deleted(vertex) and \
+                vertex.get(VProps.VITRAGE_TYPE) != VITRAGE_DATASOURCE and \
+                self._should_delete_vertex(vertex)
+
+        return self._pop_expired(False, vitrage_sample_epoch, is_outdated)
 
     def _find_old_deleted_entities(self):
-        vitrage_sample_tstmp = str(utcnow() - timedelta(
+        vitrage_sample_epoch = datetime_to_epoch(utcnow() - timedelta(
             seconds=self.conf.consistency.min_time_to_delete))
-        query = {
-            'and': [
-                {'==': {VProps.VITRAGE_IS_DELETED: True}},
-                {'<': {VProps.VITRAGE_SAMPLE_TIMESTAMP: vitrage_sample_tstmp}}
-            ]
-        }
 
-        vertices = self.graph.get_vertices(query_dict=query)
+        def is_old_deleted(vertex):
+            return is_deleted(vertex) and \
+                bool(self._filter_vertices_to_be_deleted([vertex]))
+
+        return self._pop_expired(True, vitrage_sample_epoch, is_old_deleted)
 
-        return self._filter_vertices_to_be_deleted(vertices)
+    def _pop_expired(self, deleted, vitrage_sample_epoch, predicate):
+        """Find the vertices that were not sampled since the given epoch
+
+        Only the vertices that crossed the threshold are read from the graph.
+        They are kept in the index until they are updated by the events that
+        are sent for them, so they are sent again if these events are lost.
+        """
+        self._build_expiry_index()
+        vertices = []
+        for vertex_id in self._expiry_index.pop_expired(
+                deleted, vitrage_sample_epoch):
+            vertex = self.graph.get_vertex(vertex_id)
+            if not vertex:
+                continue
+            epoch = get_sample_epoch(vertex)
+            if epoch is None or epoch >= vitrage_sample_epoch or \
+                    bool(is_deleted(vertex)) != deleted:
+                # updated after it was popped
+                self._expiry_index.add(vertex)
+            elif predicate(vertex):
+                self._expiry_index.add(vertex)
+                vertices.append(vertex)
+        return vertices
 
     def _push_events_to_queue(self, vertices, action):
+        for i in range(0, len(vertices), EVENTS_CHUNK_SIZE):
+            self._push_events_chunk(vertices[i:i + EVENTS_CHUNK_SIZE], action)
+
+    def _push_events_chunk(self, vertices, action):
         events = []
         for vertex in vertices:
             event = {
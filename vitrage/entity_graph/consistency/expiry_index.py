@@ -0,0 +1,109 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import heapq
+import threading
+
+from vitrage.common.constants import VertexProperties as VProps
+from vitrage.graph.utils import get_sample_epoch
+
+# rebuild a heap when most of its entries are outdated
+COMPACTION_FACTOR = 2
+MIN_COMPACTION_SIZE = 1000
+
+
+class ExpiryIndex(object):
+    """Orders the vertices by their sample time
+
+    Vertices are kept in two heaps of (sample epoch, vertex id), one for the
+    deleted vertices and one for the others, so the vertices that were not
+    sampled since a given time are found without scanning the graph.
+
+    A vertex update pushes a new entry and leaves the previous one in the
+    heap; outdated entries are recognized and discarded when popped.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = {}
+        self._heaps = {True: [], False: []}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def update(self, vertex):
+        with self._lock:
+            self._update(vertex)
+
+    def add(self, vertex):
+        """Index the vertex, unless it was already indexed
+
+        Used for vertices that were read from the graph earlier, so that they
+        do not override a newer update of the same vertex.
+        """
+        with self._lock:
+            if vertex.vertex_id not in self._keys:
+                self._update(vertex)
+
+    def remove(self, vertex_id):
+        with self._lock:
+            self._keys.pop(vertex_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+            self._heaps = {True: [], False: []}
+
+    def pop_expired(self, is_deleted, epoch):
+        """Remove and return the vertices sampled before the given epoch
+
+        :param is_deleted: whether to look for deleted or for other vertices
+        :param epoch: the sample epoch threshold
+        :return: list of vertex ids
+        """
+        expired = []
+        with self._lock:
+            heap = self._heaps[is_deleted]
+            while heap and heap[0][0] < epoch:
+                sample_epoch, vertex_id = heapq.heappop(heap)
+                if self._keys.get(vertex_id) == (sample_epoch, is_deleted):
+                    del self._keys[vertex_id]
+                    expired.append(vertex_id)
+        return expired
+
+    def _update(self, vertex):
+        vertex_id = vertex.vertex_id
+        epoch = get_sample_epoch(vertex)
+        if epoch is None:
+            self._keys.pop(vertex_id, None)
+            return
+
+        is_deleted = bool(vertex.get(VProps.VITRAGE_IS_DELETED))
+        key = (epoch, is_deleted)
+        if self._keys.get(vertex_id) == key:
+            return
+
+        self._keys[vertex_id] = key
+        heap = self._heaps[is_deleted]
+        heapq.heappush(heap, (epoch, vertex_id))
+        if len(heap) > max(MIN_COMPACTION_SIZE,
+                           COMPACTION_FACTOR * len(self._keys)):
+            self._compact(is_deleted)
+
+    def _compact(self, is_deleted):
+        heap = [(epoch, vertex_id)
+                for vertex_id, (epoch, deleted) in self._keys.items()
+                if deleted == is_deleted]
+        heapq.heapify(heap)
+        self._heaps[is_deleted] = heap
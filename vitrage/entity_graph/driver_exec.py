@@ -12,6 +12,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import threading
 import time
 
@@ -21,6 +22,7 @@ import oslo_messaging
 from vitrage.common.constants import DatasourceAction
 from vitrage.datasources import utils
 from vitrage import messaging
+from vitrage.metrics import registry as metrics
 
 LOG = log.getLogger(__name__)
 
@@ -48,7 +50,8 @@ class DriverExec(object):
             LOCK_BY_DRIVER.acquire(driver_name)
             driver = utils.get_drivers_by_name(self.conf, [driver_name])[0]
             LOG.info("run driver get_all: %s", driver_name)
-            events = driver.get_all(action)
+            with metrics.timer('driver_get_all', driver_name):
+                events = driver.get_all(action)
             count = self.process_output_func(events)
             LOG.info("run driver get_all: %s done (%s events)",
                      driver_name, count)
@@ -67,7 +70,8 @@ class DriverExec(object):
         try:
             driver = utils.get_drivers_by_name(self.conf, [driver_name])[0]
             LOG.info("run driver get_changes: %s", driver_name)
-            events = driver.get_changes(DatasourceAction.UPDATE)
+            with metrics.timer('driver_get_changes', driver_name):
+                events = driver.get_changes(DatasourceAction.UPDATE)
             count = self.process_output_func(events)
             LOG.info("run driver get_changes: %s done (%s events)",
                      driver_name, count)
@@ -85,6 +89,7 @@ class DriversNotificationEndpoint(object):
         self._conf = conf
         self._processor_func = processor_func
         self._enrich_event_methods = defaultdict(list)
+        self._entity_id_methods = {}
 
     def init(self):
         driver_names = utils.get_push_drivers_names(self._conf)
@@ -92,31 +97,102 @@ class DriversNotificationEndpoint(object):
         for driver in push_drivers:
             for event in driver.get_event_types():
                 self._enrich_event_methods[event].append(driver.enrich_event)
+            self._entity_id_methods[driver.enrich_event] = \
+                driver.get_event_entity_id
         return self
 
     def get_listener(self):
+        return messaging.get_notification_listener(
+            messaging.get_transport(self._conf), self._get_targets(), [self])
+
+    def _get_targets(self):
         topics = self._conf.datasources.notification_topics
         exchange = self._conf.datasources.notification_exchange
-        transport = messaging.get_transport(self._conf)
-        targets = [oslo_messaging.Target(exchange=exchange, topic=topic)
-                   for topic in topics]
-
-        return messaging.get_notification_listener(transport, targets, [self])
+        return [oslo_messaging.Target(exchange=exchange, topic=topic)
+                for topic in topics]
 
     def info(self, ctxt, publisher_id, event_type, payload, metadata):
         enrich_event_methods = self._enrich_event_methods[event_type]
         events = []
         for enrich_event_method in enrich_event_methods:
-            result = enrich_event_method(payload, event_type)
-            if isinstance(result, list):
-                events += result
-            else:
-                events.append(result)
-        events = [x for x in events if x is not None]
+            events += self._enrich_event(
+                enrich_event_method, payload, event_type)
         LOG.info('EVENTS ENQUEUED:[%s] [%s] \n%s', publisher_id,
                  event_type, events)
         self._processor_func(events)
 
+    @staticmethod
+    def _enrich_event(enrich_event_method, payload, event_type):
+        with metrics.timer('enrich', event_type):
+            result = enrich_event_method(payload, event_type)
+        if not isinstance(result, list):
+            result = [result]
+        return [x for x in result if x is not None]
+
+
+class DriversBatchNotificationEndpoint(DriversNotificationEndpoint):
+    """Enrich and process batches of notifications
+
+    Notifications that are superseded by a later notification in the batch
+    are dropped, the rest are enriched concurrently, and all the enriched
+    events are processed together in the order of the notifications.
+    """
+
+    def __init__(self, conf, processor_func, enrich_workers=None):
+        super(DriversBatchNotificationEndpoint, self).__init__(
+            conf, processor_func)
+        enrich_workers = enrich_workers or \
+            conf.datasources.notification_enrich_workers
+        self._enrich_executor = ThreadPoolExecutor(max_workers=enrich_workers)
+
+    def get_listener(self):
+        return messaging.get_batch_notification_listener(
+            messaging.get_transport(self._conf),
+            self._get_targets(),
+            [self],
+            self._conf.datasources.notification_batch_size,
+            self._conf.datasources.notification_batch_timeout)
+
+    def info(self, messages):
+        jobs = self._get_enrich_jobs(messages)
+        t1 = time.time()
+        results = self._enrich_executor.map(self._safe_enrich_event, jobs)
+        events = [event for result in results for event in result]
+        LOG.info('EVENTS ENQUEUED: %s events of %s notifications, enrich '
+                 'took %s', len(events), len(messages), time.time() - t1)
+        LOG.debug('EVENTS ENQUEUED: %s', events)
+        self._processor_func(events)
+
+    def _get_enrich_jobs(self, messages):
+        jobs = []
+        latest_jobs = {}
+        for message in messages:
+            event_type = message['event_type']
+            payload = message['payload']
+            for enrich_event_method in self._enrich_event_methods[event_type]:
+                entity_id_method = \
+                    self._entity_id_methods.get(enrich_event_method)
+                entity_id = entity_id_method(payload) \
+                    if entity_id_method else None
+                if entity_id is not None:
+                    key = (enrich_event_method, event_type, entity_id)
+                    superseded = latest_jobs.get(key)
+                    if superseded is not None:
+                        LOG.debug('Dropping superseded %s of %s',
+                                  event_type, entity_id)
+                        jobs[superseded] = None
+                    latest_jobs[key] = len(jobs)
+                jobs.append((enrich_event_method, payload, event_type))
+        return [job for job in jobs if job is not None]
+
+    def _safe_enrich_event(self, job):
+        enrich_event_method, payload, event_type = job
+        try:
+            return self._enrich_event(enrich_event_method, payload, event_type)
+        except Exception:
+            LOG.exception('Failed to enrich %s event', event_type)
+            return []
+
 
 class LockByDriver(object):
 
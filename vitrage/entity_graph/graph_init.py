@@ -11,12 +11,16 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+from collections import deque
+from collections import OrderedDict
+import itertools
 import threading
 import time
 
 from oslo_log import log
 import oslo_messaging
 
+from vitrage.common.constants import DatasourceProperties as DSProps
 from vitrage.common.constants import VertexProperties as VProps
 from vitrage.common.utils import spawn
 from vitrage.datasources.transformer_base import TransformerBase
@@ -30,8 +34,11 @@ from vitrage.entity_graph.processor.notifier import PersistNotifier
 from vitrage.entity_graph.processor.processor import Processor
 from vitrage.entity_graph.scheduler import Scheduler
 from vitrage.graph.driver.networkx_graph import NXGraph
+from vitrage.graph.utils import update_sample_timestamp
 from vitrage import messaging
+from vitrage.metrics import registry as metrics
 from vitrage import storage
+from vitrage.utils import gc as gc_utils
 
 LOG = log.getLogger(__name__)
 
@@ -42,7 +49,10 @@ class VitrageGraphInit(object):
         self.graph = get_graph_driver(conf)('Entity Graph')
         self.db = db_connection = storage.get_connection_from_config(conf)
         self.workers = workers
-        self.events_coordination = EventsCoordination(conf, self.process_event)
+        self.processor = Processor(conf, self.graph)
+        self.events_coordination = EventsCoordination(
+            conf, self.process_event,
+            self.processor.transformer_manager.get_entity_key)
         self.persist = GraphPersistency(conf, db_connection, self.graph)
         self.driver_exec = driver_exec.DriverExec(
             self.conf,
@@ -50,7 +60,6 @@ class VitrageGraphInit(object):
             self.persist)
         self.scheduler = Scheduler(conf, self.graph, self.driver_exec,
                                    self.persist)
-        self.processor = Processor(conf, self.graph)
 
     def run(self):
         LOG.info('Init Started')
@@ -59,12 +68,15 @@ class VitrageGraphInit(object):
             t = spawn(self.workers.submit_read_db_graph)
             self._restart_from_stored_graph(graph_snapshot)
             t.join()
+            self.workers.submit_evaluators_reload_templates()
             self.workers.submit_enable_evaluations()
 
         else:
             self._start_from_scratch()
             self.workers.submit_read_db_graph()
+            self.workers.submit_evaluators_reload_templates()
             self.workers.submit_start_evaluations()
+        gc_utils.freeze()
         self._init_finale(immediate_get_all=True if graph_snapshot else False)
 
     def _restart_from_stored_graph(self, graph_snapshot):
@@ -72,6 +84,7 @@ class VitrageGraphInit(object):
                  len(graph_snapshot.graph_snapshot) / 1024)
         NXGraph.read_gpickle(graph_snapshot.graph_snapshot, self.graph)
         self.persist.replay_events(self.graph, graph_snapshot.event_id)
+        self._add_missing_sample_epochs()
         self._recreate_transformers_id_cache()
         LOG.info("%s vertices loaded", self.graph.num_vertices())
         self.subscribe_presist_notifier()
@@ -103,6 +116,18 @@ class VitrageGraphInit(object):
             self.processor.process_event(event)
         self.persist.flush_events()
 
+    def _add_missing_sample_epochs(self):
+        """Add the pre-parsed sample epoch to graphs of older versions"""
+        count = 0
+        for v in self.graph.get_vertices():
+            if v.get(VProps.VITRAGE_SAMPLE_EPOCH) is None and \
+                    v.get(VProps.VITRAGE_SAMPLE_TIMESTAMP):
+                update_sample_timestamp(v, v[VProps.VITRAGE_SAMPLE_TIMESTAMP])
+                self.graph.update_vertex(v)
+                count += 1
+        if count:
+            LOG.info('Added sample epoch to %s vertices', count)
+
     def _recreate_transformers_id_cache(self):
         for v in self.graph.get_vertices():
             if not v.get(VProps.VITRAGE_CACHED_ID):
@@ -113,25 +138,63 @@ class VitrageGraphInit(object):
                     = v.vertex_id
 
     def _add_graph_subscriptions(self):
-        self.graph.subscribe(self.workers.submit_graph_update)
+        self.graph.subscribe(
+            _timed_subscriber('workers', self.workers.submit_graph_update))
         vitrage_notifier = GraphNotifier(self.conf)
         if vitrage_notifier.enabled:
-            self.graph.subscribe(vitrage_notifier.notify_when_applicable)
+            self.graph.subscribe(_timed_subscriber(
+                'notifier', vitrage_notifier.notify_when_applicable))
             LOG.info('Subscribed vitrage notifier to graph changes')
-        self.graph.subscribe(self.persist.persist_event,
-                             finalization=True)
+        self.graph.subscribe(
+            _timed_subscriber('persistency', self.persist.persist_event),
+            finalization=True)
 
     def subscribe_presist_notifier(self):
-        self.graph.subscribe(PersistNotifier(self.conf).notify_when_applicable)
+        self.graph.subscribe(_timed_subscriber(
+            'persist_notifier',
+            PersistNotifier(self.conf).notify_when_applicable))
+
+
+def _timed_subscriber(name, func):
+    def timed_func(*args, **kwargs):
+        with metrics.timer('graph_notify', name):
+            return func(*args, **kwargs)
+    return timed_func
+
 
 PRIORITY_DELAY = 0.05
+WORK_BATCH_SIZE = 100
+
+
+class _WorkDone(object):
+    """Queued after the events of a caller, marks that they were handled"""
+
+    def __init__(self):
+        self.done = False
 
 
 class EventsCoordination(object):
-    def __init__(self, conf, do_work_func):
+    """Prioritized work queue of the graph events
+
+    The events are queued in two priority classes. The caller that queued
+    events handles queued events, in batches of up to WORK_BATCH_SIZE, until
+    its own events were handled. High priority events are always handled
+    first, and low priority events are handled only PRIORITY_DELAY seconds
+    after the last high priority event.
+
+    A queued low priority event is replaced by a newer event of the same
+    entity, so superseded updates of snapshot floods are not handled.
+    """
+
+    def __init__(self, conf, do_work_func, event_key_func=None):
         self._conf = conf
-        self._lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._high_events = deque()
+        self._low_events = OrderedDict()
+        self._unique_keys = itertools.count()
+        self._working = False
         self._high_event_finish_time = 0
+        self._event_key_func = event_key_func
 
         def do_work(event):
             try:
@@ -144,10 +207,16 @@ class EventsCoordination(object):
         self._low_pri_listener = None
         self._high_pri_listener = None
 
+        metrics.set_gauge('queue_depth', 'high_priority_events',
+                          lambda: self._queued_events(True))
+        metrics.set_gauge('queue_depth', 'low_priority_events',
+                          lambda: self._queued_events(False))
+
     def start(self):
-        self._low_pri_listener = driver_exec.DriversNotificationEndpoint(
-            self._conf,
-            self.handle_multiple_low_priority).init().get_listener()
+        self._low_pri_listener = \
+            driver_exec.DriversBatchNotificationEndpoint(
+                self._conf,
+                self.handle_multiple_low_priority).init().get_listener()
         self._high_pri_listener = self._init_listener(
             EVALUATOR_TOPIC,
             self._do_high_priority_work)
@@ -165,27 +234,110 @@ class EventsCoordination(object):
         self._high_pri_listener.wait()
 
     def _do_high_priority_work(self, event):
-        self._lock.acquire()
-        self._do_work_func(event)
-        self._high_event_finish_time = time.time()
-        self._lock.release()
+        work_done = _WorkDone()
+        with self._cond:
+            self._high_events.append(event)
+            self._high_events.append(work_done)
+            self._cond.notify_all()
+            self._work_until(work_done)
 
     def _do_low_priority_work(self, event):
+        self.handle_multiple_low_priority([event])
+
+    def handle_multiple_low_priority(self, events):
+        events = iter(events)
+        count = 0
         while True:
-            self._lock.acquire()
-            if (time.time() - self._high_event_finish_time) < PRIORITY_DELAY:
-                self._lock.release()
-                time.sleep(PRIORITY_DELAY)
-            else:
+            # the events may be generated lazily, so they are queued in
+            # chunks, without blocking the handling of the queued events
+            chunk = list(itertools.islice(events, WORK_BATCH_SIZE))
+            if not chunk:
                 break
-        self._do_work_func(event)
-        self._lock.release()
+            count += len(chunk)
+            with self._cond:
+                for event in chunk:
+                    self._queue_low_priority_event(event)
 
-    def handle_multiple_low_priority(self, events):
-        index = 0
-        for index, e in enumerate(events):
-            self._do_low_priority_work(e)
-        return index
+        work_done = _WorkDone()
+        with self._cond:
+            self._low_events[next(self._unique_keys)] = work_done
+            self._work_until(work_done)
+        return count
+
+    def _queue_low_priority_event(self, event):
+        key = self._coalescing_key(event)
+        queued_event = self._low_events.get(key) if key else None
+        if queued_event is None:
+            self._low_events[key or next(self._unique_keys)] = event
+        elif queued_event.get(DSProps.SAMPLE_DATE) <= \
+                event.get(DSProps.SAMPLE_DATE):
+            # Keep the position of the queued event, with the newer data
+            self._low_events[key] = event
+
+    def _coalescing_key(self, event):
+        if not self._event_key_func or \
+                not isinstance(event, dict) or \
+                not event.get(DSProps.SAMPLE_DATE):
+            return None
+        try:
+            return (event.get(DSProps.ENTITY_TYPE),
+                    event.get(DSProps.DATASOURCE_ACTION),
+                    self._event_key_func(event))
+        except Exception:
+            return None
+
+    def _queued_events(self, high_priority):
+        with self._cond:
+            events = self._high_events if high_priority \
+                else self._low_events.values()
+            return sum(1 for e in events if not isinstance(e, _WorkDone))
+
+    def _work_until(self, work_done):
+        """Handle queued events until work_done is reached
+
+        Must be called with the condition acquired
+        """
+        while not work_done.done:
+            if self._working:
+                self._cond.wait()
+                continue
+
+            batch, high_priority = self._pop_batch()
+            if not batch:
+                delay = PRIORITY_DELAY - \
+                    (time.time() - self._high_event_finish_time)
+                self._cond.wait(max(delay, 0))
+                continue
+
+            self._working = True
+            self._cond.release()
+            try:
+                self._handle_batch(batch)
+            finally:
+                self._cond.acquire()
+                self._working = False
+                if high_priority:
+                    self._high_event_finish_time = time.time()
+                self._cond.notify_all()
+
+    def _pop_batch(self):
+        batch = []
+        if self._high_events:
+            while self._high_events and len(batch) < WORK_BATCH_SIZE:
+                batch.append(self._high_events.popleft())
+            return batch, True
+
+        if (time.time() - self._high_event_finish_time) >= PRIORITY_DELAY:
+            while self._low_events and len(batch) < WORK_BATCH_SIZE:
+                batch.append(self._low_events.popitem(last=False)[1])
+        return batch, False
+
+    def _handle_batch(self, batch):
+        for item in batch:
+            if isinstance(item, _WorkDone):
+                item.done = True
+            else:
+                self._do_work_func(item)
 
     def _init_listener(self, topic, callback):
         if not topic:
@@ -78,7 +78,7 @@ class GraphPersistency(object):
         """Callback subscribed to driver.graph updates"""
         if not self.is_important_change(
                 before, current, VProps.UPDATE_TIMESTAMP,
-                VProps.VITRAGE_SAMPLE_TIMESTAMP):
+                VProps.VITRAGE_SAMPLE_TIMESTAMP, VProps.VITRAGE_SAMPLE_EPOCH):
             return
 
         if is_vertex:
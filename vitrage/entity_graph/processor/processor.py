@@ -14,6 +14,7 @@
 # under the License.
 from oslo_log import log
 
+from vitrage.common.constants import DatasourceProperties as DSProps
 from vitrage.common.constants import EntityCategory as ECategory
 from vitrage.common.constants import GraphAction
 from vitrage.common.constants import VertexProperties as VProps
@@ -25,6 +26,7 @@ from vitrage.entity_graph.processor import processor_utils as PUtils
 from vitrage.entity_graph.processor.transformer_manager import \
     TransformerManager
 from vitrage.graph import Direction
+from vitrage.metrics import registry as metrics
 
 LOG = log.getLogger(__name__)
 
@@ -52,16 +54,21 @@ class Processor(processor.ProcessorBase):
 
         LOG.debug('processor event:\n%s', event)
 
-        self._enrich_event(event)
-        entity = self.transformer_manager.transform(event)
+        datasource = event.get(DSProps.ENTITY_TYPE)
+        metrics.increment('events', datasource)
+        with metrics.timer('transform', datasource):
+            self._enrich_event(event)
+            entity = self.transformer_manager.transform(event)
 
         if entity.action not in self.actions:
             LOG.warning('Deprecated or unknown entity %s ignored', entity)
             return
 
-        self._calculate_vitrage_aggregated_values(entity.vertex, entity.action)
-        self._set_datasource_name(entity, event)
-        self.actions[entity.action](entity.vertex, entity.neighbors)
+        with metrics.timer('graph_update', datasource):
+            self._calculate_vitrage_aggregated_values(entity.vertex,
+                                                      entity.action)
+            self._set_datasource_name(entity, event)
+            self.actions[entity.action](entity.vertex, entity.neighbors)
 
     def create_entity(self, new_vertex, neighbors):
         """Adds new vertex to the entity graph
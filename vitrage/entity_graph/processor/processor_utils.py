@@ -12,14 +12,14 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-from dateutil import parser
-
 from oslo_log import log
 
 from vitrage.common.constants import EdgeProperties as EProps
 from vitrage.common.constants import VertexProperties as VProps
 from vitrage.graph import Edge
 from vitrage.graph import Vertex
+from vitrage.graph.utils import get_sample_epoch
+from vitrage.graph.utils import update_sample_timestamp
 from vitrage.utils.datetime import utcnow
 
 
@@ -27,15 +27,13 @@ LOG = log.getLogger(__name__)
 
 
 def is_newer_vertex(prev_vertex, new_vertex):
-    prev_timestamp = prev_vertex.get(VProps.VITRAGE_SAMPLE_TIMESTAMP)
-    if not prev_timestamp:
+    prev_time = get_sample_epoch(prev_vertex)
+    if prev_time is None:
         return True
-    prev_time = parser.parse(prev_timestamp)
 
-    new_timestamp = new_vertex.get(VProps.VITRAGE_SAMPLE_TIMESTAMP)
-    if not new_timestamp:
+    new_time = get_sample_epoch(new_vertex)
+    if new_time is None:
         return True
-    new_time = parser.parse(new_timestamp)
 
     return prev_time <= new_time
 
@@ -53,7 +51,7 @@ def mark_deleted(g, item):
         if item.get(VProps.VITRAGE_IS_DELETED, False):
             return
         item[VProps.VITRAGE_IS_DELETED] = True
-        item[VProps.VITRAGE_SAMPLE_TIMESTAMP] = str(utcnow())
+        update_sample_timestamp(item, str(utcnow()))
         g.update_vertex(item)
     elif isinstance(item, Edge):
         if item.get(EProps.VITRAGE_IS_DELETED, False):
@@ -77,6 +77,10 @@ class TransformerManager(object):
         entity_type = self.get_entity_type(entity_event)
         return self.get_transformer(entity_type).transform(entity_event)
 
+    def get_entity_key(self, entity_event):
+        entity_type = self.get_entity_type(entity_event)
+        return self.get_transformer(entity_type).get_entity_key(entity_event)
+
     def get_enrich_query(self, entity_event):
         entity_type = self.get_entity_type(entity_event)
         return self.get_transformer(entity_type).get_enrich_query(entity_event)
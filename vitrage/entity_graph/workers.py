@@ -33,17 +33,21 @@ from vitrage.api_handler.apis.template import TemplateApis
 from vitrage.api_handler.apis.topology import TopologyApis
 from vitrage.api_handler.apis.webhook import WebhookApis
 from vitrage.common.constants import TemplateStatus as TStatus
+from vitrage.common.constants import VertexProperties as VProps
 from vitrage.common.constants import TemplateTypes as TType
 from vitrage.common.exception import VitrageError
 from vitrage.coordination import service as coord
 from vitrage.entity_graph import EVALUATOR_TOPIC
 from vitrage.evaluator.actions.base import ActionMode
+from vitrage.evaluator import scenario_costs
 from vitrage.evaluator.scenario_evaluator import ScenarioEvaluator
 from vitrage.evaluator.scenario_repository import ScenarioRepository
 from vitrage.graph.driver.networkx_graph import NXGraph
 from vitrage import messaging
+from vitrage.metrics import registry as metrics
 from vitrage import rpc as vitrage_rpc
 from vitrage import storage
+from vitrage.utils import gc as gc_utils
 
 LOG = log.getLogger(__name__)
 
@@ -75,6 +79,9 @@ class GraphWorkersManager(cotyledon.ServiceManager):
         self._template_queues = []
         self._api_queues = []
         self._all_queues = []
+        # Per evaluator worker, the vertex types of its scenarios, or None
+        # if it receives all the graph updates
+        self._evaluator_vertex_types = None
         self.register_hooks(on_terminate=self._force_stop)
         self.add_evaluator_workers()
         self.add_api_workers()
@@ -117,16 +124,43 @@ class GraphWorkersManager(cotyledon.ServiceManager):
         self._api_queues = queues
         self._all_queues.extend(queues)
 
-    def submit_graph_update(self, before, current, is_vertex, *args, **kwargs):
+    def register_queue_gauges(self):
+        """Report the number of tasks that each worker did not handle yet"""
+        for i, q in enumerate(self._evaluator_queues):
+            metrics.set_gauge('queue_depth', 'EvaluatorWorker-%s' % i,
+                              q.qsize)
+        for i, q in enumerate(self._api_queues):
+            metrics.set_gauge('queue_depth', 'ApiWorker-%s' % i, q.qsize)
+
+    def submit_graph_update(self, before, current, is_vertex, graph=None,
+                            *args, **kwargs):
         """Graph update all workers
 
         This method is subscribed to entity graph changes.
         Per each change in the main entity graph, this method will notify
          each of the workers, causing them to update their own graph.
+        When evaluator.route_graph_updates is set, evaluator workers are
+         notified only of the vertices of the types of their scenarios, and
+         of the edges between such vertices.
         """
-        self._submit_and_wait(
-            self._all_queues,
-            (GRAPH_UPDATE, before, current, is_vertex))
+        payload = (GRAPH_UPDATE, before, current, is_vertex)
+        if self._evaluator_vertex_types is None:
+            self._submit_and_wait(self._all_queues, payload)
+            return
+
+        if is_vertex:
+            vertex_groups = [[before, current]]
+        elif graph:
+            edge = current or before
+            vertex_groups = [[graph.get_vertex(edge.source_id)],
+                             [graph.get_vertex(edge.target_id)]]
+        else:
+            vertex_groups = []
+
+        queues = [q for q, types in zip(self._evaluator_queues,
+                                        self._evaluator_vertex_types)
+                  if _is_relevant(types, vertex_groups)]
+        self._submit_and_wait(queues + self._api_queues, payload)
 
     def submit_start_evaluations(self):
         """Enable scenario-evaluator in all evaluator workers
@@ -145,9 +179,33 @@ class GraphWorkersManager(cotyledon.ServiceManager):
     def submit_evaluators_reload_templates(self):
         """Recreate the scenario-repository in all evaluator workers
 
-        So that new/deleted templates are added/removed
+        So that new/deleted templates are added/removed.
+        The scenarios are partitioned between the workers by their measured
+        or estimated costs. When the graph updates are routed, a worker that
+        now has scenarios of more vertex types reloads its graph.
         """
-        self._submit_and_wait(self._evaluator_queues, (RELOAD_TEMPLATES,))
+        scenario_repo = ScenarioRepository(self._conf)
+        partitions = scenario_repo.partition(len(self._evaluator_queues),
+                                             self._measured_scenario_costs())
+        self._submit_each_and_wait(
+            self._evaluator_queues,
+            [(RELOAD_TEMPLATES, scenario_ids) for scenario_ids in partitions])
+
+        if not self._conf.evaluator.route_graph_updates:
+            return
+        old_vertex_types = self._evaluator_vertex_types or \
+            [None] * len(partitions)
+        self._evaluator_vertex_types = \
+            [scenario_repo.get_vertex_types(ids) for ids in partitions]
+        outdated_queues = [
+            q for q, old_types, types in zip(
+                self._evaluator_queues, old_vertex_types,
+                self._evaluator_vertex_types)
+            if _needs_graph_reload(old_types, types)]
+        if outdated_queues:
+            LOG.info('Reloading the graph of %s evaluator workers',
+                     len(outdated_queues))
+            self._submit_and_wait(outdated_queues, (READ_DB_GRAPH,))
 
     def submit_read_db_graph(self):
         """Initialize the worker graph from database snapshot
@@ -188,7 +246,13 @@ class GraphWorkersManager(cotyledon.ServiceManager):
         else:
             raise VitrageError('Invalid template_action %s' % template_action)
 
-        # Template event will be handled by a single evaluator worker
+        # Template event will be handled by a single evaluator worker, which
+        # needs the entire graph for the scenarios of the template
+        if self._evaluator_vertex_types and \
+                self._evaluator_vertex_types[0] is not None:
+            self._submit_and_wait([self._evaluator_queues[0]],
+                                  (READ_DB_GRAPH,))
+            self._evaluator_vertex_types[0] = None
         self._submit_and_wait(
             [self._evaluator_queues[0]],
             (
@@ -201,6 +265,17 @@ class GraphWorkersManager(cotyledon.ServiceManager):
         for t in templates:
             self._db.templates.update(t.uuid, 'status', new_status)
 
+    def _measured_scenario_costs(self):
+        """The evaluation time of every scenario, from the metrics dumps"""
+        interval = self._conf.metrics.dump_interval
+        if not self._conf.metrics.enabled or not interval:
+            return None
+        dumps = metrics.load_dumps(self._conf.metrics.dump_folder,
+                                   3 * interval)
+        costs = scenario_costs.get_scenario_costs(dumps)
+        return {scenario_id: c[scenario_costs.WALL_TIME]
+                for scenario_id, c in costs.items()}
+
     @staticmethod
     def _submit_and_wait(queues, payload):
         for q in queues:
@@ -209,11 +284,56 @@ class GraphWorkersManager(cotyledon.ServiceManager):
             if isinstance(q, multiprocessing.queues.JoinableQueue):
                 q.join()
 
+    @staticmethod
+    def _submit_each_and_wait(queues, payloads):
+        """Submit a different payload to each of the queues"""
+        for q, payload in zip(queues, payloads):
+            q.put(payload)
+        for q in queues:
+            if isinstance(q, multiprocessing.queues.JoinableQueue):
+                q.join()
+
     @staticmethod
     def _force_stop():
         os._exit(0)
 
 
+def _is_relevant(vertex_types, vertex_groups):
+    """Whether every group has a vertex of one of the vertex types
+
+    A vertex update is relevant if the vertex before or after the update is
+    of one of the types, and an edge update if both its vertices are.
+    Unknown vertices are considered relevant.
+
+    :param vertex_types: set of (category, type), where a None type stands
+    for any type of the category, or None for any vertex
+    :param vertex_groups: list of lists of vertices
+    """
+    if vertex_types is None:
+        return True
+    for vertices in vertex_groups:
+        vertices = [v for v in vertices if v]
+        if vertices and not any(
+                (v.get(VProps.VITRAGE_CATEGORY),
+                 v.get(VProps.VITRAGE_TYPE)) in vertex_types or
+                (v.get(VProps.VITRAGE_CATEGORY), None) in vertex_types
+                for v in vertices):
+            return False
+    return True
+
+
+def _needs_graph_reload(old_vertex_types, vertex_types):
+    """Whether a worker misses vertices of its new vertex types
+
+    The graph of a worker holds the vertices of its old vertex types only,
+    unless they were None, so it is outdated if the new types are not a
+    subset of the old ones.
+    """
+    if old_vertex_types is None:
+        return False
+    return vertex_types is None or not vertex_types.issubset(old_vertex_types)
+
+
 class GraphCloneWorkerBase(coord.Service):
     def __init__(self,
                  worker_id,
@@ -233,8 +353,11 @@ class GraphCloneWorkerBase(coord.Service):
 
     def run(self):
         super(GraphCloneWorkerBase, self).run()
+        metrics.setup(self._conf, '%s-%s' % (self.name, self.worker_id))
+        gc_utils.register_pause_metrics()
         self._entity_graph.notifier._subscriptions = []  # Quick n dirty
         self._init_instance()
+        gc_utils.freeze()
         if self._entity_graph.num_vertices():
             LOG.info("%s - Started %s (%s vertices)", self.__class__.__name__,
                      self.worker_id, self._entity_graph.num_vertices())
@@ -258,6 +381,7 @@ class GraphCloneWorkerBase(coord.Service):
 
     def do_task(self, task):
         action = task[0]
+        metrics.increment('worker_tasks', action)
         if action == GRAPH_UPDATE:
             (action, before, current, is_vertex) = task
             self._graph_update(before, current, is_vertex)
@@ -286,6 +410,7 @@ class GraphCloneWorkerBase(coord.Service):
         GraphPersistency.do_replay_events(db, self._entity_graph,
                                           graph_snapshot.event_id)
         self._entity_graph.ready = True
+        gc_utils.freeze()
 
 
 class EvaluatorWorker(GraphCloneWorkerBase):
@@ -315,6 +440,10 @@ class EvaluatorWorker(GraphCloneWorkerBase):
             actions_callback,
             enabled=False)
         self._evaluator.scenario_repo.log_enabled_scenarios()
+        if self._conf.evaluator.scenario_costs_report_interval:
+            scenario_costs.report_periodically(
+                self._conf.evaluator.scenario_costs_report_interval,
+                self._conf.evaluator.scenario_costs_report_size)
 
     def do_task(self, task):
         super(EvaluatorWorker, self).do_task(task)
@@ -326,17 +455,19 @@ class EvaluatorWorker(GraphCloneWorkerBase):
             # init with a snapshot does not require iterating the graph
             self._evaluator.enabled = True
         elif action == RELOAD_TEMPLATES:
-            self._reload_templates()
+            scenario_ids = task[1] if len(task) > 1 else None
+            self._reload_templates(scenario_ids)
         elif action == TEMPLATE_ACTION:
             (action, template_names, action_mode) = task
             self._template_action(template_names, action_mode)
 
-    def _reload_templates(self):
+    def _reload_templates(self, scenario_ids=None):
         LOG.info("reloading evaluator scenarios")
         scenario_repo = ScenarioRepository(self._conf, self.worker_id,
-                                           self._workers_num)
+                                           self._workers_num, scenario_ids)
         self._evaluator.scenario_repo = scenario_repo
         self._evaluator.scenario_repo.log_enabled_scenarios()
+        gc_utils.freeze()
 
     def _template_action(self, template_names, action_mode):
         # Here, we create a temporary ScenarioRepo to execute the needed
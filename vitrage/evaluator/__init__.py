@@ -24,6 +24,23 @@ OPTS = [
                max=32,
                help='Number of workers for template evaluator.'
                ),
+    cfg.IntOpt('scenario_costs_report_interval',
+               default=600,
+               min=0,
+               help='Interval between logs of the most expensive scenarios '
+                    'of every evaluator worker (in seconds). 0 disables the '
+                    'report'),
+    cfg.IntOpt('scenario_costs_report_size',
+               default=10,
+               min=1,
+               help='Number of scenarios in the scenario costs report'),
+    cfg.BoolOpt('route_graph_updates',
+                default=False,
+                help='Send every graph update only to the evaluator workers '
+                     'with scenarios of the type of the changed entity, '
+                     'instead of to all of them. Reduces the memory and CPU '
+                     'of the evaluator workers, at the cost of reloading '
+                     'the graph of a worker whose scenarios change'),
 ]
 
 init_template_schemas()
@@ -40,6 +40,7 @@ from vitrage.evaluator.actions.recipes.execute_mistral import ExecuteMistral
 from vitrage.evaluator.actions.recipes.mark_down import MarkDown
 from vitrage.evaluator.actions.recipes.raise_alarm import RaiseAlarm
 from vitrage.evaluator.actions.recipes.set_state import SetState
+from vitrage.metrics import registry as metrics
 from vitrage.utils import datetime as datetime_utils
 
 LOG = log.getLogger(__name__)
@@ -73,7 +74,8 @@ class ActionExecutor(object):
         events = []
         for action in actions:
             LOG.info('Action: %s', self._action_str(action))
-            events.extend(self._execute(action.specs, action.mode))
+            with metrics.timer('execute_action', action.specs.type):
+                events.extend(self._execute(action.specs, action.mode))
         self.actions_callback(EVALUATOR_EVENT, events)
 
     def _execute(self, action_spec, action_mode):
@@ -53,6 +53,8 @@ class ExecuteMistral(base.Recipe):
     @staticmethod
     def _get_execute_external_step(properties):
 
+        # the action properties may be shared with the scenario
+        properties = dict(properties)
         properties[EXECUTION_ENGINE] = MISTRAL
         execute_external_step = ActionStepWrapper(EXECUTE_EXTERNAL,
                                                   properties)
@@ -23,6 +23,12 @@ from sympy import Symbol
 
 ConditionVar = namedtuple('ConditionVar', ['symbol_name', 'positive'])
 
+# Converting to DNF with sympy is by far the most expensive part of loading a
+# template, and the same condition strings are parsed again on every
+# repository load and template validation, so the results are memoized.
+MAX_PARSED_CONDITIONS = 1024
+_parsed_conditions = {}
+
 
 class SymbolResolver(object):
     @abc.abstractmethod
@@ -129,10 +135,26 @@ def parse_condition(condition_str):
 
       [[and_var1, and_var2, ...], or_list_2, ...]
 
+    The result is memoized per condition string, and a new copy of the
+    lists is returned on every call.
+
     :param condition_str: the string as it written in the template
     :return: condition_vars_lists
     """
 
+    condition_vars = _parsed_conditions.get(condition_str)
+    if condition_vars is None:
+        condition_vars = _parse_condition(condition_str)
+        if condition_vars is None:
+            return None
+        if len(_parsed_conditions) >= MAX_PARSED_CONDITIONS:
+            _parsed_conditions.clear()
+        _parsed_conditions[condition_str] = condition_vars
+
+    return [list(clause) for clause in condition_vars]
+
+
+def _parse_condition(condition_str):
     condition_dnf = convert_to_dnf_format(condition_str)
 
     if isinstance(condition_dnf, Or):
@@ -0,0 +1,90 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import time
+
+from oslo_log import log
+
+from vitrage.common.utils import spawn
+from vitrage.metrics import registry as metrics
+
+LOG = log.getLogger(__name__)
+
+COUNTERS = ('triggers', 'matchings', 'candidates', 'matches', 'actions')
+WALL_TIME = 'wall_time'
+
+
+def get_scenario_costs(snapshots):
+    """Sum the costs of every scenario over metrics snapshots
+
+    The scenario evaluator records per scenario how many times it was
+    triggered, how many subgraph matchings it ran, how many candidate
+    vertices they explored, how many matches they found, how many actions
+    were emitted and the total evaluation time.
+
+    :param snapshots: metrics snapshots, e.g. of all the evaluator workers
+    :return: dict of scenario id to its costs
+    """
+    costs = {}
+
+    def scenario_costs(scenario_id):
+        if scenario_id not in costs:
+            costs[scenario_id] = dict.fromkeys(COUNTERS + (WALL_TIME,), 0)
+        return costs[scenario_id]
+
+    for snapshot in snapshots:
+        counters = snapshot.get('counters', {})
+        for name in COUNTERS:
+            for scenario_id, value in \
+                    counters.get('scenario_' + name, {}).items():
+                scenario_costs(scenario_id)[name] += value
+        for scenario_id, histogram in snapshot.get(
+                'histograms', {}).get('evaluate_scenario', {}).items():
+            scenario_costs(scenario_id)[WALL_TIME] += histogram['sum']
+    return costs
+
+
+def top_scenarios(costs, limit=None):
+    """The most expensive scenarios first
+
+    :return: list of the scenario costs, each with a 'scenario' id
+    """
+    result = [dict(scenario=scenario_id, **scenario_costs)
+              for scenario_id, scenario_costs in costs.items()]
+    result.sort(key=lambda c: c[WALL_TIME], reverse=True)
+    return result[:limit] if limit else result
+
+
+def log_top_scenarios(limit):
+    top = top_scenarios(get_scenario_costs([metrics.snapshot()]), limit)
+    if not top:
+        return
+    LOG.info('Top %s scenarios by evaluation time:', len(top))
+    for c in top:
+        LOG.info('%.3fs %s - triggers: %s, matchings: %s, candidates: %s, '
+                 'matches: %s, actions: %s', c[WALL_TIME], c['scenario'],
+                 c['triggers'], c['matchings'], c['candidates'],
+                 c['matches'], c['actions'])
+
+
+def report_periodically(interval, limit):
+    def report():
+        while True:
+            time.sleep(interval)
+            try:
+                log_top_scenarios(limit)
+            except Exception:
+                LOG.exception('Failed to report the scenario costs')
+
+    spawn(report)
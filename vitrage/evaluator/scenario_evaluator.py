@@ -15,7 +15,6 @@ from collections import defaultdict
 from collections import namedtuple
 from collections import OrderedDict
 import copy
-import re
 import time
 
 from oslo_log import log
@@ -32,12 +31,17 @@ from vitrage.evaluator.actions.base import ActionType
 import vitrage.evaluator.actions.priority_tools as pt
 from vitrage.evaluator.template_data import ActionSpecs
 from vitrage.evaluator.template_data import EdgeDescription
-from vitrage.evaluator.template_functions.function_resolver import is_function
+from vitrage.evaluator.template_functions.function_resolver import \
+    compile_properties
+from vitrage.evaluator.template_loading.subgraph_builder import \
+    SubGraphBuilder
 from vitrage.evaluator.template_schema_factory import TemplateSchemaFactory
 from vitrage.graph.algo_driver.algorithm import Mapping
+from vitrage.graph.algo_driver.sub_graph_matching import CANDIDATES
 from vitrage.graph.algo_driver.sub_graph_matching import \
     NEG_CONDITION
 from vitrage.graph.driver import Vertex
+from vitrage.metrics import registry as metrics
 from vitrage import storage
 from vitrage.storage.sqlalchemy import models
 from vitrage.utils.datetime import utcnow
@@ -55,6 +59,11 @@ ActionInfo = \
 
 TARGET = 'target'
 SOURCE = 'source'
+RUN_EVALUATOR_BATCH_SIZE = 1000
+
+# per scenario cost accounting
+MATCHINGS = 'matchings'
+MATCHES = 'matches'
 
 
 class ScenarioEvaluator(object):
@@ -72,7 +81,6 @@ class ScenarioEvaluator(object):
         self._action_executor = ActionExecutor(self._conf, actions_callback)
         self._entity_graph.subscribe(self.process_event)
         self.enabled = enabled
-        self.connected_component_cache = defaultdict(dict)
 
     @property
     def scenario_repo(self):
@@ -83,17 +91,55 @@ class ScenarioEvaluator(object):
         self._scenario_repo = scenario_repo
 
     def run_evaluator(self, action_mode=ActionMode.DO):
+        """Evaluate the scenarios on all the relevant graph vertices
+
+        Only vertices whose category and type appear in an enabled scenario
+        are evaluated, in batches of RUN_EVALUATOR_BATCH_SIZE vertices.
+        """
         self.enabled = True
-        vertices = self._entity_graph.get_vertices()
         start_time = time.time()
-        for vertex in vertices:
-            if action_mode == ActionMode.DO:
-                self.process_event(None, vertex, True)
-            elif action_mode == ActionMode.UNDO:
-                self.process_event(vertex, None, True)
+        vertex_ids = list(self._get_relevant_vertex_ids())
+        total = len(vertex_ids)
+        LOG.info('Run %s Evaluator on %s items out of %s',
+                 action_mode, total, self._entity_graph.num_vertices())
+
+        for batch_start in range(0, total, RUN_EVALUATOR_BATCH_SIZE):
+            batch = vertex_ids[batch_start:
+                               batch_start + RUN_EVALUATOR_BATCH_SIZE]
+            for vertex_id in batch:
+                vertex = self._entity_graph.get_vertex(vertex_id)
+                if not vertex:
+                    continue
+                if action_mode == ActionMode.DO:
+                    self.process_event(None, vertex, True)
+                elif action_mode == ActionMode.UNDO:
+                    self.process_event(vertex, None, True)
+            LOG.debug('Run %s Evaluator - %s/%s items done, %s so far',
+                      action_mode, batch_start + len(batch), total,
+                      time.time() - start_time)
+
         LOG.info(
             'Run %s Evaluator on %s items - took %s',
-            action_mode, len(vertices), (time.time() - start_time))
+            action_mode, total, (time.time() - start_time))
+
+    def _get_relevant_vertex_ids(self):
+        vertex_types = self._scenario_repo.get_enabled_vertex_types()
+        if vertex_types is None:
+            return self._entity_graph.get_vertices_ids(None)
+        if not vertex_types:
+            return []
+
+        type_queries = []
+        for category, vitrage_type in vertex_types:
+            category_query = {'==': {VProps.VITRAGE_CATEGORY: category}}
+            if vitrage_type is None:
+                type_queries.append(category_query)
+            else:
+                type_queries.append({'and': [
+                    category_query,
+                    {'==': {VProps.VITRAGE_TYPE: vitrage_type}},
+                ]})
+        return self._entity_graph.get_vertices_ids({'or': type_queries})
 
     def process_event(self, before, current, is_vertex, *args, **kwargs):
         """Notification of a change in the entity graph.
@@ -110,6 +156,10 @@ class ScenarioEvaluator(object):
             LOG.debug("Process event disabled")
             return
 
+        with metrics.timer('evaluate', 'vertex' if is_vertex else 'edge'):
+            self._process_event(before, current, is_vertex)
+
+    def _process_event(self, before, current, is_vertex):
         LOG.debug('Process event - starting')
         LOG.debug("Element before event: %s, Current element: %s",
                   before,
@@ -181,71 +231,87 @@ class ScenarioEvaluator(object):
         if not isinstance(scenario_elements, list):
             scenario_elements = [scenario_elements]
         actions = []
-        for action in scenario.actions:
-            for scenario_element in scenario_elements:
-                matches = self._evaluate_subgraphs(scenario.subgraphs,
-                                                   element,
-                                                   scenario_element,
-                                                   action.targets[TARGET])
-
-                actions.extend(self._get_actions_from_matches(scenario.version,
-                                                              matches,
-                                                              mode,
-                                                              action))
+        stats = {MATCHINGS: 0, CANDIDATES: 0, MATCHES: 0}
+        with metrics.timer('evaluate_scenario', scenario.id):
+            for action in scenario.actions:
+                connected_components = self._get_connected_components(
+                    scenario, action.targets[TARGET])
+                for scenario_element in scenario_elements:
+                    matches = self._evaluate_subgraphs(scenario.subgraphs,
+                                                       connected_components,
+                                                       element,
+                                                       scenario_element,
+                                                       stats)
+                    stats[MATCHES] += sum(len(m) for _, m in matches)
 
+                    actions.extend(self._get_actions_from_matches(
+                        scenario, matches, mode, action))
+
+        self._account_scenario(scenario.id, stats, len(actions))
         return actions
 
+    @staticmethod
+    def _account_scenario(scenario_id, stats, actions_count):
+        """Record the cost of a scenario, to find the expensive templates"""
+        metrics.increment('scenario_triggers', scenario_id)
+        metrics.increment('scenario_matchings', scenario_id, stats[MATCHINGS])
+        metrics.increment('scenario_candidates', scenario_id,
+                          stats[CANDIDATES])
+        metrics.increment('scenario_matches', scenario_id, stats[MATCHES])
+        metrics.increment('scenario_actions', scenario_id, actions_count)
+
     def _evaluate_subgraphs(self,
                             subgraphs,
+                            connected_components,
                             element,
                             scenario_element,
-                            action_target):
+                            stats):
         if isinstance(element, Vertex):
             return self._find_vertex_subgraph_matching(subgraphs,
-                                                       action_target,
+                                                       connected_components,
                                                        element,
-                                                       scenario_element)
+                                                       scenario_element,
+                                                       stats)
         else:
             return self._find_edge_subgraph_matching(subgraphs,
-                                                     action_target,
+                                                     connected_components,
                                                      element,
-                                                     scenario_element)
+                                                     scenario_element,
+                                                     stats)
 
     def _get_actions_from_matches(self,
-                                  scenario_version,
+                                  scenario,
                                   combined_matches,
                                   mode,
                                   action_spec):
         actions = []
+        properties_function = \
+            self._get_properties_function(scenario, action_spec)
         for is_switch_mode, matches in combined_matches:
             new_mode = mode
             if is_switch_mode:
                 new_mode = ActionMode.UNDO \
                     if mode == ActionMode.DO else ActionMode.DO
 
-            template_schema = \
-                TemplateSchemaFactory().template_schema(scenario_version)
-
             for match in matches:
-                match_action_spec = self._get_action_spec(action_spec, match)
+                match_action_spec = self._get_action_spec(
+                    action_spec, match, properties_function)
                 items_ids = \
                     [match_item[1].vertex_id for match_item in match.items()]
                 match_hash = md5(tuple(sorted(items_ids)))
-                self._evaluate_property_functions(template_schema, match,
-                                                  match_action_spec.properties)
 
                 actions.append(ActionInfo(match_action_spec, new_mode,
                                           match_action_spec.id, match_hash))
 
         return actions
 
-    def _evaluate_property_functions(self, template_schema, match,
-                                     action_props):
-        """Evaluate the action properties, in case they contain functions
+    @staticmethod
+    def _get_properties_function(scenario, action_spec):
+        """The compiled functions of the action properties
 
         In template version 2 we introduced functions, and specifically the
-        get_attr function. This method evaluate its value and updates the
-        action properties, before the action is being executed.
+        get_attr function, that is evaluated per match before the action is
+        executed.
 
         Example:
 
@@ -257,43 +323,38 @@ class ScenarioEvaluator(object):
                 vm_name: get_attr(instance1,name)
                 force: false
 
-        In this example, the method will iterate over 'properties', and then
-        recursively over 'input', and for 'vm_name' it will replace the
-        call for get_attr with the actual name of the VM. The input for the
-        Mistral workflow will then be:
+        For every match, 'vm_name' is replaced with the actual name of the
+        VM. The input for the Mistral workflow will then be:
         vm_name: vm_1
         force: false
 
+        The functions are compiled when the scenario is loaded to the
+        repository, and compiled here only for scenarios that were created
+        some other way.
         """
-        for key, value in action_props.items():
-            if isinstance(value, dict):
-                # Recursive call for a dictionary
-                self._evaluate_property_functions(template_schema,
-                                                  match, value)
-
-            elif value is not None and is_function(value):
-                # The value is a function
-                func_and_args = re.split('[(),]', value)
-                func_name = func_and_args.pop(0)
-                args = [arg.strip() for arg in func_and_args if len(arg) > 0]
-
-                # Get the function, execute it and update the property value
-                func = template_schema.functions.get(func_name)
-                action_props[key] = func(match, *args)
-
-                LOG.debug('Changed property %s value from %s to %s', key,
-                          value, action_props[key])
+        if scenario.properties_functions is None:
+            scenario.properties_functions = {}
+        functions = scenario.properties_functions
+        if action_spec.id not in functions:
+            template_schema = \
+                TemplateSchemaFactory().template_schema(scenario.version)
+            functions[action_spec.id] = compile_properties(
+                action_spec.properties,
+                template_schema.functions if template_schema else None)
+        return functions[action_spec.id]
 
     @staticmethod
-    def _get_action_spec(action_spec, match):
+    def _get_action_spec(action_spec, match, properties_function=None):
         targets = action_spec.targets
         real_items = {
             target: match[target_id] for target, target_id in targets.items()
         }
+        properties = properties_function(match) if properties_function \
+            else action_spec.properties
         return ActionSpecs(action_spec.id,
                            action_spec.type,
                            real_items,
-                           copy.deepcopy(action_spec.properties))
+                           properties)
 
     @staticmethod
     def _generate_action_id(action_spec):
@@ -333,9 +394,10 @@ class ScenarioEvaluator(object):
 
     def _find_vertex_subgraph_matching(self,
                                        subgraphs,
-                                       action_target,
+                                       connected_components,
                                        vertex,
-                                       scenario_vertex):
+                                       scenario_vertex,
+                                       stats):
         """calculates subgraph matching for vertex
 
         iterates over all the subgraphs, and checks if the triggered vertex is
@@ -345,17 +407,13 @@ class ScenarioEvaluator(object):
         """
 
         matches = []
-        for subgraph in subgraphs:
-            connected_component = self.get_connected_component(subgraph,
-                                                               action_target)
-
-            is_switch_mode = \
-                connected_component.get_vertex(scenario_vertex.vertex_id)
-
-            if is_switch_mode:
+        for subgraph, connected_component in zip(subgraphs,
+                                                 connected_components):
+            if scenario_vertex.vertex_id in connected_component:
                 initial_map = Mapping(scenario_vertex, vertex, True)
-                mat = self._entity_graph.algo.sub_graph_matching(subgraph,
-                                                                 initial_map)
+                stats[MATCHINGS] += 1
+                mat = self._entity_graph.algo.sub_graph_matching(
+                    subgraph, initial_map, stats=stats)
                 matches.append((False, mat))
             else:
                 matches.append((True, []))
@@ -363,9 +421,10 @@ class ScenarioEvaluator(object):
 
     def _find_edge_subgraph_matching(self,
                                      subgraphs,
-                                     action_target,
+                                     connected_components,
                                      edge,
-                                     scenario_edge):
+                                     scenario_edge,
+                                     stats):
         """calculates subgraph matching for edge
 
         iterates over all the subgraphs, and checks if the triggered edge is a
@@ -376,7 +435,8 @@ class ScenarioEvaluator(object):
         """
 
         matches = []
-        for subgraph in subgraphs:
+        for subgraph, connected_component in zip(subgraphs,
+                                                 connected_components):
             subgraph_edge = subgraph.get_edge(scenario_edge.source.vertex_id,
                                               scenario_edge.target.vertex_id,
                                               scenario_edge.edge.label)
@@ -385,8 +445,6 @@ class ScenarioEvaluator(object):
 
             is_switch_mode = subgraph_edge.get(NEG_CONDITION, False)
 
-            connected_component = self.get_connected_component(subgraph,
-                                                               action_target)
             # change the vitrage_is_deleted and negative_condition props to
             # false when is_switch_mode=true so that when we have an event on a
             # negative_condition=true edge it will find the correct subgraph
@@ -394,9 +452,11 @@ class ScenarioEvaluator(object):
                                              subgraph, False)
 
             initial_map = Mapping(scenario_edge.edge, edge, False)
+            stats[MATCHINGS] += 1
             curr_matches = \
                 self._entity_graph.algo.sub_graph_matching(subgraph,
-                                                           initial_map)
+                                                           initial_map,
+                                                           stats=stats)
 
             # switch back to the original values
             self._switch_edge_negative_props(is_switch_mode, scenario_edge,
@@ -408,16 +468,24 @@ class ScenarioEvaluator(object):
             matches.append((is_switch_mode, curr_matches))
         return matches
 
-    def get_connected_component(self, subgraph, target):
-        connected_component = self.connected_component_cache.get(
-            id(subgraph), {}).get(id(target))
-        if not connected_component:
-            connected_component = subgraph.algo.graph_query_vertices(
-                root_id=target,
-                edge_query_dict={'!=': {NEG_CONDITION: True}})
-            self.connected_component_cache[id(subgraph)][id(target)] = \
-                connected_component
-        return connected_component
+    @staticmethod
+    def _get_connected_components(scenario, target):
+        """Per subgraph, the template ids connected to the action target
+
+        The connected components are calculated when the scenario is loaded
+        to the repository, and calculated here only for scenarios that were
+        created some other way.
+        """
+        if scenario.connected_components is None:
+            scenario.connected_components = [{} for _ in scenario.subgraphs]
+        connected_components = []
+        for subgraph, components in zip(scenario.subgraphs,
+                                        scenario.connected_components):
+            if target not in components:
+                components[target] = \
+                    SubGraphBuilder.connected_component(subgraph, target)
+            connected_components.append(components[target])
+        return connected_components
 
     def _db_action_to_action_info(self, db_action):
         target = self._entity_graph.get_vertex(db_action.target_vertex_id)
@@ -454,9 +522,7 @@ class ScenarioEvaluator(object):
     @staticmethod
     def _remove_negative_vertices_from_matches(matches, connected_component):
         for match in matches:
-            ver_ids = [v.vertex_id for v in connected_component.get_vertices()]
-            ver_to_remove = [id for id in match.keys() if id not in ver_ids]
-            for v_id in ver_to_remove:
+            for v_id in set(match) - connected_component:
                 del match[v_id]
 
 
@@ -13,18 +13,28 @@
 # under the License.
 from collections import defaultdict
 from collections import namedtuple
+from collections import OrderedDict
 
+import heapq
 import itertools
+import json
 from oslo_log import log
 
 from vitrage.common.constants import TemplateStatus
 from vitrage.common.constants import TemplateTypes as TType
+from vitrage.common.constants import VertexProperties as VProps
 from vitrage.common.utils import get_portion
+from vitrage.common.utils import md5
 from vitrage.evaluator.base import get_template_schema
 from vitrage.evaluator.base import Template
 from vitrage.evaluator.base import TEMPLATE_LOADER
 from vitrage.evaluator.equivalence_repository import EquivalenceRepository
+from vitrage.evaluator.template_fields import TemplateFields as TFields
+from vitrage.evaluator.template_functions.function_resolver import \
+    compile_properties
 from vitrage.evaluator.template_loading.scenario_loader import ScenarioLoader
+from vitrage.evaluator.template_loading.subgraph_builder import \
+    SubGraphBuilder
 from vitrage.graph.filter import check_filter as check_subset
 from vitrage import storage
 
@@ -32,15 +42,88 @@ LOG = log.getLogger(__name__)
 
 EdgeKeyScenario = namedtuple('EdgeKeyScenario', ['label', 'source', 'target'])
 DEF_TEMPLATES_DIR_OPT = 'def_templates_dir'
+MAX_COMPILED_TEMPLATES = 1000
+
+
+class CompiledScenariosCache(object):
+    """LRU cache of the scenarios compiled from a template
+
+    Compiling a template (condition to DNF, subgraphs, actions and the
+    equivalence expansion) is costly, while the templates rarely change.
+    The cache is keyed by a hash of the template content, together with the
+    definition templates and equivalences it was compiled with, so it is
+    shared by all the scenario repositories created in the process.
+    """
+
+    def __init__(self, max_size=MAX_COMPILED_TEMPLATES):
+        self._max_size = max_size
+        self._scenarios = OrderedDict()
+
+    def get(self, key):
+        scenarios = self._scenarios.pop(key, None)
+        if scenarios is not None:
+            self._scenarios[key] = scenarios
+        return scenarios
+
+    def put(self, key, scenarios):
+        self._scenarios.pop(key, None)
+        self._scenarios[key] = scenarios
+        while len(self._scenarios) > self._max_size:
+            self._scenarios.popitem(last=False)
+
+    def clear(self):
+        self._scenarios.clear()
+
+    def __len__(self):
+        return len(self._scenarios)
+
+
+compiled_scenarios = CompiledScenariosCache()
+
+
+def estimate_scenario_cost(scenario):
+    """Relative cost of evaluating a scenario, before it was measured
+
+    Every trigger of a scenario matches each of its subgraphs for each of its
+    actions, and a matching costs roughly as much as the subgraph size.
+    """
+    subgraphs_size = sum(subgraph.num_vertices() + subgraph.num_edges()
+                         for subgraph in scenario.subgraphs)
+    return max(len(scenario.actions), 1) * max(subgraphs_size, 1)
+
+
+def partition_scenarios(scenario_costs, workers_num):
+    """Partition the scenarios between the workers by their costs
+
+    Longest processing time first - the most expensive scenario is assigned
+    first, each scenario to the worker with the lowest total cost so far.
+    Ties are broken by the scenario id and worker index, so every process
+    calculates the same partition.
+
+    :param scenario_costs: dict of scenario id to its cost
+    :param workers_num: Total number of evaluator workers
+    :return: list of sets of scenario ids, per worker index
+    """
+    partitions = [set() for i in range(workers_num)]
+    loads = [(0, i) for i in range(workers_num)]
+    for scenario_id, cost in sorted(scenario_costs.items(),
+                                    key=lambda item: (-item[1], item[0])):
+        load, worker_index = heapq.heappop(loads)
+        partitions[worker_index].add(scenario_id)
+        heapq.heappush(loads, (load + cost, worker_index))
+    return partitions
 
 
 class ScenarioRepository(object):
-    def __init__(self, conf, worker_index=None, workers_num=None):
+    def __init__(self, conf, worker_index=None, workers_num=None,
+                 scenario_ids=None):
         """Create an instance of ScenarioRepository
 
         :param conf:
         :param worker_index: Index of the current evaluator worker
         :param workers_num: Total number of evaluator workers
+        :param scenario_ids: The scenarios to enable, as assigned to this
+        worker by partition(). Overrides worker_index and workers_num
         """
         self._templates = {}
         self._def_templates = {}
@@ -50,8 +133,10 @@ class ScenarioRepository(object):
         self.relationship_scenarios = defaultdict(list)
         self.entity_scenarios = defaultdict(list)
         self._load_def_templates_from_db()
+        self._compile_context = self._calc_compile_context()
         self._load_templates_from_db()
-        self._enable_worker_scenarios(worker_index, workers_num)
+        self._enable_worker_scenarios(worker_index, workers_num,
+                                      scenario_ids)
         self.actions = self._create_actions_collection()
 
     @property
@@ -80,6 +165,69 @@ class ScenarioRepository(object):
                 scenarios += [(e, s) for e, s in value if s.enabled]
         return scenarios
 
+    def get_enabled_vertex_types(self):
+        """The (category, type) keys of the entities of enabled scenarios
+
+        A None type stands for any type of the category.
+
+        :return: a set of (category, type) tuples, or None if an enabled
+        scenario might be triggered by a vertex of any category
+        """
+        return self._get_vertex_types(lambda s: s.enabled)
+
+    def get_vertex_types(self, scenario_ids):
+        """The (category, type) keys of the entities of the given scenarios
+
+        :return: a set of (category, type) tuples, or None if a scenario
+        might be triggered by a vertex of any category
+        """
+        return self._get_vertex_types(lambda s: s.id in scenario_ids)
+
+    def _get_vertex_types(self, predicate):
+        vertex_types = set()
+        for scenario_key, value in self.entity_scenarios.items():
+            if not any(predicate(s) for e, s in value):
+                continue
+            entity_key = dict(scenario_key)
+            category = entity_key.get(VProps.VITRAGE_CATEGORY)
+            if category is None:
+                return None
+            vertex_types.add((category, entity_key.get(VProps.VITRAGE_TYPE)))
+        return vertex_types
+
+    def get_scenario_costs(self, measured_costs=None):
+        """The cost of every scenario, measured or estimated
+
+        :param measured_costs: dict of scenario id to its measured evaluation
+        time. The estimated costs of the scenarios that were not measured are
+        scaled to the measured ones
+        :return: dict of scenario id to its cost
+        """
+        estimated_costs = defaultdict(int)
+        for scenario in self._all_scenarios:
+            estimated_costs[scenario.id] += estimate_scenario_cost(scenario)
+
+        measured_costs = {
+            scenario_id: cost
+            for scenario_id, cost in (measured_costs or {}).items()
+            if scenario_id in estimated_costs and cost > 0}
+        if not measured_costs:
+            return dict(estimated_costs)
+
+        scale = float(sum(measured_costs.values())) / \
+            sum(estimated_costs[scenario_id] for scenario_id in measured_costs)
+        return {
+            scenario_id: measured_costs.get(scenario_id, cost * scale)
+            for scenario_id, cost in estimated_costs.items()}
+
+    def partition(self, workers_num, measured_costs=None):
+        """Partition the scenarios between the workers by their costs
+
+        :return: list of sets of scenario ids, per worker index
+        """
+        return partition_scenarios(self.get_scenario_costs(measured_costs),
+                                   workers_num)
+
     def get_scenarios_by_edge(self, edge_description):
 
         key = self._create_edge_scenario_key(edge_description)
@@ -101,14 +249,53 @@ class ScenarioRepository(object):
         self.templates[template.uuid] = Template(template.uuid,
                                                  template.file_content,
                                                  template.created_at)
+        # The key must be calculated before loading, as the loaders might
+        # modify the template content
+        key = self._content_hash(self._compile_context,
+                                 template.file_content)
+        scenarios = compiled_scenarios.get(key)
+        if scenarios is None:
+            scenarios = self._compile_template(template)
+            compiled_scenarios.put(key, scenarios)
+        else:
+            LOG.debug('Using compiled scenarios of template %s',
+                      template.uuid)
+
+        # The enabled flag belongs to this repository, so the compiled
+        # scenarios are never added as is
+        for scenario in scenarios:
+            self._add_scenario(scenario.copy())
+
+    def _compile_template(self, template):
         schema = get_template_schema(template.file_content)
         template_data = schema.loaders[TEMPLATE_LOADER].load(
             schema,
             template.file_content,
             self._def_templates)
+        scenarios = []
         for scenario in template_data.scenarios:
-            for equivalent_scenario in self._expand_equivalence(scenario):
-                self._add_scenario(equivalent_scenario)
+            scenarios.extend(self._expand_equivalence(scenario))
+        for scenario in scenarios:
+            scenario.connected_components = \
+                SubGraphBuilder.connected_components(
+                    scenario.subgraphs,
+                    set(a.targets[TFields.TARGET] for a in scenario.actions))
+            scenario.properties_functions = {
+                a.id: compile_properties(a.properties, schema.functions)
+                for a in scenario.actions}
+        return scenarios
+
+    def _calc_compile_context(self):
+        def_templates = sorted(
+            (uuid, t.data) for uuid, t in self._def_templates.items())
+        equivalences = sorted(
+            sorted(str(sorted(entity_key)) for entity_key in equivalence)
+            for equivalence in set(self.entity_equivalences.values()))
+        return self._content_hash(def_templates, equivalences)
+
+    @staticmethod
+    def _content_hash(*contents):
+        return md5(json.dumps(contents, sort_keys=True, default=str))
 
     def _add_def_template(self, def_template):
         self.def_templates[def_template.uuid] = Template(
@@ -189,13 +376,17 @@ class ScenarioRepository(object):
         key = frozenset(list(entity.properties.items()))
         self.entity_scenarios[key].append((entity, scenario))
 
-    def _enable_worker_scenarios(self, worker_ind, n):
+    def _enable_worker_scenarios(self, worker_ind, n, scenario_ids=None):
         """Enable a portion of the scenarios"""
         self._all_scenarios.sort(key=lambda scenario: scenario.id)
 
-        scenarios = self._all_scenarios if \
-            worker_ind is None or n is None else\
-            get_portion(self._all_scenarios, n, worker_ind)
+        if scenario_ids is not None:
+            scenarios = [s for s in self._all_scenarios
+                         if s.id in scenario_ids]
+        elif worker_ind is None or n is None:
+            scenarios = self._all_scenarios
+        else:
+            scenarios = get_portion(self._all_scenarios, n, worker_ind)
         for s in scenarios:
             s.enabled = True
 
@@ -25,7 +25,8 @@ RELATIONSHIP = 'relationship'
 
 class Scenario(object):
     def __init__(self, id, version, condition, actions, subgraphs, entities,
-                 relationships, enabled=False):
+                 relationships, enabled=False, connected_components=None,
+                 properties_functions=None):
         self.id = id
         self.version = version
         self.condition = condition
@@ -34,6 +35,11 @@ class Scenario(object):
         self.entities = entities
         self.relationships = relationships
         self.enabled = enabled
+        # Per subgraph, the frozenset of template ids in the connected
+        # component of each action target
+        self.connected_components = connected_components
+        # Per action id, the compiled functions of the action properties
+        self.properties_functions = properties_functions
 
     def __eq__(self, other):
         return self.id == other.id and \
@@ -43,6 +49,13 @@ class Scenario(object):
             self.entities == other.entities and \
             self.relationships == other.relationships
 
+    def copy(self):
+        """A new scenario sharing the compiled parts, but not the state"""
+        return Scenario(self.id, self.version, self.condition, self.actions,
+                        self.subgraphs, self.entities, self.relationships,
+                        connected_components=self.connected_components,
+                        properties_functions=self.properties_functions)
+
 
 # noinspection PyAttributeOutsideInit
 class TemplateData(object):
@@ -33,7 +33,15 @@ NAME = 'name'
 
 
 def add_templates_to_db(db, templates, template_type, params=None):
+    """Validate the templates and add them to the database
+
+    The definition templates and the names of the existing templates are
+    read once per call, and all the templates are added in one transaction.
+    """
+    def_templates = _load_def_templates(db)
+    template_names = _load_template_names(db)
     db_rows = list()
+    new_rows = list()
     for template in templates:
         final_type = template[METADATA].get(TFields.TYPE, template_type)
         if not final_type or (template_type and template_type != final_type):
@@ -41,7 +49,8 @@ def add_templates_to_db(db, templates, template_type, params=None):
                                              "Unknown template type"))
             continue
 
-        result = _validate_template(db, template, final_type, params)
+        result = _validate_template(template, final_type, def_templates,
+                                    params)
         if result.is_valid_config:
             result = resolve_parameters(template, params)
             if result.is_valid_config and TFields.PARAMETERS in template:
@@ -50,23 +59,31 @@ def add_templates_to_db(db, templates, template_type, params=None):
 
         # validate again, with the resolved parameters
         if result.is_valid_config:
-            result = _validate_template(db, template, final_type)
+            result = _validate_template(template, final_type, def_templates)
 
         # template_name might be a parameter, take it after resolve parameters
         template_name = template.get(METADATA).get(NAME)
 
-        if _is_duplicate(db, template_name):
+        if template_name and template_name in template_names:
             db_rows.append(_get_error_result(template, final_type,
                                              "Duplicate template name"))
-        else:
-            db_row = _to_db_row(result, template, final_type)
-            db.templates.create(db_row)
-            db_rows.append(db_row)
+            continue
 
+        db_row = _to_db_row(result, template, final_type)
+        db_rows.append(db_row)
+        new_rows.append(db_row)
+        if template_name:
+            template_names.add(template_name)
+        if final_type == TType.DEFINITION and result.is_valid_config:
+            # later templates of this call may include it
+            def_templates[db_row.uuid] = Template(db_row.uuid, template, None)
+
+    db.templates.create_all(new_rows)
     return db_rows
 
 
 def validate_templates(db, templates, template_type, params):
+    def_templates = _load_def_templates(db)
     results = list()
     for template in templates:
         final_type = template[METADATA].get(TFields.TYPE, template_type)
@@ -74,17 +91,17 @@ def validate_templates(db, templates, template_type, params):
             results.append(
                 get_content_fault_result(66, "Unknown template type"))
         else:
-            results.append(
-                _validate_template(db, template, final_type, params))
+            results.append(_validate_template(template, final_type,
+                                              def_templates, params))
     return results
 
 
-def _validate_template(db, template, template_type, params=None):
+def _validate_template(template, template_type, def_templates, params=None):
     if template_type == TType.DEFINITION:
         result = template_validation.validate_definition_template(template)
     elif template_type == TType.STANDARD:
         result = template_validation.validate_template(template,
-                                                       _load_def_templates(db),
+                                                       def_templates,
                                                        params)
     elif template_type == TType.EQUIVALENCE:
         result = base.Result("", True, "", "No Validation")
@@ -93,11 +110,9 @@ def _validate_template(db, template, template_type, params=None):
     return result
 
 
-def _is_duplicate(db, template_name):
-    if template_name:
-        templates = db.templates.query(name=template_name)
-        if [t for t in templates if t.status != TemplateStatus.DELETED]:
-            return True
+def _load_template_names(db):
+    return set(t.name for t in db.templates.query()
+               if t.status != TemplateStatus.DELETED)
 
 
 def _get_error_result(template, template_type, msg):
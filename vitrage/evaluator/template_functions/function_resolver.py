@@ -62,6 +62,55 @@ def _recursive_resolve_function(func_info, template, template_block,
                     func_info, template, item, resolve, **kwargs)
 
 
+def compile_properties(properties, functions):
+    """Compile the functions in the properties of an action
+
+    A property such as get_attr(host_1,name) is parsed once, when the
+    scenario is loaded, into a function that is called with the match.
+
+    :param properties: the action properties, possibly with nested dicts
+    :param functions: dict of function name to function, of the template
+    schema
+    :return: a function that returns the properties evaluated for a match,
+    or None if there are no functions in the properties. The properties
+    without functions are shared by all the matches, and must not be
+    modified.
+    """
+    if not properties or not functions:
+        return None
+
+    compiled = []
+    for key, value in properties.items():
+        if isinstance(value, dict):
+            func = compile_properties(value, functions)
+        elif isinstance(value, six.string_types) and is_function(value):
+            func = _compile_function(value, functions)
+        else:
+            func = None
+        if func is not None:
+            compiled.append((key, func))
+
+    if not compiled:
+        return None
+
+    def evaluate(match):
+        result = dict(properties)
+        for key, func in compiled:
+            result[key] = func(match)
+        return result
+
+    return evaluate
+
+
+def _compile_function(value, functions):
+    func_and_args = re.split('[(),]', value)
+    func = functions.get(func_and_args.pop(0))
+    if not func:
+        return None
+    args = tuple(arg.strip() for arg in func_and_args if arg)
+    return lambda match: func(match, *args)
+
+
 def is_function(str):
     """Check if the string represents a function
 
@@ -48,6 +48,26 @@ class SubGraphBuilder(object):
 
         return condition_g
 
+    @classmethod
+    def connected_components(cls, subgraphs, target_ids):
+        """Per subgraph, the connected component of each of the targets"""
+        return [{target_id: cls.connected_component(subgraph, target_id)
+                 for target_id in target_ids}
+                for subgraph in subgraphs]
+
+    @staticmethod
+    def connected_component(subgraph, target_id):
+        """The template ids connected to the target by positive edges
+
+        :rtype: frozenset
+        """
+        if subgraph.get_vertex(target_id) is None:
+            return frozenset()
+        component = subgraph.algo.graph_query_vertices(
+            root_id=target_id,
+            edge_query_dict={'!=': {NEG_CONDITION: True}})
+        return frozenset(v.vertex_id for v in component.get_vertices())
+
     @staticmethod
     def _set_edge_relationship_info(edge_description,
                                     is_positive_condition):
@@ -54,7 +54,8 @@ class GraphAlgorithm(object):
         pass
 
     @abc.abstractmethod
-    def sub_graph_matching(self, sub_graph, known_mappings, validate=False):
+    def sub_graph_matching(self, sub_graph, known_mappings, validate=False,
+                           stats=None):
         """Search for occurrences of a template graph in the graph
 
         In sub-graph matching algorithms complexity is high in the general case
@@ -63,6 +64,9 @@ class GraphAlgorithm(object):
         :type known_mappings: list
         :type sub_graph: driver.Graph
         :type validate: bool
+        :param stats: optional dict, to which the number of explored
+        candidate vertices is added
+        :type stats: dict
         :rtype: list of dict
         """
         pass
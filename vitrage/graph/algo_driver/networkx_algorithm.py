@@ -90,7 +90,8 @@ class NXAlgorithm(GraphAlgorithm):
     def sub_graph_matching(self,
                            subgraph,
                            known_match,
-                           validate=False):
+                           validate=False,
+                           stats=None):
         """Finds all the matching subgraphs in the graph
 
         In case the known_match has a subgraph edge with property
@@ -101,6 +102,8 @@ class NXAlgorithm(GraphAlgorithm):
         :param subgraph: the subgraph to match
         :param known_match: starting point at the subgraph and the graph
         :param validate:
+        :param stats: optional dict, to which the number of explored
+        candidate vertices is added
         :return: all the matching subgraphs in the graph
         """
         sge = known_match.subgraph_element
@@ -110,18 +113,21 @@ class NXAlgorithm(GraphAlgorithm):
             source_matches = self._filtered_subgraph_matching(ge.source_id,
                                                               sge.source_id,
                                                               subgraph,
-                                                              validate)
+                                                              validate,
+                                                              stats)
             target_matches = self._filtered_subgraph_matching(ge.target_id,
                                                               sge.target_id,
                                                               subgraph,
-                                                              validate)
+                                                              validate,
+                                                              stats)
 
             return self._list_union(source_matches, target_matches)
         else:
             return subgraph_matching(self.graph,
                                      subgraph,
                                      [known_match],
-                                     validate)
+                                     validate,
+                                     stats)
 
     def create_graph_from_matching_vertices(self,
                                             query_dict=None,
@@ -145,7 +151,8 @@ class NXAlgorithm(GraphAlgorithm):
                                     ge_v_id,
                                     sge_v_id,
                                     subgraph,
-                                    validate):
+                                    validate,
+                                    stats=None):
         """Runs subgraph_matching on edges vertices with filtering
 
         Runs subgraph_matching on edges vertices after checking if that vertex
@@ -157,7 +164,8 @@ class NXAlgorithm(GraphAlgorithm):
             template_vertex = subgraph.get_vertex(sge_v_id)
             graph_vertex = self.graph.get_vertex(ge_v_id)
             match = Mapping(template_vertex, graph_vertex, True)
-            return subgraph_matching(self.graph, subgraph, [match], validate)
+            return subgraph_matching(self.graph, subgraph, [match], validate,
+                                     stats)
 
         return []
 
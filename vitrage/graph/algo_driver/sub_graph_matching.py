@@ -25,9 +25,11 @@ NEIGHBORS_MAPPED = 'neighbors_mapped'
 GRAPH_VERTEX = 'graph_vertex'
 NEG_VERTEX = 'negative vertex'
 NEG_CONDITION = 'negative_condition'
+CANDIDATES = 'candidates'
 
 
-def subgraph_matching(base_graph, subgraph, matches, validate=False):
+def subgraph_matching(base_graph, subgraph, matches, validate=False,
+                      stats=None):
     """Find all occurrences of subgraph in the graph
 
     In the following, a partial mapping is a copy of the sub-graph.
@@ -65,6 +67,9 @@ def subgraph_matching(base_graph, subgraph, matches, validate=False):
 
     - Step 5: CHECK STRUCTURE
       Filter candidate vertices according to edges
+
+    If stats is given, the number of graph vertices that were checked as
+    candidates is added to its CANDIDATES entry.
     """
     final_subgraphs = []
     initial_sg = _create_initial_subgraph(matches,
@@ -122,6 +127,9 @@ def subgraph_matching(base_graph, subgraph, matches, validate=False):
         graph_candidate_vertices = \
             _remove_used_graph_candidates(graph_candidate_vertices,
                                           curr_subgraph)
+        if stats is not None:
+            stats[CANDIDATES] = \
+                stats.get(CANDIDATES, 0) + len(graph_candidate_vertices)
 
         # STEP 5: STRUCTURE CHECK
         edges = _get_edges_to_mapped_vertices(curr_subgraph,
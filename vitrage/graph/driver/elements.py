@@ -11,13 +11,33 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+from six.moves import intern
+
+# the attributes that make the identity of an edge
+EDGE_KEY_ATTRIBUTES = frozenset(('source_id', 'target_id', 'label'))
+
+
+def intern_keys(properties):
+    """Copy the properties, with interned keys
+
+    Elements that are created from different messages, e.g. alarms with raw
+    properties of their datasource, have distinct copies of the same keys.
+    Interning the keys keeps a single copy of each key in the graph.
+    """
+    return {intern(k) if type(k) is str else k: v
+            for k, v in properties.items()}
 
 
 class PropertiesElement(object):
+    """Base class of the graph elements
+
+    The elements are slotted, since the graph creates many of them.
+    """
+
+    __slots__ = ('properties',)
+
     def __init__(self, properties=None):
-        if properties is None:
-            self.properties = {}
-        self.properties = properties
+        self.properties = {} if properties is None else properties
 
     def __getitem__(self, key):
         """Get a property with 'value = element[key]'"""
@@ -53,6 +73,8 @@ class Vertex(PropertiesElement):
 
     """
 
+    __slots__ = ('vertex_id',)
+
     def __init__(self, vertex_id, properties=None):
         """Create a Vertex instance
 
@@ -83,9 +105,16 @@ class Vertex(PropertiesElement):
         :type other: Vertex
         :rtype: bool
         """
-        return self.__dict__ == other.__dict__ and \
+        return isinstance(other, Vertex) and \
+            self.vertex_id == other.vertex_id and \
             self.properties == other.properties
 
+    def __getstate__(self):
+        return self.vertex_id, self.properties
+
+    def __setstate__(self, state):
+        self.vertex_id, self.properties = state
+
     def copy(self):
         return Vertex(vertex_id=self.vertex_id,
                       properties=self.properties.copy())
@@ -103,8 +132,12 @@ class Edge(PropertiesElement):
     | source vertex |-----------> | target vertex |
     +---------------+             +---------------+
 
+    The hash of an edge is calculated once, and is reset when its source_id,
+    target_id or label change.
     """
 
+    __slots__ = ('source_id', 'target_id', 'label', '_hash')
+
     def __init__(self, source_id, target_id, label, properties=None):
         """Create an Edge instance
 
@@ -131,8 +164,16 @@ class Edge(PropertiesElement):
         self.target_id = target_id
         self.label = label
 
+    def __setattr__(self, name, value):
+        if name in EDGE_KEY_ATTRIBUTES:
+            object.__setattr__(self, '_hash', None)
+        object.__setattr__(self, name, value)
+
     def __hash__(self):
-        return hash('%s%s%s' % (self.source_id, self.target_id, self.label))
+        if self._hash is None:
+            object.__setattr__(self, '_hash', hash(
+                (self.source_id, self.target_id, self.label)))
+        return self._hash
 
     def __repr__(self):
         return '{source_id : %s, target_id : %s, ' \
@@ -152,9 +193,18 @@ class Edge(PropertiesElement):
         :type other: Edge
         :rtype: bool
         """
-        return self.__dict__ == other.__dict__ and \
+        return isinstance(other, Edge) and \
+            self.source_id == other.source_id and \
+            self.target_id == other.target_id and \
+            self.label == other.label and \
             self.properties == other.properties
 
+    def __getstate__(self):
+        return self.source_id, self.target_id, self.label, self.properties
+
+    def __setstate__(self, state):
+        self.source_id, self.target_id, self.label, self.properties = state
+
     def other_vertex(self, v_id):
         """If v_id == target_id return source_id, else return target_id
 
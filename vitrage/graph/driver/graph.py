@@ -20,10 +20,10 @@ vitrage.graph.driver namespace.
 
 """
 import abc
-import copy
 import six
 
 from vitrage.graph.driver.elements import Edge
+from vitrage.graph.driver.elements import intern_keys
 from vitrage.graph.driver.elements import Vertex
 from vitrage.graph.driver.notifier import Notifier
 
@@ -48,6 +48,8 @@ class Graph(object):
         self.name = name
         self.graph_type = graph_type
         self.notifier = Notifier()
+        # Increased on every change of the graph
+        self.version = 0
 
     def subscribe(self, function, finalization=False):
         """Subscribe to graph changes
@@ -297,13 +299,12 @@ class Graph(object):
 
     @staticmethod
     def _merged_properties(base_props, updated_props, overwrite):
-        if base_props is None:
-            return copy.copy(updated_props)
-        else:
-            # Return all updated properties if overwrite is true, or only the
-            # new properties otherwise
-            return {k: v for k, v in updated_props.items()
-                    if overwrite or k not in base_props}
+        # Return all updated properties if overwrite is true, or only the
+        # new properties otherwise
+        if base_props is None or overwrite:
+            return intern_keys(updated_props)
+        return intern_keys({k: v for k, v in updated_props.items()
+                            if k not in base_props})
 
     @abc.abstractmethod
     def remove_vertex(self, v):
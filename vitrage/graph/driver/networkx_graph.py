@@ -25,6 +25,7 @@ from oslo_log import log as logging
 from vitrage.common.constants import VertexProperties as VProps
 from vitrage.graph.algo_driver.networkx_algorithm import NXAlgorithm
 from vitrage.graph.driver.elements import Edge
+from vitrage.graph.driver.elements import intern_keys
 from vitrage.graph.driver.elements import Vertex
 from vitrage.graph.driver.graph import Direction
 from vitrage.graph.driver.graph import Graph
@@ -66,13 +67,15 @@ class NXGraph(Graph):
         return NXAlgorithm(self)
 
     def copy(self):
-        # Networkx graph copy is very slow, so we implement
-        nodes = self._g.nodes(data=True)
-        vertices = [Vertex(vertex_id=n, properties=data) for n, data in nodes]
-        edges_iter = self._g.edges(data=True, keys=True)
-        edges = [Edge(source_id=u, target_id=v, label=l, properties=data)
-                 for u, v, l, data in edges_iter]
-        return NXGraph(self.name, vertices, edges)
+        # Networkx graph copy is very slow, so we implement. The properties
+        # are copied as is, since their keys are already interned
+        graph = NXGraph(self.name)
+        graph._g.add_nodes_from(
+            (n, copy.copy(data)) for n, data in self._g.nodes(data=True))
+        graph._g.add_edges_from(
+            (u, v, l, copy.copy(data))
+            for u, v, l, data in self._g.edges(data=True, keys=True))
+        return graph
 
     @Notifier.update_notify
     def add_vertex(self, v):
@@ -84,7 +87,7 @@ class NXGraph(Graph):
         self._add_vertex(v)
 
     def _add_vertex(self, v):
-        properties_copy = copy.copy(v.properties)
+        properties_copy = intern_keys(v.properties)
         if properties_copy:
             self._g.add_node(v.vertex_id, **properties_copy)
         else:
@@ -100,7 +103,7 @@ class NXGraph(Graph):
         self._add_edge(e)
 
     def _add_edge(self, e):
-        properties_copy = copy.copy(e.properties)
+        properties_copy = intern_keys(e.properties)
         if properties_copy:
             self._g.add_edge(e.source_id, e.target_id,
                              e.label, **properties_copy)
@@ -368,6 +371,7 @@ class NXGraph(Graph):
         else:
             graph = NXGraph()
         graph._g = cPickle.loads(data)
+        graph.version += 1
         return graph
 
     def union(self, other_graph):
@@ -376,3 +380,4 @@ class NXGraph(Graph):
         :type other_graph: NXGraph
         """
         self._g = compose(self._g, other_graph._g)
+        self.version += 1
@@ -58,6 +58,7 @@ class Notifier(object):
         def notified_func(graph, item, *args, **kwargs):
             data_before = _before_func(graph, item)
             func(graph, item, *args, **kwargs)
+            graph.version += 1
             _after_func(graph, item, data_before)
         return notified_func
 
@@ -66,5 +67,6 @@ class Notifier(object):
         @functools.wraps(func)
         def notified_func(graph, item, *args, **kwargs):
             func(graph, item, *args, **kwargs)
+            graph.version += 1
             _after_func(graph, item)
         return notified_func
@@ -17,6 +17,7 @@ from vitrage.common.constants import EdgeProperties as EConst
 from vitrage.common.constants import VertexProperties as VConst
 from vitrage.graph.driver.elements import Edge
 from vitrage.graph.driver.elements import Vertex
+from vitrage.utils.datetime import to_epoch
 
 
 def create_vertex(vitrage_id,
@@ -80,9 +81,35 @@ def create_vertex(vitrage_id,
         properties.update(metadata)
     properties = {k: v for k, v in properties.items() if v is not None}
     vertex = Vertex(vertex_id=vitrage_id, properties=properties)
+    if vitrage_sample_timestamp:
+        try:
+            vertex[VConst.VITRAGE_SAMPLE_EPOCH] = \
+                to_epoch(vitrage_sample_timestamp)
+        except (ValueError, OverflowError):
+            pass
     return vertex
 
 
+def update_sample_timestamp(vertex, vitrage_sample_timestamp):
+    """Set the sample timestamp of a vertex, and its pre-parsed epoch"""
+    vertex[VConst.VITRAGE_SAMPLE_TIMESTAMP] = vitrage_sample_timestamp
+    vertex[VConst.VITRAGE_SAMPLE_EPOCH] = to_epoch(vitrage_sample_timestamp)
+
+
+def get_sample_epoch(vertex):
+    """The sample timestamp of a vertex, in seconds since the epoch
+
+    Vertices of graphs that were stored by older versions have no
+    pre-parsed epoch, so their sample timestamp is parsed.
+    """
+    epoch = vertex.get(VConst.VITRAGE_SAMPLE_EPOCH)
+    if epoch is None:
+        vitrage_sample_timestamp = vertex.get(VConst.VITRAGE_SAMPLE_TIMESTAMP)
+        if vitrage_sample_timestamp:
+            epoch = to_epoch(vitrage_sample_timestamp)
+    return epoch
+
+
 def create_edge(source_id,
                 target_id,
                 relationship_type,
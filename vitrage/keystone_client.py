@@ -14,7 +14,7 @@
 # under the License.
 
 import os
-
+import threading
 
 from keystoneauth1 import exceptions as ka_exception
 from keystoneauth1 import loading as ka_loading
@@ -23,17 +23,43 @@ from keystoneauth1 import session
 from keystoneclient.v3 import client as ks_client_v3
 from oslo_config import cfg
 from oslo_log import log
+import requests
 
 LOG = log.getLogger(__name__)
 
 CFG_GROUP = "service_credentials"
 
+# conf id -> (pid, conf, session)
+_sessions = {}
+_sessions_lock = threading.Lock()
+
 
 def get_session(conf):
-    """Get a vitrage service credentials auth session."""
+    """Get a vitrage service credentials auth session.
+
+    The session is shared by all the clients of the process, so they reuse
+    its token and its pool of keep-alive connections. A forked process
+    creates its own session, since the connections of its parent can not
+    be shared.
+    """
+    with _sessions_lock:
+        pid, _, sess = _sessions.get(id(conf), (None, None, None))
+        if pid != os.getpid():
+            sess = _create_session(conf)
+            _sessions[id(conf)] = (os.getpid(), conf, sess)
+        return sess
+
+
+def _create_session(conf):
+    pool_size = conf[CFG_GROUP].connection_pool_size
+    requests_session = requests.Session()
+    for scheme in ('https://', 'http://'):
+        requests_session.mount(scheme, session.TCPKeepAliveAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size))
+
     auth_plugin = ka_loading.load_auth_from_conf_options(conf, CFG_GROUP)
     return ka_loading.load_session_from_conf_options(
-        conf, CFG_GROUP, auth=auth_plugin
+        conf, CFG_GROUP, auth=auth_plugin, session=requests_session
     )
 
 
@@ -95,6 +121,11 @@ OPTS = [
                         'internalURL', 'adminURL'),
                help='Type of endpoint in Identity service catalog to use for '
                     'communication with OpenStack services.'),
+    cfg.IntOpt('connection_pool_size',
+               default=10,
+               min=1,
+               help='Maximum number of connections that the OpenStack '
+                    'clients of a process keep open to every service.'),
 ]
 
 
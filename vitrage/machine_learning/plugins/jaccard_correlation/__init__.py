@@ -25,10 +25,20 @@ OPTS = [
                help='the amount of events flushes'),
     cfg.StrOpt('output_folder', default='/tmp',
                help='folder to write all reports to'),
+    cfg.StrOpt('accumulations_folder', default='/tmp',
+               help='folder to store the alarms accumulations in'),
+    cfg.IntOpt('compaction_interval', default=10, min=1,
+               help='number of flushes after which the accumulations '
+                    'journal is compacted into a new snapshot'),
     cfg.FloatOpt('correlation_threshold', default=0,
                  help='threshold of interesting correlations'),
     cfg.FloatOpt('high_corr_score', default=0.9,
                  help='high correlation lower limit'),
     cfg.FloatOpt('med_corr_score', default=0.5,
                  help='medium correlation lower limit'),
+    cfg.IntOpt('max_active_alarms', default=0, min=0,
+               help='maximal number of concurrently active alarms that are '
+                    'correlated with each other. Alarms that are activated '
+                    'while the limit is reached are not correlated until '
+                    'their next activation. 0 means no limit'),
     ]
@@ -13,6 +13,7 @@
 # under the License.
 
 from collections import namedtuple
+import os
 from oslo_log import log
 import pickle
 
@@ -23,8 +24,141 @@ AccumulatedData = namedtuple('AccumulatedData', ['activity', 'intersection'])
 ACTIVITY_PATH = "/tmp/alarms_activity.txt"
 INTERSECT_PATH = "/tmp/alarms_intersections.txt"
 
+SNAPSHOT_FILE = 'alarms_accumulations.snapshot'
+JOURNAL_FILE = 'alarms_accumulations.journal'
+
+
+class AccumulationStore(object):
+    """Durable and incremental storage of the alarms accumulations
+
+    The accumulations are stored as a snapshot file, and a journal file to
+    which every save appends only the entries that changed since the
+    previous save. Every compaction_interval saves, the full accumulations
+    are written to a new snapshot that atomically replaces the old one, and
+    the journal is emptied.
+
+    Every compaction starts a new generation, which is written to the
+    snapshot and to every journal record. A crash after replacing the
+    snapshot and before emptying the journal leaves records of an older
+    generation, which are skipped when loading, since the snapshot already
+    holds newer values. A record that was partly written when crashing is
+    discarded.
+    """
+
+    def __init__(self, folder, compaction_interval):
+        self.snapshot_path = os.path.join(folder, SNAPSHOT_FILE)
+        self.journal_path = os.path.join(folder, JOURNAL_FILE)
+        self.compaction_interval = compaction_interval
+        self._saves_since_compaction = 0
+        self._generation = 0
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+
+    def load(self):
+        if not os.path.isfile(self.snapshot_path):
+            # force a compaction, to move the data to the new files
+            self._saves_since_compaction = self.compaction_interval
+            if not os.path.isfile(self.journal_path):
+                return load_data()
+
+        data = AccumulatedData({}, {})
+        generation = 0
+        try:
+            if os.path.isfile(self.snapshot_path):
+                with open(self.snapshot_path, 'rb') as snapshot_f:
+                    generation, data = pickle.load(snapshot_f)
+        except Exception as e:
+            LOG.warning('Cannot load alarms accumulations snapshot - %s', e)
+            self._saves_since_compaction = self.compaction_interval
+            # the next snapshot must be newer than the journal records
+            self._replay_journal(AccumulatedData({}, {}), 0)
+            return AccumulatedData({}, {})
+
+        self._generation = generation
+        records = self._replay_journal(data, generation)
+        self._saves_since_compaction = max(self._saves_since_compaction,
+                                           records)
+        LOG.info('Loaded accumulations of %s alarms and %s intersections',
+                 len(data.activity), len(data.intersection))
+        return data
+
+    def save(self, data_manager):
+        """Save the changes of the data manager since the previous save
+
+        :return: the saved changes
+        :rtype: AccumulatedData
+        """
+        changes = data_manager.pop_changes()
+        self._saves_since_compaction += 1
+        if self._saves_since_compaction >= self.compaction_interval:
+            self.compact(data_manager)
+            return changes
+
+        try:
+            with open(self.journal_path, 'ab') as journal_f:
+                journal_f.write(pickle.dumps((self._generation, changes),
+                                             pickle.HIGHEST_PROTOCOL))
+                journal_f.flush()
+                os.fsync(journal_f.fileno())
+        except Exception:
+            LOG.exception('Cannot save alarms accumulations.')
+        return changes
+
+    def compact(self, data_manager):
+        data = AccumulatedData(data_manager.alarms_activity,
+                               data_manager.alarms_intersects)
+        generation = self._generation + 1
+        try:
+            _atomic_write(self.snapshot_path, pickle.dumps(
+                (generation, data), pickle.HIGHEST_PROTOCOL))
+            self._generation = generation
+            _atomic_write(self.journal_path, b'')
+            self._saves_since_compaction = 0
+        except Exception:
+            LOG.exception('Cannot compact alarms accumulations.')
+
+    def _replay_journal(self, data, generation):
+        """Apply the journal records of the given generation or newer
+
+        :return: the number of applied records
+        """
+        records = 0
+        if not os.path.isfile(self.journal_path):
+            return records
+
+        with open(self.journal_path, 'rb+') as journal_f:
+            journal_size = os.fstat(journal_f.fileno()).st_size
+            valid_offset = 0
+            while valid_offset < journal_size:
+                try:
+                    record_generation, changes = pickle.load(journal_f)
+                except Exception as e:
+                    LOG.warning('Discarding a partial accumulations journal '
+                                'record - %s', e)
+                    journal_f.truncate(valid_offset)
+                    break
+                valid_offset = journal_f.tell()
+                self._generation = max(self._generation, record_generation)
+                if record_generation < generation:
+                    # already in the snapshot
+                    continue
+                data.activity.update(changes.activity)
+                data.intersection.update(changes.intersection)
+                records += 1
+        return records
+
+
+def _atomic_write(path, content):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.rename(tmp_path, path)
+
 
 def load_data():
+    """Load the accumulations that older versions saved in /tmp"""
     try:
         with open(ACTIVITY_PATH, 'rb') as activity_f:
             alarms_activity = pickle.load(activity_f)
@@ -40,20 +174,3 @@ def load_data():
         return AccumulatedData({}, {})
 
     return AccumulatedData(alarms_activity, alarms_intersect)
-
-
-def save_accumulated_data(data_manager):
-    activity = data_manager.alarms_activity
-    intersects = data_manager.alarms_intersects
-
-    try:
-        with open(ACTIVITY_PATH, 'wb') as activity_f:
-            pickle.dump(activity, activity_f)
-    except Exception:
-        LOG.exception('Cannot save alarms_intersect.')
-
-    try:
-        with open(INTERSECT_PATH, 'wb') as intersect_f:
-            pickle.dump(intersects, intersect_f)
-    except Exception:
-        LOG.exception('Cannot save alarms_intersect.')
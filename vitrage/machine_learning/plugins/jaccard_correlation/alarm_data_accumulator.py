@@ -12,56 +12,193 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from collections import defaultdict
 import datetime
 from oslo_log import log
 
+from vitrage.machine_learning.plugins.jaccard_correlation.\
+    accumulation_persistor_utils import AccumulatedData
+
 LOG = log.getLogger(__name__)
 
+EPOCH = datetime.datetime(1970, 1, 1)
+MICROSECONDS = 10 ** 6
+
+
+def to_microseconds(delta):
+    """Convert a timedelta to an exact integer number of microseconds"""
+    return (delta.days * 86400 + delta.seconds) * MICROSECONDS + \
+        delta.microseconds
+
+
+def to_timedelta(microseconds):
+    return datetime.timedelta(microseconds=microseconds)
 
-class AlarmDataAccumulator(object):
 
-    def __init__(self, accumulated_data):
-        self.active_start_times = {}
-        self.alarms_activity = accumulated_data.activity
+class AlarmDataAccumulator(object):
+    """Accumulates the activity time of alarms and of pairs of alarms
+
+    Alarm ids are interned to integer indices, and all times are kept as
+    integer microseconds, so the accumulation loops work on ints only.
+    The intersections are a sparse matrix, keyed by (low index, high index).
+
+    During alarm storms the number of intersections is quadratic in the
+    number of concurrently active alarms. max_active_alarms, if positive,
+    caps the number of active alarms that take part in intersections;
+    alarms that are activated above the cap still accumulate activity.
+    """
+
+    def __init__(self, accumulated_data, max_active_alarms=0):
+        self.max_active_alarms = max_active_alarms
+        self._alarm_ids = []
+        self._alarm_indices = {}
+        self._active_starts = {}
+        self._sampled_active = set()
+        self._activity = {}
         # TODO(annarez): exclude intersections between deduced and it's cause
-        self.alarms_intersects = accumulated_data.intersection
+        self._intersects = {}
+        # index -> indices of the alarms it intersects with
+        self._intersecting = defaultdict(set)
+        self._changed_activity = set()
+        self._changed_intersects = set()
+
+        for alarm_id, activity in accumulated_data.activity.items():
+            self._activity[self._intern(alarm_id)] = to_microseconds(activity)
+        for alarms, intersect in accumulated_data.intersection.items():
+            alarm_1, alarm_2 = alarms
+            key = self._pair_key(self._intern(alarm_1), self._intern(alarm_2))
+            self._intersects[key] = to_microseconds(intersect)
+            self._add_intersecting(*key)
+
+    @property
+    def active_start_times(self):
+        return {self._alarm_ids[index]: EPOCH + to_timedelta(start)
+                for index, start in self._active_starts.items()}
+
+    @property
+    def alarms_activity(self):
+        return {self._alarm_ids[index]: to_timedelta(activity)
+                for index, activity in self._activity.items()}
+
+    @property
+    def alarms_intersects(self):
+        return {frozenset([self._alarm_ids[i], self._alarm_ids[j]]):
+                to_timedelta(intersect)
+                for (i, j), intersect in self._intersects.items()}
 
     def append_active(self, alarm_id, timestamp):
+        index = self._intern(alarm_id)
 
-        if alarm_id in self.active_start_times:
+        if index in self._active_starts:
             LOG.debug("Active alarm %s was started twice. Second time at %s",
                       alarm_id, timestamp)
             return
 
-        self.active_start_times[alarm_id] = timestamp
+        self._active_starts[index] = to_microseconds(timestamp - EPOCH)
+        if self.max_active_alarms <= 0 or \
+                len(self._sampled_active) < self.max_active_alarms:
+            self._sampled_active.add(index)
+        else:
+            LOG.debug("Too many active alarms, %s will not be correlated",
+                      alarm_id)
 
     def append_inactive(self, alarm_id, end_time):
+        index = self._alarm_indices.get(alarm_id)
 
-        if alarm_id not in self.active_start_times:
+        if index not in self._active_starts:
             LOG.debug("Alarm {} at {} was deactivated without being active".
                       format(alarm_id, str(end_time)))
             return
 
-        alarm_duration = end_time - self.active_start_times[alarm_id]
-        self.alarms_activity[alarm_id] = alarm_duration + \
-            self.alarms_activity.get(alarm_id, datetime.timedelta(0))
+        self._deactivate(index, to_microseconds(end_time - EPOCH))
 
-        start_time = self.active_start_times[alarm_id]
+    def _deactivate(self, index, end):
+        start = self._active_starts.pop(index)
+        self._activity[index] = self._activity.get(index, 0) + end - start
+        self._changed_activity.add(index)
 
-        del self.active_start_times[alarm_id]
-        self.append_intersect(alarm_id, start_time, end_time)
+        if index not in self._sampled_active:
+            return
+        self._sampled_active.remove(index)
+
+        intersects = self._intersects
+        changed_intersects = self._changed_intersects
+        active_starts = self._active_starts
+        for active_index in self._sampled_active:
+            key = (index, active_index) if index < active_index \
+                else (active_index, index)
+            intersect = intersects.get(key)
+            if intersect is None:
+                intersect = 0
+                self._add_intersecting(index, active_index)
+            intersects[key] = intersect + \
+                end - max(start, active_starts[active_index])
+            changed_intersects.add(key)
+
+    def pop_changes(self):
+        """The accumulations that changed since the previous call
+
+        :rtype: AccumulatedData
+        """
+        alarm_ids = self._alarm_ids
+        activity = {alarm_ids[index]: to_timedelta(self._activity[index])
+                    for index in self._changed_activity}
+        intersects = {frozenset([alarm_ids[i], alarm_ids[j]]):
+                      to_timedelta(self._intersects[(i, j)])
+                      for i, j in self._changed_intersects}
+        self._changed_activity = set()
+        self._changed_intersects = set()
+        return AccumulatedData(activity, intersects)
+
+    def jaccard_scores(self, threshold=0):
+        """Calculate the jaccard score of all the intersecting alarm pairs
+
+        The jaccard score of two alarms is the intersection of their active
+        times divided by the union of their active times.
+
+        :return: generator of (alarm_1, alarm_2, score) tuples with a score
+        that is at least the threshold
+        """
+        alarm_ids = self._alarm_ids
+        for i, j in self._intersects:
+            score = self._jaccard_score(i, j)
+            if score >= threshold:
+                yield alarm_ids[i], alarm_ids[j], score
 
-    def append_intersect(self, alarm_id, start_time, end_time):
+    def changed_jaccard_scores(self, changes):
+        """Calculate the jaccard score of the alarm pairs that changed
 
-        for active_alarm in self.active_start_times.items():
-            key = frozenset([alarm_id, active_alarm[0]])
-            active_alarm_service = active_alarm[1]
-            self.alarms_intersects[key] = \
-                self.alarms_intersects.get(key, datetime.timedelta(0)) + \
-                self.calc_intersect(start_time, end_time, active_alarm_service)
+        A pair changed if its intersection changed, or the activity of one
+        of its alarms changed.
 
-    def calc_intersect(self, inactive_start, inactive_end, active_start):
-        return inactive_end - max(inactive_start, active_start)
+        :param changes: the changes returned by pop_changes
+        :type changes: AccumulatedData
+        :return: generator of (alarm_1, alarm_2, score) tuples
+        """
+        indices = self._alarm_indices
+        keys = set()
+        for alarms in changes.intersection:
+            alarm_1, alarm_2 = alarms
+            keys.add(self._pair_key(indices[alarm_1], indices[alarm_2]))
+        for alarm_id in changes.activity:
+            index = indices[alarm_id]
+            for other_index in self._intersecting.get(index, ()):
+                keys.add(self._pair_key(index, other_index))
+
+        alarm_ids = self._alarm_ids
+        for i, j in keys:
+            yield alarm_ids[i], alarm_ids[j], self._jaccard_score(i, j)
+
+    def _jaccard_score(self, i, j):
+        intersect = self._intersects[(i, j)]
+        if not intersect:
+            return 0
+        a1_time = self._activity.get(i)
+        a2_time = self._activity.get(j)
+        if not a1_time or not a2_time:
+            LOG.error("One of the alarms given has never been active")
+            return 0
+        return intersect / float(a1_time + a2_time - intersect)
 
     def flush_accumulations(self):
         """flush all active alarms
@@ -70,11 +207,29 @@ class AlarmDataAccumulator(object):
         currently-active alarms, as if they started now
         """
 
-        now = datetime.datetime.now()
-        active_alarms = list(self.active_start_times)
+        now = to_microseconds(datetime.datetime.now() - EPOCH)
+        active_alarms = list(self._active_starts)
+        sampled_active = set(self._sampled_active)
 
         for active_alarm in active_alarms:
-            self.append_inactive(active_alarm, now)
+            self._deactivate(active_alarm, now)
 
         for flushed_active_alarm in active_alarms:
-            self.append_active(flushed_active_alarm, now)
+            self._active_starts[flushed_active_alarm] = now
+        self._sampled_active = sampled_active
+
+    def _intern(self, alarm_id):
+        index = self._alarm_indices.get(alarm_id)
+        if index is None:
+            index = len(self._alarm_ids)
+            self._alarm_ids.append(alarm_id)
+            self._alarm_indices[alarm_id] = index
+        return index
+
+    def _add_intersecting(self, index_1, index_2):
+        self._intersecting[index_1].add(index_2)
+        self._intersecting[index_2].add(index_1)
+
+    @staticmethod
+    def _pair_key(index_1, index_2):
+        return (index_1, index_2) if index_1 < index_2 else (index_2, index_1)
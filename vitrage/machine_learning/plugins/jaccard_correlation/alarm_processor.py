@@ -43,7 +43,12 @@ class AlarmDataProcessor(MachineLearningBase):
 
     def __init__(self, conf):
         super(AlarmDataProcessor, self).__init__(conf)
-        self.data_manager = ADAcummulator(APersistor.load_data())
+        self.accumulation_store = APersistor.AccumulationStore(
+            conf.jaccard_correlation.accumulations_folder,
+            conf.jaccard_correlation.compaction_interval)
+        self.data_manager = ADAcummulator(
+            self.accumulation_store.load(),
+            conf.jaccard_correlation.max_active_alarms)
         self.correlation_manager = CM(conf)
         self.num_of_events_to_flush = \
             conf.jaccard_correlation.num_of_events_to_flush
@@ -65,8 +70,9 @@ class AlarmDataProcessor(MachineLearningBase):
             if self.event_counter == self.num_of_events_to_flush:
                 LOG.debug("Persisting: %s", data)
                 self.data_manager.flush_accumulations()
-                APersistor.save_accumulated_data(self.data_manager)
-                self.correlation_manager.output_correlations(self.data_manager)
+                changes = self.accumulation_store.save(self.data_manager)
+                self.correlation_manager.output_correlations(self.data_manager,
+                                                             changes)
                 self.event_counter = 0
 
     def _update_data_accumulator(self, data):
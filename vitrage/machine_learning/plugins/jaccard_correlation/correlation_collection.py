@@ -38,41 +38,68 @@ class AlarmsProperties(object):
 
 
 class CorrelationCollection(object):
+    """The correlation scores of the pairs of alarm types
+
+    The alarms are grouped by their resource type and name. Every report
+    adds the current score of every correlated pair of alarms to the scores
+    of its pair of alarm types, and the aggregated score of a pair of alarm
+    types is the mean of all the scores that were added to it.
+
+    The sum and the count of the current scores are kept per pair of alarm
+    types, so the cost of a report depends on the number of pairs of alarms
+    that changed and on the number of pairs of alarm types, and not on the
+    number of pairs of alarms.
+    """
 
     def __init__(self, high_corr_score, med_corr_score):
-        self.correlation_list = []
         self.high_corr_score = high_corr_score
         self.med_corr_score = med_corr_score
+        # (alarm_1, alarm_2) -> current score
+        self._current_scores = {}
+        # pair of alarm types -> [sum, count] of the current scores
+        self._current = defaultdict(lambda: [0.0, 0])
+        # pair of alarm types -> [sum, count] of all the added scores
+        self._totals = defaultdict(lambda: [0.0, 0])
 
     def set(self, alarm_1, alarm_2, offset_delta, correlation_score):
-
-        self.correlation_list.append(alarm_1 + alarm_2 +
-                                     (offset_delta, correlation_score))
+        """Add a score of a pair of alarms"""
+
+        totals = self._totals[self._get_key(alarm_1, alarm_2)]
+        totals[0] += correlation_score
+        totals[1] += 1
+
+    def update(self, alarm_1, alarm_2, correlation_score):
+        """Replace the current score of a pair of alarms
+
+        :param correlation_score: the new score, or None if the alarms are
+        no longer correlated
+        """
+
+        key = self._get_key(alarm_1, alarm_2)
+        current = self._current[key]
+        old_score = self._current_scores.pop((alarm_1, alarm_2), None)
+        if old_score is not None:
+            current[0] -= old_score
+            current[1] -= 1
+        if correlation_score is not None:
+            self._current_scores[(alarm_1, alarm_2)] = correlation_score
+            current[0] += correlation_score
+            current[1] += 1
+        if not current[1]:
+            del self._current[key]
+
+    def add_current(self):
+        """Add the current scores of all the pairs of alarms"""
+
+        for key, (score_sum, count) in self._current.items():
+            totals = self._totals[key]
+            totals[0] += score_sum
+            totals[1] += count
 
     def get_aggregated(self):
 
-        pairs_dict = defaultdict(list)
-
-        for alarm_pair in self.correlation_list:
-            if ((alarm_pair[AlarmsProperties.ALARM1_RESOURCE_TYPE],
-                 alarm_pair[AlarmsProperties.ALARM1_NAME],
-                 alarm_pair[AlarmsProperties.ALARM2_RESOURCE_TYPE],
-                 alarm_pair[AlarmsProperties.ALARM2_NAME])) in pairs_dict:
-
-                pairs_dict[alarm_pair[AlarmsProperties.ALARM1_RESOURCE_TYPE],
-                           alarm_pair[AlarmsProperties.ALARM1_NAME],
-                           alarm_pair[AlarmsProperties.ALARM2_RESOURCE_TYPE],
-                           alarm_pair[AlarmsProperties.ALARM2_NAME]]\
-                    .append(alarm_pair[AlarmsProperties.CORR_SCORE])
-            else:
-                pairs_dict[alarm_pair[AlarmsProperties.ALARM2_RESOURCE_TYPE],
-                           alarm_pair[AlarmsProperties.ALARM2_NAME],
-                           alarm_pair[AlarmsProperties.ALARM1_RESOURCE_TYPE],
-                           alarm_pair[AlarmsProperties.ALARM1_NAME]].\
-                    append(alarm_pair[AlarmsProperties.CORR_SCORE])
-
-        results = [(key, sum((pairs_dict[key])) / float(len(pairs_dict[key])))
-                   for key in pairs_dict]
+        results = [(key, score_sum / float(count))
+                   for key, (score_sum, count) in self._totals.items()]
 
         categorize = lambda x: CorrelationPriorities.HIGH \
             if x[1] >= self.high_corr_score \
@@ -82,3 +109,16 @@ class CorrelationCollection(object):
         return [(key, [(x, y) for x, y in group]) for
                 key, group in groupby(sorted(results, key=itemgetter(1)),
                                       key=categorize)]
+
+    @staticmethod
+    def _get_key(alarm_1, alarm_2):
+        """The pair of alarm types, in the same order for both alarm orders"""
+
+        alarm_pair = alarm_1 + alarm_2
+        type_1 = (alarm_pair[AlarmsProperties.ALARM1_RESOURCE_TYPE],
+                  alarm_pair[AlarmsProperties.ALARM1_NAME])
+        type_2 = (alarm_pair[AlarmsProperties.ALARM2_RESOURCE_TYPE],
+                  alarm_pair[AlarmsProperties.ALARM2_NAME])
+        if str(type_2) < str(type_1):
+            type_1, type_2 = type_2, type_1
+        return type_1 + type_2
@@ -35,42 +35,39 @@ class CorrelationManager(object):
             conf.jaccard_correlation.correlation_threshold
         self.output_folder = conf.jaccard_correlation.output_folder
         self.last_written_file = ""
+        self.last_report = None
         self.correlation_table = CCollection(self.high_corr_score,
                                              self.med_corr_score)
+        self._all_pairs_scored = False
 
-    def output_correlations(self, accumulated_data):
-        now = int(time.time())
-        report = self._generate_report(accumulated_data)
-
-        self._dump_correlations(str(now) + "_correlations.out", dict(report))
-
-    @staticmethod
-    def _jaccard_score(alarm_1, alarm_2, accumulated_data):
-        key = frozenset([alarm_1, alarm_2])
-        intersect = accumulated_data.alarms_intersects.get(key)
-
-        if not intersect:
-            return 0
-
-        a1_time = accumulated_data.alarms_activity.get(alarm_1)
-        a2_time = accumulated_data.alarms_activity.get(alarm_2)
-        if not a1_time or not a2_time:
-            LOG.error("One of the alarms given has never been active")
-            return 0
+    def output_correlations(self, accumulated_data, changes=None):
+        """Write the correlations report, unless it did not change
 
-        combined = a1_time + a2_time - intersect
-        # jaccard is intersection / union of alarm times
-        return intersect.total_seconds() / combined.total_seconds()
+        :param changes: the accumulations that changed since the previous
+        report, or None to score all the pairs of alarms again
+        """
+        report = dict(self._generate_report(accumulated_data, changes))
+        if report == self.last_report:
+            LOG.debug('Correlations did not change')
+            return
 
-    def _generate_report(self, accumulated_data):
-
-        for alarm_1, alarm_2 in accumulated_data.alarms_intersects.keys():
-
-            jacc_score = \
-                self._jaccard_score(alarm_1, alarm_2, accumulated_data)
-
-            if jacc_score >= self.correlation_threshold:
-                self.correlation_table.set(alarm_1, alarm_2, 0, jacc_score)
+        now = int(time.time())
+        self._dump_correlations(str(now) + "_correlations.out", report)
+        self.last_report = report
+
+    def _generate_report(self, accumulated_data, changes=None):
+
+        if changes is None or not self._all_pairs_scored:
+            scores = accumulated_data.jaccard_scores()
+            self._all_pairs_scored = True
+        else:
+            scores = accumulated_data.changed_jaccard_scores(changes)
+
+        for alarm_1, alarm_2, jacc_score in scores:
+            if jacc_score < self.correlation_threshold:
+                jacc_score = None
+            self.correlation_table.update(alarm_1, alarm_2, jacc_score)
+        self.correlation_table.add_current()
 
         # mean correlations divided to HIGH, MEDIUM and LOW correlation scores
         report = self.correlation_table.get_aggregated()
@@ -11,11 +11,30 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import functools
+
+from oslo_config import cfg
 from oslo_log import log
 import oslo_messaging as oslo_msg
+from oslo_messaging.notify.dispatcher import PRIORITIES
+from six.moves import queue
+
+from vitrage.common.utils import spawn
 
 # from oslo_messaging import serializer as oslo_serializer
 
+OPTS = [
+    cfg.IntOpt('notification_workers', default=1, min=1,
+               help='Number of threads that handle the notifications of '
+                    'each listener of the persistor and of the notifier. '
+                    'The notifications of an alarm are handled in order, '
+                    'by the same thread'),
+    cfg.IntOpt('notification_queue_size', default=100, min=1,
+               help='Maximal number of notifications that wait for each '
+                    'notification thread. No more notifications are '
+                    'received while the queue is full'),
+]
+
 LOG = log.getLogger(__name__)
 
 DEFAULT_URL = "__default__"
@@ -56,13 +75,97 @@ def get_transport(conf, url=None, optional=False, cache=True, rpc=False):
 
 
 def get_notification_listener(transport, targets, endpoints,
-                              allow_requeue=False):
-    """Return a configured oslo_messaging notification listener."""
+                              allow_requeue=False, workers=1, queue_size=0,
+                              key_func=None):
+    """Return a configured oslo_messaging notification listener.
+
+    :param workers: number of threads that handle the notifications. With
+    more than one thread, the notifications are acknowledged once queued,
+    so they are not requeued if they fail
+    :param queue_size: maximal number of notifications that wait for each
+    thread, 0 for unlimited
+    :param key_func: function of the event type and the payload that
+    returns the key of a notification. Notifications with the same key are
+    handled in order, and notifications without a key are handled after all
+    the preceding notifications
+    """
+    if workers > 1:
+        executor = KeyedExecutor(workers, queue_size)
+        endpoints = [KeyedEndpoint(endpoint, executor, key_func)
+                     for endpoint in endpoints]
     return oslo_msg.get_notification_listener(
         transport, targets, endpoints, executor='blocking',
         allow_requeue=allow_requeue)
 
 
+def get_batch_notification_listener(transport, targets, endpoints,
+                                    batch_size, batch_timeout,
+                                    allow_requeue=False):
+    """Return a configured oslo_messaging batch notification listener."""
+    return oslo_msg.get_batch_notification_listener(
+        transport, targets, endpoints, executor='blocking',
+        allow_requeue=allow_requeue, batch_size=batch_size,
+        batch_timeout=batch_timeout)
+
+
+class KeyedExecutor(object):
+    """Runs functions in worker threads, in order per key
+
+    Functions with the same key are run by the same thread, in the order
+    they were submitted. Every thread has a bounded queue, and submitting
+    to a full queue blocks. A function without a key is run by the calling
+    thread, after all the functions that were submitted before it.
+    """
+
+    def __init__(self, workers, queue_size=0):
+        self._queues = [queue.Queue(queue_size) for _ in range(workers)]
+        for work_queue in self._queues:
+            spawn(self._work, work_queue)
+
+    def submit(self, key, func, *args):
+        if key is None:
+            self.join()
+            return func(*args)
+        self._queues[hash(key) % len(self._queues)].put((func, args))
+
+    def join(self):
+        for work_queue in self._queues:
+            work_queue.join()
+
+    @staticmethod
+    def _work(work_queue):
+        while True:
+            func, args = work_queue.get()
+            try:
+                func(*args)
+            except Exception:
+                LOG.exception('Failed to handle a notification')
+            finally:
+                work_queue.task_done()
+
+
+class KeyedEndpoint(object):
+    """Hands the notifications of an endpoint to a KeyedExecutor"""
+
+    def __init__(self, endpoint, executor, key_func=None):
+        self._executor = executor
+        self._key_func = key_func
+        for priority in PRIORITIES:
+            method = getattr(endpoint, priority, None)
+            if method:
+                setattr(self, priority, functools.partial(self._submit,
+                                                          method))
+        if hasattr(endpoint, 'filter_rule'):
+            self.filter_rule = endpoint.filter_rule
+
+    def _submit(self, method, ctxt, publisher_id, event_type, payload,
+                metadata):
+        key = self._key_func(event_type, payload) if self._key_func \
+            else None
+        self._executor.submit(key, method, ctxt, publisher_id, event_type,
+                              payload, metadata)
+
+
 class VitrageNotifier(object):
     """Allows writing to message bus"""
     def __init__(self, conf, publisher_id, topics):
@@ -0,0 +1,37 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from oslo_config import cfg
+
+OPTS = [
+    cfg.BoolOpt('enabled',
+                default=True,
+                help='Collect counters and latencies of the event '
+                     'processing pipeline'),
+    cfg.StrOpt('dump_folder',
+               default='/tmp/vitrage_metrics',
+               help='Folder to which every vitrage-graph process dumps its '
+                    'metrics, and the sampling profiler its results'),
+    cfg.IntOpt('dump_interval',
+               default=30,
+               min=0,
+               help='Interval between dumps of the metrics of every '
+                    'process (in seconds). 0 disables the dumps'),
+    cfg.FloatOpt('profiler_sample_interval',
+                 default=0.005,
+                 min=0.001,
+                 help='Interval between stack samples of the sampling '
+                      'profiler (in seconds). The profiler is toggled by '
+                      'sending SIGUSR2 to a vitrage-graph process'),
+]
@@ -0,0 +1,253 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import bisect
+from collections import defaultdict
+import json
+import os
+import threading
+import time
+
+from oslo_log import log
+
+from vitrage.common.utils import spawn
+
+LOG = log.getLogger(__name__)
+
+# upper bounds of the latency histogram buckets (in seconds)
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10)
+BUCKET_NAMES = ['<=%s' % b for b in BUCKETS] + ['>%s' % BUCKETS[-1]]
+
+DUMP_SUFFIX = '.metrics.json'
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class Histogram(object):
+    __slots__ = ('counts', 'count', 'sum', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'avg': self.sum / self.count if self.count else 0.0,
+            'max': self.max,
+            'buckets': {name: count for name, count
+                        in zip(BUCKET_NAMES, self.counts) if count},
+        }
+
+
+class _Timer(object):
+    __slots__ = ('_registry', '_name', '_label', '_start')
+
+    def __init__(self, registry, name, label):
+        self._registry = registry
+        self._name = name
+        self._label = label
+
+    def __enter__(self):
+        self._start = _clock()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._registry.observe(self._name, self._label,
+                               _clock() - self._start)
+
+
+class _NullTimer(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry(object):
+    """Counters, latency histograms and gauges of a single process
+
+    Every metric has a name, e.g. the pipeline stage, and a label, e.g. the
+    datasource or the scenario, so each stage is measured per label.
+    Gauges are functions that are called only when taking a snapshot.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.reset()
+
+    def increment(self, name, label, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[(name, label)] += value
+
+    def observe(self, name, label, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get((name, label))
+            if histogram is None:
+                histogram = self._histograms[(name, label)] = Histogram()
+            histogram.observe(seconds)
+
+    def timer(self, name, label):
+        """Context manager that observes the latency of its block"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, label)
+
+    def set_gauge(self, name, label, func):
+        with self._lock:
+            self._gauges[(name, label)] = func
+
+    def reset(self):
+        """Remove all the metrics
+
+        The lock is recreated as well, since in a forked process it may have
+        been held by a thread of the parent process.
+        """
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+        self._histograms = {}
+        self._gauges = {}
+
+    def snapshot(self):
+        with self._lock:
+            counters = list(self._counters.items())
+            histograms = [(key, h.to_dict())
+                          for key, h in self._histograms.items()]
+            gauges = list(self._gauges.items())
+
+        result = {'counters': {}, 'histograms': {}, 'gauges': {}}
+        for (name, label), value in counters:
+            result['counters'].setdefault(name, {})[label] = value
+        for (name, label), value in histograms:
+            result['histograms'].setdefault(name, {})[label] = value
+        for (name, label), func in gauges:
+            try:
+                value = func()
+            except Exception:
+                value = None
+            result['gauges'].setdefault(name, {})[label] = value
+        return result
+
+
+REGISTRY = MetricsRegistry()
+_service_name = None
+_dumping_pid = None
+
+
+def increment(name, label, value=1):
+    REGISTRY.increment(name, label, value)
+
+
+def observe(name, label, seconds):
+    REGISTRY.observe(name, label, seconds)
+
+
+def timer(name, label):
+    return REGISTRY.timer(name, label)
+
+
+def set_gauge(name, label, func):
+    REGISTRY.set_gauge(name, label, func)
+
+
+def snapshot():
+    result = REGISTRY.snapshot()
+    result['service'] = _service_name
+    result['pid'] = os.getpid()
+    result['timestamp'] = time.time()
+    return result
+
+
+def setup(conf, service_name):
+    """Start collecting the metrics of this process
+
+    Called once in every process, after it was forked, since the metrics of
+    the parent process are meaningless in its children.
+    """
+    global _service_name, _dumping_pid
+    _service_name = service_name
+    REGISTRY.reset()
+    REGISTRY.enabled = conf.metrics.enabled
+    if REGISTRY.enabled and conf.metrics.dump_interval and \
+            _dumping_pid != os.getpid():
+        _dumping_pid = os.getpid()
+        spawn(_dump_periodically, conf.metrics.dump_folder,
+              conf.metrics.dump_interval)
+
+
+def dump_path(folder, pid=None):
+    return os.path.join(folder, '%s%s' % (pid or os.getpid(), DUMP_SUFFIX))
+
+
+def dump(folder):
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+    path = dump_path(folder)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(snapshot(), f)
+    os.rename(tmp_path, path)
+
+
+def load_dumps(folder, max_age):
+    """Load the recent metrics dumps of all processes
+
+    :param max_age: dumps that are older than this (in seconds) belong to
+    processes that are gone, and are ignored
+    """
+    if not os.path.isdir(folder):
+        return []
+    dumps = []
+    min_time = time.time() - max_age
+    for file_name in sorted(os.listdir(folder)):
+        if not file_name.endswith(DUMP_SUFFIX):
+            continue
+        path = os.path.join(folder, file_name)
+        try:
+            if os.path.getmtime(path) < min_time:
+                continue
+            with open(path) as f:
+                dumps.append(json.load(f))
+        except Exception as e:
+            LOG.warning('Failed to load metrics dump %s - %s', path, e)
+    return dumps
+
+
+def _dump_periodically(folder, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            dump(folder)
+        except Exception:
+            LOG.exception('Failed to dump metrics to %s', folder)
@@ -0,0 +1,133 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from collections import defaultdict
+import os
+import signal
+import sys
+import threading
+import time
+
+from oslo_log import log
+
+from vitrage.common.utils import spawn
+
+LOG = log.getLogger(__name__)
+
+MAX_STACK_DEPTH = 100
+
+
+class SamplingProfiler(object):
+    """Periodically samples the stacks of all the threads of the process
+
+    Unlike cProfile, it profiles all the threads, and its overhead depends on
+    the sample interval only, so it can be turned on in a loaded process.
+    The results are written in the collapsed stacks format of flame graphs.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._stacks = defaultdict(int)
+        self._samples = 0
+        self._running = False
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._running
+
+    def start(self):
+        if self._running:
+            return
+        self._stacks = defaultdict(int)
+        self._samples = 0
+        self._running = True
+        self._thread = spawn(self._sample_loop)
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            for stack, count in sorted(self._stacks.items(),
+                                       key=lambda item: -item[1]):
+                f.write('%s %s\n' % (stack, count))
+        LOG.info('Sampling profiler wrote %s samples to %s',
+                 self._samples, path)
+
+    def _sample_loop(self):
+        own_id = threading.current_thread().ident
+        while self._running:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self._stacks[self._collapse(frame)] += 1
+            self._samples += 1
+            time.sleep(self.interval)
+
+    @staticmethod
+    def _collapse(frame):
+        stack = []
+        while frame is not None and len(stack) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            stack.append('%s:%s:%s' % (os.path.basename(code.co_filename),
+                                       code.co_name, frame.f_lineno))
+            frame = frame.f_back
+        return ';'.join(reversed(stack))
+
+
+_profiler = None
+
+
+def toggle(conf):
+    """Start the sampling profiler, or stop it and dump its results"""
+    global _profiler
+    if _profiler is None:
+        _profiler = SamplingProfiler(conf.metrics.profiler_sample_interval)
+
+    if not _profiler.running:
+        LOG.info('Sampling profiler started')
+        _profiler.start()
+        return
+
+    _profiler.stop()
+    folder = conf.metrics.dump_folder
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+    _profiler.dump(os.path.join(folder, 'profile-%s-%s.stacks' % (
+        os.getpid(), time.strftime('%Y%m%d%H%M%S'))))
+
+
+def register_signal(conf):
+    """Toggle the sampling profiler on SIGUSR2
+
+    Must be called from the main thread.
+    """
+    if not hasattr(signal, 'SIGUSR2'):
+        return
+
+    def handler(signum, frame):
+        # do not block the main thread while the sampling thread stops
+        spawn(_safe_toggle, conf)
+
+    signal.signal(signal.SIGUSR2, handler)
+
+
+def _safe_toggle(conf):
+    try:
+        toggle(conf)
+    except Exception:
+        LOG.exception('Failed to toggle the sampling profiler')
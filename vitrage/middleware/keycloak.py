@@ -12,6 +12,12 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+import time
+
 import jwt
 import os
 import requests
@@ -24,6 +30,7 @@ from pecan.core import abort
 from six.moves import urllib
 from webob import exc
 
+from vitrage.metrics import registry as metrics
 
 LOG = logging.getLogger(__name__)
 
@@ -46,8 +53,73 @@ KEYCLOAK_OPTS = [
         default='/realms/%s/protocol/openid-connect/userinfo',
         help='Endpoint against which authorization will be performed'
     ),
+    cfg.IntOpt('token_cache_ttl', default=60, min=0,
+               help='Time (in seconds) to cache a validated token, so its '
+                    'next requests are not validated again. A token is '
+                    'never cached beyond its expiration. 0 disables the '
+                    'cache'),
+    cfg.IntOpt('token_cache_size', default=1000, min=1,
+               help='Maximal number of cached validated tokens'),
+    cfg.BoolOpt('verify_token_locally', default=False,
+                help='Validate the token signature against the public keys '
+                     'of the realm, instead of calling the userinfo '
+                     'endpoint of Keycloak'),
+    cfg.StrOpt(
+        'jwks_endpoint_url',
+        default='/realms/%s/protocol/openid-connect/certs',
+        help='Endpoint of the public keys of the realm, used when '
+             'verify_token_locally is set'
+    ),
+    cfg.IntOpt('jwks_cache_ttl', default=3600, min=0,
+               help='Time (in seconds) to cache the public keys of a realm'),
 ]
 
+# minimal time between fetches of the public keys for an unknown key id
+MIN_JWKS_REFRESH_INTERVAL = 30
+
+
+class TokenCache(object):
+    """LRU cache of the claims of validated tokens
+
+    The tokens are keyed by their hash, and expire after the ttl or the
+    expiration time of the token, whichever is first.
+    """
+
+    def __init__(self, max_size, ttl):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._tokens = OrderedDict()
+
+    def get(self, token):
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._tokens.pop(key, None)
+            if entry is None or entry[0] <= now:
+                return None
+            self._tokens[key] = entry
+            return entry[1]
+
+    def put(self, token, claims):
+        expiry = time.time() + self._ttl
+        if claims.get('exp'):
+            expiry = min(expiry, float(claims['exp']))
+        if expiry <= time.time():
+            return
+        with self._lock:
+            self._tokens.pop(self._key(token), None)
+            self._tokens[self._key(token)] = (expiry, claims)
+            while len(self._tokens) > self._max_size:
+                self._tokens.popitem(last=False)
+
+    def __len__(self):
+        return len(self._tokens)
+
+    @staticmethod
+    def _key(token):
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
 
 class KeycloakAuth(base.ConfigurableMiddleware):
 
@@ -63,7 +135,18 @@ class KeycloakAuth(base.ConfigurableMiddleware):
             self._get_system_ca_file()
         self.user_info_endpoint_url = self._conf_get('user_info_endpoint_url',
                                                      KEYCLOAK_GROUP)
+        self.verify_token_locally = self._conf_get('verify_token_locally',
+                                                   KEYCLOAK_GROUP)
+        self.jwks_endpoint_url = self._conf_get('jwks_endpoint_url',
+                                                KEYCLOAK_GROUP)
+        self.jwks_cache_ttl = self._conf_get('jwks_cache_ttl', KEYCLOAK_GROUP)
+        token_cache_ttl = self._conf_get('token_cache_ttl', KEYCLOAK_GROUP)
+        self.token_cache = TokenCache(
+            self._conf_get('token_cache_size', KEYCLOAK_GROUP),
+            token_cache_ttl) if token_cache_ttl else None
         self.decoded = {}
+        self._jwks = {}
+        self._jwks_lock = threading.Lock()
 
     @property
     def reject_auth_headers(self):
@@ -87,41 +170,96 @@ class KeycloakAuth(base.ConfigurableMiddleware):
 
     def _authenticate(self, req):
         self.token = req.headers.get('X-Auth-Token')
-        if self.token:
-            self._decode()
-        else:
+        if not self.token:
             message = 'Auth token must be provided in "X-Auth-Token" header.'
             self._unauthorized(message)
 
-        self.call_keycloak()
+        decoded = self.token_cache.get(self.token) \
+            if self.token_cache is not None else None
+        if decoded is not None:
+            metrics.increment('token_cache_hits', 'keycloak')
+            self.decoded = decoded
+        else:
+            metrics.increment('token_cache_misses', 'keycloak')
+            self._decode()
+            if self.verify_token_locally and jwt.algorithms.has_crypto:
+                self._verify_signature()
+            else:
+                self.call_keycloak()
+            if self.token_cache is not None:
+                self.token_cache.put(self.token, self.decoded)
 
         self._set_req_headers(req)
 
     def _decode(self):
         try:
-            self.decoded = jwt.decode(self.token, algorithms=['RS256'],
-                                      verify=False)
+            self.decoded = jwt.decode(
+                self.token, algorithms=['RS256'],
+                options={'verify_signature': False})
         except jwt.DecodeError:
             message = "Token can't be decoded because of wrong format."
             self._unauthorized(message)
 
     def call_keycloak(self):
-        if self.user_info_endpoint_url.startswith(('http://', 'https://')):
-            endpoint = self.user_info_endpoint_url
-        else:
-            endpoint = ('%s' + self.user_info_endpoint_url) % \
-                       (self.auth_url, self.realm_name)
+        endpoint = self._endpoint(self.user_info_endpoint_url,
+                                  self.realm_name)
         headers = {'Authorization': 'Bearer %s' % self.token}
+        resp = requests.get(endpoint, headers=headers,
+                            **self._request_kwargs(endpoint))
+
+        if not resp.ok:
+            abort(resp.status_code, resp.reason)
+
+    def _endpoint(self, endpoint_url, realm_name):
+        if endpoint_url.startswith(('http://', 'https://')):
+            return endpoint_url
+        return ('%s' + endpoint_url) % (self.auth_url, realm_name)
+
+    def _request_kwargs(self, endpoint):
         verify = None
         if urllib.parse.urlparse(endpoint).scheme == "https":
             verify = False if self.insecure else self.cafile
-        cert = (self.certfile, self.keyfile) if self.certfile and self.keyfile \
-            else None
-        resp = requests.get(endpoint, headers=headers,
-                            verify=verify, cert=cert)
+        cert = (self.certfile, self.keyfile) \
+            if self.certfile and self.keyfile else None
+        return dict(verify=verify, cert=cert)
+
+    def _verify_signature(self):
+        try:
+            key_id = jwt.get_unverified_header(self.token).get('kid')
+            key = self._get_public_key(key_id)
+            if key is None:
+                self._unauthorized('Token is signed by an unknown key.')
+            self.decoded = jwt.decode(self.token, key=key,
+                                      algorithms=['RS256'],
+                                      options={'verify_aud': False})
+        except jwt.InvalidTokenError as e:
+            self._unauthorized('Token is invalid - %s' % e)
+
+    def _get_public_key(self, key_id):
+        """The public key of the realm, from the cached JWKS document"""
+        realm_name = self.realm_name
+        with self._jwks_lock:
+            fetch_time, keys = self._jwks.get(realm_name, (0, {}))
+            age = time.time() - fetch_time
+            if age > self.jwks_cache_ttl or \
+                    (key_id not in keys and
+                     age > MIN_JWKS_REFRESH_INTERVAL):
+                keys = self._fetch_public_keys(realm_name)
+                self._jwks[realm_name] = (time.time(), keys)
+            return keys.get(key_id)
 
+    def _fetch_public_keys(self, realm_name):
+        endpoint = self._endpoint(self.jwks_endpoint_url, realm_name)
+        resp = requests.get(endpoint, **self._request_kwargs(endpoint))
         if not resp.ok:
             abort(resp.status_code, resp.reason)
+        keys = {}
+        for jwk in resp.json().get('keys', []):
+            if jwk.get('kty') == 'RSA':
+                keys[jwk.get('kid')] = \
+                    jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(jwk))
+        LOG.info('Fetched %s public keys of realm %s', len(keys), realm_name)
+        return keys
 
     def _set_req_headers(self, req):
         req.headers['X-Identity-Status'] = 'Confirmed'
@@ -15,6 +15,7 @@ from oslo_log import log
 import oslo_messaging
 from oslo_utils import importutils
 
+from vitrage.common.constants import VertexProperties as VProps
 from vitrage.coordination import service as coord
 from vitrage import messaging
 from vitrage.opts import register_opts
@@ -88,7 +89,16 @@ class VitrageNotifierService(coord.Service):
         LOG.debug('Initializing notifier with topic %s', topic)
 
         self.listeners.append(messaging.get_notification_listener(
-            transport, [oslo_messaging.Target(topic=topic)], [endpoint]))
+            transport, [oslo_messaging.Target(topic=topic)], [endpoint],
+            workers=self.conf.notification_workers,
+            queue_size=self.conf.notification_queue_size,
+            key_func=_get_event_key))
+
+
+def _get_event_key(event_type, payload):
+    """The notifications of an alarm are handled in order"""
+    if isinstance(payload, dict):
+        return payload.get(VProps.VITRAGE_ID)
 
 
 class VitrageDefaultEventEndpoint(object):
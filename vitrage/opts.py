@@ -27,6 +27,8 @@ import vitrage.evaluator.actions
 import vitrage.keystone_client
 import vitrage.machine_learning
 import vitrage.machine_learning.plugins.jaccard_correlation
+import vitrage.messaging
+import vitrage.metrics
 import vitrage.notifier
 import vitrage.notifier.plugins.snmp
 import vitrage.notifier.plugins.webhook
@@ -65,9 +67,11 @@ def list_opts():
         ('snmp_parsing', vitrage.snmp_parsing.OPTS),
         ('zaqar', vitrage.notifier.plugins.zaqar.OPTS),
         ('coordination', vitrage.coordination.OPTS),
+        ('metrics', vitrage.metrics.OPTS),
         ('DEFAULT', itertools.chain(
             vitrage.os_clients.OPTS,
             vitrage.rpc.OPTS,
+            vitrage.messaging.OPTS,
             vitrage.notifier.OPTS))
     ]
 
@@ -48,7 +48,10 @@ class PersistorService(coord.Service):
             oslo_m.Target(topic=conf.persistency.persistor_topic)
         self.listener = messaging.get_notification_listener(
             transport, [target],
-            [VitragePersistorEndpoint(self.db_connection)])
+            [VitragePersistorEndpoint(self.db_connection)],
+            workers=conf.notification_workers,
+            queue_size=conf.notification_queue_size,
+            key_func=VitragePersistorEndpoint.get_event_key)
         self.scheduler = Scheduler(conf, db_connection)
 
     def run(self):
@@ -86,6 +89,18 @@ class VitragePersistorEndpoint(object):
         LOG.debug('Event_type: %s Payload %s', event_type, payload)
         self.process_event(event_type, payload)
 
+    @staticmethod
+    def get_event_key(event_type, payload):
+        """The events of an alarm are persisted in order
+
+        The causal edges refer to two alarms, so they are persisted after
+        all the preceding events.
+        """
+        if event_type in (NETypes.ACTIVATE_CAUSAL_RELATION,
+                          NETypes.DEACTIVATE_CAUSAL_RELATION):
+            return None
+        return payload.get(VProps.VITRAGE_ID)
+
     def process_event(self, event_type, payload):
         writer = self.event_type_to_writer.get(event_type)
         if not writer:
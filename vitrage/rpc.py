@@ -25,6 +25,13 @@ OPTS = [
     cfg.StrOpt('rpc_topic',
                default='rpcapiv1',
                help='The topic vitrage listens on'),
+    cfg.StrOpt('rpc_payload_codec',
+               default='zlib',
+               choices=['json', 'zlib'],
+               help='The encoding of the topology, alarms and resources '
+                    'that are sent to the API. zlib compresses their JSON '
+                    'text, and json sends it as is, which is faster but '
+                    'much larger, e.g. for an API on the same host'),
 ]
 
 LOG = log.getLogger(__name__)
@@ -21,4 +21,18 @@ OPTS = [
     cfg.StrOpt('oid_mapping',
                default='',
                help='The default path of oid_mapping yaml file.'),
+    cfg.IntOpt('workers',
+               default=2,
+               min=1,
+               help='Number of threads that decode the received traps'),
+    cfg.IntOpt('queue_size',
+               default=10000,
+               min=1,
+               help='Maximal number of received traps that wait to be '
+                    'decoded. Traps received when the queue is full are '
+                    'dropped'),
+    cfg.IntOpt('publish_batch_size',
+               default=100,
+               min=1,
+               help='Maximal number of events that are published together'),
     ]
@@ -12,7 +12,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from collections import Counter
 from datetime import datetime
+import threading
+import time
 
 from oslo_log import log
 import oslo_messaging
@@ -23,17 +26,24 @@ from pysnmp.carrier.asyncore.dgram import udp6
 from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
 from pysnmp.proto import api as snmp_api
 from pysnmp.proto.rfc1902 import Integer
+from six.moves import queue
 import sys
 
 from vitrage.common.constants import EventProperties
+from vitrage.common.utils import spawn
 from vitrage.coordination import service as coord
 from vitrage.datasources.transformer_base import extract_field_value
 from vitrage.messaging import get_transport
+from vitrage.metrics import registry as metrics
 from vitrage.snmp_parsing.properties import SnmpEventProperties as SEProps
 from vitrage.utils.file import load_yaml_file
 
 LOG = log.getLogger(__name__)
 
+STATS_LOG_INTERVAL = 60
+COUNTERS = ('received', 'dropped', 'unmapped', 'decode_failed',
+            'published', 'publish_failed')
+
 
 class SnmpParsingService(coord.Service):
     RUN_FOREVER = 1
@@ -44,11 +54,23 @@ class SnmpParsingService(coord.Service):
         self.listening_port = conf.snmp_parsing.snmp_listening_port
         self.oid_mapping = \
             load_yaml_file(self.conf.snmp_parsing.oid_mapping)
+        self._oid_index = self._build_oid_index(self.oid_mapping)
+        self._traps = queue.Queue(conf.snmp_parsing.queue_size)
+        self._events = queue.Queue(conf.snmp_parsing.queue_size)
+        self._counters = Counter()
+        self._counters_lock = threading.Lock()
         self._init_oslo_notifier()
 
     def run(self):
         super(SnmpParsingService, self).run()
         LOG.info("Vitrage SNMP Parsing Service - Starting...")
+        metrics.setup(self.conf, 'SnmpParsingService-%s' % self.worker_id)
+        self.register_stats_gauges()
+
+        for i in range(self.conf.snmp_parsing.workers):
+            spawn(self._decode_traps)
+        spawn(self._publish_events)
+        spawn(self._log_stats_periodically)
 
         transport_dispatcher = AsyncoreDispatcher()
         transport_dispatcher.registerRecvCbFun(self.callback_func)
@@ -81,6 +103,57 @@ class SnmpParsingService(coord.Service):
     # noinspection PyUnusedLocal
     def callback_func(self, transport_dispatcher, transport_domain,
                       transport_address, whole_msg):
+        """Queue the received message, to be decoded by the workers
+
+        Runs on the dispatcher thread, so it must not block the receiving
+        of the next traps.
+        """
+        try:
+            self._traps.put_nowait(whole_msg)
+            self._count('received')
+        except queue.Full:
+            self._count('dropped')
+            LOG.debug('Trap queue is full, dropping a trap from %s',
+                      transport_address)
+
+    def stats(self):
+        with self._counters_lock:
+            stats = dict.fromkeys(COUNTERS, 0)
+            stats.update(self._counters)
+        stats['trap_queue_depth'] = self._traps.qsize()
+        stats['event_queue_depth'] = self._events.qsize()
+        return stats
+
+    def register_stats_gauges(self):
+        """Report the stats in the metrics of the process
+
+        Called after metrics.setup(), that removes the gauges.
+        """
+        for name in COUNTERS:
+            metrics.set_gauge('snmp_traps', name,
+                              lambda name=name: self._counters[name])
+        metrics.set_gauge('queue_depth', 'snmp_traps', self._traps.qsize)
+        metrics.set_gauge('queue_depth', 'snmp_events', self._events.qsize)
+
+    def _count(self, name, amount=1):
+        with self._counters_lock:
+            self._counters[name] += amount
+
+    def _decode_traps(self):
+        while True:
+            whole_msg = self._traps.get()
+            try:
+                for snmp_trap in self._decode_msg(whole_msg):
+                    event = self._create_event(snmp_trap)
+                    if event:
+                        self._events.put(event)
+                    else:
+                        self._count('unmapped')
+            except Exception as e:
+                self._count('decode_failed')
+                LOG.warning('Snmp failed to decode trap. Exception: %s', e)
+
+    def _decode_msg(self, whole_msg):
         while whole_msg:
             msg_ver = int(snmp_api.decodeMessageVersion(whole_msg))
             if msg_ver in snmp_api.protoModules:
@@ -99,7 +172,7 @@ class SnmpParsingService(coord.Service):
 
                 binds_dict = self._convert_binds_to_dict(ver_binds)
                 LOG.debug('Receive binds info after convert: %s' % binds_dict)
-                self._send_snmp_to_queue(binds_dict)
+                yield binds_dict
 
     def _convert_binds_to_dict(self, var_binds):
         binds_dict = {}
@@ -127,35 +200,80 @@ class SnmpParsingService(coord.Service):
         except Exception:
             LOG.exception('Failed to initialize oslo notifier')
 
-    def _send_snmp_to_queue(self, snmp_trap):
-        try:
-            event_type = self._get_event_type(snmp_trap)
-            if not event_type:
-                return
-            event = {EventProperties.TIME: datetime.utcnow(),
-                     EventProperties.TYPE: event_type,
-                     EventProperties.DETAILS: snmp_trap}
-            LOG.debug('snmp oslo_notifier event: %s' % event)
-            self.oslo_notifier.info(
-                ctxt={'message_id': uuidutils.generate_uuid(),
-                      'publisher_id': self.publisher,
-                      'timestamp': datetime.utcnow()},
-                event_type=event_type,
-                payload=event)
-        except Exception as e:
-            LOG.warning('Snmp failed to post event. Exception: %s', e)
+    def _publish_events(self):
+        batch_size = self.conf.snmp_parsing.publish_batch_size
+        while True:
+            events = [self._events.get()]
+            try:
+                while len(events) < batch_size:
+                    events.append(self._events.get_nowait())
+            except queue.Empty:
+                pass
+            self._send_snmp_to_queue(events)
 
-    def _get_event_type(self, snmp_trap):
-        if not self.oid_mapping:
-            LOG.warning('No snmp trap is configured!')
+    def _log_stats_periodically(self):
+        # not by the publisher, so the stats are logged also when no trap
+        # is published, e.g. when the traps are not mapped to events
+        while True:
+            time.sleep(STATS_LOG_INTERVAL)
+            LOG.info('Snmp parsing stats: %s', self.stats())
+
+    def _create_event(self, snmp_trap):
+        event_type = self._get_event_type(snmp_trap)
+        if not event_type:
             return None
+        return {EventProperties.TIME: datetime.utcnow(),
+                EventProperties.TYPE: event_type,
+                EventProperties.DETAILS: snmp_trap}
+
+    def _send_snmp_to_queue(self, events):
+        for event in events:
+            try:
+                LOG.debug('snmp oslo_notifier event: %s' % event)
+                self.oslo_notifier.info(
+                    ctxt={'message_id': uuidutils.generate_uuid(),
+                          'publisher_id': self.publisher,
+                          'timestamp': datetime.utcnow()},
+                    event_type=event[EventProperties.TYPE],
+                    payload=event)
+                self._count('published')
+            except Exception as e:
+                self._count('publish_failed')
+                LOG.warning('Snmp failed to post event. Exception: %s', e)
+
+    @staticmethod
+    def _build_oid_index(oid_mapping):
+        """Index the oid mapping by system oid and system
 
-        for mapping_info in self.oid_mapping:
+        :return: dict of system oid to a dict of system to a tuple of the
+        mapping position and its event type
+        """
+        oid_index = {}
+        for position, mapping_info in enumerate(oid_mapping or []):
             system_oid = extract_field_value(mapping_info, SEProps.SYSTEM_OID)
             conf_system = extract_field_value(mapping_info, SEProps.SYSTEM)
-            if conf_system == extract_field_value(snmp_trap, system_oid):
-                LOG.debug('snmp trap mapped the system: %s.' % conf_system)
-                return extract_field_value(mapping_info, SEProps.EVENT_TYPE)
+            event_type = extract_field_value(mapping_info, SEProps.EVENT_TYPE)
+            oid_index.setdefault(system_oid, {}).setdefault(
+                conf_system, (position, event_type))
+        return oid_index
+
+    def _get_event_type(self, snmp_trap):
+        if not self._oid_index:
+            LOG.warning('No snmp trap is configured!')
+            return None
+
+        # The first mapping in the file that matches the trap is used
+        matches = []
+        for system_oid, systems in self._oid_index.items():
+            match = systems.get(extract_field_value(snmp_trap, system_oid))
+            if match:
+                matches.append(match)
+
+        if matches:
+            position, event_type = min(matches)
+            LOG.debug('snmp trap mapped the system: %s.',
+                      self.oid_mapping[position].get(SEProps.SYSTEM))
+            return event_type
 
         LOG.error("Snmp trap does not contain system info!")
         return None
@@ -160,6 +160,14 @@ class TemplatesConnection(object):
         """
         raise NotImplementedError('Create Template not implemented')
 
+    @abc.abstractmethod
+    def create_all(self, templates):
+        """Add new templates, in a single transaction.
+
+        :type templates: list of vitrage.storage.sqlalchemy.models.Template
+        """
+        raise NotImplementedError('Create Templates not implemented')
+
     @abc.abstractmethod
     def update(self, uuid, var, value):
         """update existing template.
@@ -172,6 +172,14 @@ class TemplatesConnection(base.TemplatesConnection, BaseTableConn):
         with session.begin():
             session.add(template)
 
+    def create_all(self, templates):
+        if not templates:
+            return
+
+        session = self._engine_facade.get_session()
+        with session.begin():
+            session.add_all(templates)
+
     def update(self, uuid, var, value):
         session = self._engine_facade.get_session()
         with session.begin():
@@ -15,11 +15,20 @@
 # limitations under the License.
 
 from datetime import datetime
+import json
+import time
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import rsa
+import jwt
 # noinspection PyPackageRequirements
 import mock
 import requests_mock
+from vitrage.middleware.keycloak import KEYCLOAK_GROUP
+from vitrage.middleware.keycloak import KEYCLOAK_OPTS
 from vitrage.middleware.keycloak import KeycloakAuth
 from vitrage.tests.functional.api.v1 import FunctionalTest
+from webob import exc
 from webtest import TestRequest
 
 
@@ -38,6 +47,9 @@ HEADERS = {
 OPENID_CONNECT_USERINFO = 'http://127.0.0.1:9080/auth/realms/my_realm/' \
                           'protocol/openid-connect/userinfo'
 
+OPENID_CONNECT_CERTS = 'http://127.0.0.1:9080/auth/realms/my_realm/' \
+                       'protocol/openid-connect/certs'
+
 USER_CLAIMS = {
     "sub": "248289761001",
     "name": "Jane Doe",
@@ -93,6 +105,70 @@ class KeycloakTest(FunctionalTest):
         self.assertEqual('role1,role2', req.headers['X-Roles'])
         self.assertEqual(1, req_mock.call_count)
 
+    @mock.patch('jwt.decode', return_value=TOKEN)
+    @requests_mock.Mocker()
+    def test_validated_token_is_cached(self, _, req_mock):
+
+        # Imitate success response from KeyCloak.
+        req_mock.get(OPENID_CONNECT_USERINFO)
+
+        auth = KeycloakAuth(mock.Mock(), self.CONF)
+        auth.process_request(self._build_request())
+        req = self._build_request()
+        auth.process_request(req)
+
+        self.assertEqual('my_realm', req.headers['X-Project-Id'])
+        self.assertEqual('role1,role2', req.headers['X-Roles'])
+        self.assertEqual(1, req_mock.call_count)
+
+    @requests_mock.Mocker()
+    def test_expired_token_is_not_cached(self, req_mock):
+
+        # Imitate success response from KeyCloak.
+        req_mock.get(OPENID_CONNECT_USERINFO)
+
+        expired_token = dict(TOKEN, exp=int(time.time()) - 10)
+        auth = KeycloakAuth(mock.Mock(), self.CONF)
+        with mock.patch('jwt.decode', return_value=expired_token):
+            auth.process_request(self._build_request())
+            auth.process_request(self._build_request())
+
+        self.assertEqual(2, req_mock.call_count)
+
+    @requests_mock.Mocker()
+    def test_verify_token_locally(self, req_mock):
+        self.CONF.register_opts(KEYCLOAK_OPTS, KEYCLOAK_GROUP)
+        self.CONF.set_override('verify_token_locally', True, KEYCLOAK_GROUP)
+        private_key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048, backend=default_backend())
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(
+            private_key.public_key()))
+        jwk['kid'] = 'key1'
+        req_mock.get(OPENID_CONNECT_CERTS, json={'keys': [jwk]})
+
+        claims = dict(TOKEN, exp=int(time.time()) + 300)
+        auth = KeycloakAuth(mock.Mock(), self.CONF)
+
+        # Test a valid token, which is validated once
+        token = jwt.encode(claims, private_key, algorithm='RS256',
+                           headers={'kid': 'key1'})
+        for i in range(2):
+            req = TestRequest.blank('/')
+            req.headers = {'X-Auth-Token': token}
+            auth.process_request(req)
+            self.assertEqual('my_realm', req.headers['X-Project-Id'])
+            self.assertEqual('role1,role2', req.headers['X-Roles'])
+        self.assertEqual(1, req_mock.call_count)
+
+        # Test a token with a forged signature
+        other_key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048, backend=default_backend())
+        forged_token = jwt.encode(claims, other_key, algorithm='RS256',
+                                  headers={'kid': 'key1'})
+        req = TestRequest.blank('/')
+        req.headers = {'X-Auth-Token': forged_token}
+        self.assertRaises(exc.HTTPUnauthorized, auth.process_request, req)
+
     def test_in_keycloak_mode_no_token(self):
         resp = self.post_json('/topology/', expect_errors=True)
 
@@ -18,6 +18,7 @@
 from datetime import datetime
 # noinspection PyPackageRequirements
 import mock
+from vitrage.common import payload_codec
 from vitrage.common.utils import compress_obj
 
 from vitrage.storage.sqlalchemy import models
@@ -65,6 +66,20 @@ class NoAuthTest(FunctionalTest):
             self.assertEqual('200 OK', resp.status)
             self.assert_is_empty(resp.json)
 
+    def test_noauth_mode_get_topology_forwards_json(self):
+        graph = {'nodes': [{'id': 'host-1'}], 'links': []}
+        with mock.patch('pecan.request') as request:
+            request.client.call.return_value = payload_codec.encode(graph)
+            params = dict(depth=None, graph_type='graph', query=None,
+                          root=None,
+                          all_tenants=False)
+            resp = self.post_json('/topology/', params=params)
+
+            self.assertEqual(1, request.client.call.call_count)
+            self.assertEqual('200 OK', resp.status)
+            self.assertEqual('application/json', resp.content_type)
+            self.assertEqual(graph, resp.json)
+
     def test_noauth_mode_list_alarms(self):
         with mock.patch('pecan.request') as request:
             request.client.call.return_value = compress_obj({"alarms": []})
@@ -151,3 +166,22 @@ class NoAuthTest(FunctionalTest):
 
             self.assertEqual(1, request.client.call.call_count)
             self.assert_is_empty(data)
+
+    def test_noauth_mode_get_metrics(self):
+
+        with mock.patch('pecan.request') as request:
+            request.client.call.return_value = '[]'
+            data = self.get_json('/metrics/')
+
+            self.assertEqual(1, request.client.call.call_count)
+            self.assert_is_empty(data)
+
+    def test_noauth_mode_get_scenario_costs(self):
+
+        with mock.patch('pecan.request') as request:
+            request.client.call.return_value = '[]'
+            data = self.get_json('/metrics/scenarios/', limit=5)
+
+            self.assertEqual(1, request.client.call.call_count)
+            self.assertEqual(5, request.client.call.call_args[1]['limit'])
+            self.assert_is_empty(data)
@@ -27,7 +27,7 @@ from vitrage.common.constants import EdgeLabel
 from vitrage.common.constants import EdgeProperties
 from vitrage.common.constants import EntityCategory
 from vitrage.common.constants import VertexProperties as VProps
-from vitrage.common.utils import decompress_obj
+from vitrage.common import payload_codec
 from vitrage.datasources import NOVA_HOST_DATASOURCE
 from vitrage.datasources import NOVA_INSTANCE_DATASOURCE
 from vitrage.datasources import NOVA_ZONE_DATASOURCE
@@ -40,6 +40,7 @@ from vitrage.entity_graph.processor.notifier import PersistNotifier
 from vitrage.graph.driver.networkx_graph import edge_copy
 from vitrage.graph.driver.networkx_graph import NXGraph
 import vitrage.graph.utils as graph_utils
+from vitrage import rpc
 from vitrage.persistency.service import VitragePersistorEndpoint
 from vitrage.tests.base import IsEmpty
 from vitrage.tests.functional.test_configuration import TestConfiguration
@@ -53,6 +54,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def setUpClass(cls):
         super(TestApis, cls).setUpClass()
         cls.conf = cfg.ConfigOpts()
+        cls.conf.register_opts(rpc.OPTS)
         cls.add_db(cls.conf)
         cls.api_lock = threading.RLock()
 
@@ -64,7 +66,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
 
         # Action
         alarms = apis.get_alarms(ctx, vitrage_id='all', all_tenants=False)
-        alarms = decompress_obj(alarms)['alarms']
+        alarms = payload_codec.decode(alarms)['alarms']
 
         # Test assertions
         self.assertThat(alarms, matchers.HasLength(3))
@@ -78,7 +80,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
 
         # Action
         alarms = apis.get_alarms(ctx, vitrage_id='all', all_tenants=False)
-        alarms = decompress_obj(alarms)['alarms']
+        alarms = payload_codec.decode(alarms)['alarms']
 
         # Test assertions
         self.assertThat(alarms, matchers.HasLength(2))
@@ -109,7 +111,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
 
         # Action
         alarms = apis.get_alarms(ctx, vitrage_id='all', all_tenants=True)
-        alarms = decompress_obj(alarms)['alarms']
+        alarms = payload_codec.decode(alarms)['alarms']
 
         # Test assertions
         self.assertThat(alarms, matchers.HasLength(5))
@@ -193,7 +195,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_get_topology_with_admin_project(self):
         # Setup
         graph = self._create_graph()
-        apis = TopologyApis(graph, None, self.api_lock)
+        apis = TopologyApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_1', 'is_admin': True}
 
         # Action
@@ -204,7 +206,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
             query=None,
             root=None,
             all_tenants=False)
-        graph_topology = decompress_obj(graph_topology)
+        graph_topology = payload_codec.decode(graph_topology)
 
         # Test assertions
         self.assertThat(graph_topology['nodes'], matchers.HasLength(8))
@@ -215,7 +217,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_get_topology_with_not_admin_project(self):
         # Setup
         graph = self._create_graph()
-        apis = TopologyApis(graph, None, self.api_lock)
+        apis = TopologyApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_2', 'is_admin': False}
 
         # Action
@@ -226,7 +228,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
             query=None,
             root=None,
             all_tenants=False)
-        graph_topology = decompress_obj(graph_topology)
+        graph_topology = payload_codec.decode(graph_topology)
 
         # Test assertions
         self.assertThat(graph_topology['nodes'], matchers.HasLength(7))
@@ -237,7 +239,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_get_topology_with_all_tenants(self):
         # Setup
         graph = self._create_graph()
-        apis = TopologyApis(graph, None, self.api_lock)
+        apis = TopologyApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_1', 'is_admin': False}
 
         # Action
@@ -248,7 +250,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
             query=None,
             root=None,
             all_tenants=True)
-        graph_topology = decompress_obj(graph_topology)
+        graph_topology = payload_codec.decode(graph_topology)
 
         # Test assertions
         self.assertThat(graph_topology['nodes'], matchers.HasLength(12))
@@ -256,7 +258,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_list_with_admin_project(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_2', 'is_admin': True}
 
         # Action
@@ -264,7 +266,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
             ctx,
             resource_type=None,
             all_tenants=False)
-        resources = decompress_obj(resources)['resources']
+        resources = payload_codec.decode(resources)['resources']
 
         # Test assertions
         self.assertThat(resources, matchers.HasLength(5))
@@ -272,7 +274,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_list_with_admin_project_and_query(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_2', 'is_admin': True}
 
         # Action
@@ -281,7 +283,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
             resource_type=NOVA_INSTANCE_DATASOURCE,
             all_tenants=False,
             query={'==': {'id': 'instance_3'}})
-        resources = decompress_obj(resources)['resources']
+        resources = payload_codec.decode(resources)['resources']
 
         # Test assertions
         self.assertThat(resources, matchers.HasLength(1))
@@ -289,7 +291,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_list_with_not_admin_project(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_2', 'is_admin': False}
 
         # Action
@@ -297,7 +299,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
             ctx,
             resource_type=None,
             all_tenants=False)
-        resources = decompress_obj(resources)['resources']
+        resources = payload_codec.decode(resources)['resources']
 
         # Test assertions
         self.assertThat(resources, matchers.HasLength(2))
@@ -305,7 +307,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_list_with_not_admin_project_and_no_existing_type(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_2', 'is_admin': False}
 
         # Action
@@ -313,7 +315,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
             ctx,
             resource_type=NOVA_HOST_DATASOURCE,
             all_tenants=False)
-        resources = decompress_obj(resources)['resources']
+        resources = payload_codec.decode(resources)['resources']
 
         # Test assertions
         self.assertThat(resources, IsEmpty())
@@ -321,7 +323,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_list_with_not_admin_project_and_existing_type(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_2', 'is_admin': False}
 
         # Action
@@ -329,7 +331,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
             ctx,
             resource_type=NOVA_INSTANCE_DATASOURCE,
             all_tenants=False)
-        resources = decompress_obj(resources)['resources']
+        resources = payload_codec.decode(resources)['resources']
 
         # Test assertions
         self.assertThat(resources, matchers.HasLength(2))
@@ -337,7 +339,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_list_with_all_tenants(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_1', 'is_admin': False}
 
         # Action
@@ -345,15 +347,44 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
             ctx,
             resource_type=None,
             all_tenants=True)
-        resources = decompress_obj(resources)['resources']
+        resources = payload_codec.decode(resources)['resources']
 
         # Test assertions
         self.assertThat(resources, matchers.HasLength(7))
 
+    def test_resource_list_is_cached_until_graph_changes(self):
+        # Setup
+        graph = self._create_graph()
+        apis = ResourceApis(graph, self.conf, self.api_lock)
+        ctx = {'tenant': 'project_1', 'is_admin': False}
+
+        # Action
+        resources = apis.get_resources(ctx, all_tenants=True)
+        cached_resources = apis.get_resources(ctx, all_tenants=True)
+        other_tenant_resources = apis.get_resources(
+            {'tenant': 'project_2', 'is_admin': False}, all_tenants=False)
+
+        # Test assertions
+        self.assertIs(resources, cached_resources)
+        self.assertIsNot(resources, other_tenant_resources)
+        self.assertThat(
+            payload_codec.decode(other_tenant_resources)['resources'],
+            matchers.HasLength(2))
+
+        # Action
+        graph.add_vertex(self._create_resource('instance_5',
+                                               NOVA_INSTANCE_DATASOURCE,
+                                               project_id='project_1'))
+        resources = apis.get_resources(ctx, all_tenants=True)
+
+        # Test assertions
+        self.assertThat(payload_codec.decode(resources)['resources'],
+                        matchers.HasLength(8))
+
     def test_resource_count_with_admin_project(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_2', 'is_admin': True}
 
         # Action
@@ -372,7 +403,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_count_with_admin_project_and_query(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_2', 'is_admin': True}
 
         # Action
@@ -389,7 +420,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_count_with_not_admin_project(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_2', 'is_admin': False}
 
         # Action
@@ -405,7 +436,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_count_with_not_admin_project_and_no_existing_type(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_2', 'is_admin': False}
 
         # Action
@@ -421,7 +452,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_count_with_not_admin_project_and_existing_type(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_2', 'is_admin': False}
 
         # Action
@@ -437,7 +468,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_count_with_all_tenants(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_1', 'is_admin': False}
 
         # Action
@@ -456,7 +487,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_count_with_all_tenants_and_group_by(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_1', 'is_admin': False}
 
         # Action
@@ -475,7 +506,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_show_with_admin_and_no_project_resource(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_1', 'is_admin': True}
 
         # Action
@@ -490,7 +521,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_show_with_not_admin_and_no_project_resource(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_1', 'is_admin': False}
 
         # Action
@@ -502,7 +533,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_show_with_not_admin_and_resource_in_project(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_1', 'is_admin': False}
 
         # Action
@@ -518,7 +549,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_show_with_not_admin_and_resource_in_other_project(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_2', 'is_admin': False}
 
         # Action
@@ -530,7 +561,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_show_with_admin_and_resource_in_project(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_1', 'is_admin': True}
 
         # Action
@@ -546,7 +577,7 @@ class TestApis(TestEntityGraphUnitBase, TestConfiguration):
     def test_resource_show_with_admin_and_resource_in_other_project(self):
         # Setup
         graph = self._create_graph()
-        apis = ResourceApis(graph, None, self.api_lock)
+        apis = ResourceApis(graph, self.conf, self.api_lock)
         ctx = {'tenant': 'project_2', 'is_admin': True}
 
         # Action
@@ -273,6 +273,26 @@ class TestTemplates(TestEntityGraphUnitBase, TestConfiguration):
         self.assertThat(added_templates, matchers.HasLength(1))
         self.assertEqual('LOADING', added_templates[0]['status'])
 
+    def _add_templates_with_same_name(self, template_filename):
+        # Setup
+        files_content = self._load_template_content(template_filename) * 2
+        files_content[0][1]['metadata']['name'] = 'template_with_same_name'
+
+        # Action
+        added_templates = \
+            self.apis.add_template(ctx=None, templates=files_content,
+                                   template_type=None, params=None)
+        self.added_template = added_templates[0]['uuid']
+
+        # Test assertions
+        self.assertThat(added_templates, matchers.HasLength(2))
+        self.assertEqual('LOADING', added_templates[0]['status'])
+        self.assertEqual('ERROR', added_templates[1]['status'])
+        self.assertEqual('Duplicate template name',
+                         added_templates[1]['status details'])
+        self.assertThat(self._db.templates.query(
+            name=added_templates[0]['name']), matchers.HasLength(1))
+
     def _assert_validate_template_result(self, expected_status,
                                          expected_status_code,
                                          expected_message, results):
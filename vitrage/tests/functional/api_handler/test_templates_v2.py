@@ -65,3 +65,6 @@ class TestTemplatesV2(TestTemplates):
 
     def test_add_template_with_extra_param_def(self):
         self._add_template_with_extra_param_def(TEMPLATE_WITH_EXTRA_PARAM_DEF)
+
+    def test_add_templates_with_same_name(self):
+        self._add_templates_with_same_name(TEMPLATE_WITHOUT_PARAMS)
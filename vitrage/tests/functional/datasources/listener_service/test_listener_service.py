@@ -11,6 +11,7 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+from vitrage.entity_graph.driver_exec import DriversBatchNotificationEndpoint
 from vitrage.entity_graph.driver_exec import DriversNotificationEndpoint
 
 from vitrage.datasources.driver_base import DriverBase
@@ -32,6 +33,10 @@ class MyTestDriver(DriverBase):
     def get_event_types():
         pass
 
+    @staticmethod
+    def get_event_entity_id(event):
+        return event.get('entity_id')
+
 
 class TestListenerService(base.BaseTest):
 
@@ -75,3 +80,35 @@ class TestListenerService(base.BaseTest):
         events = self._generate_events(2)
         endpoint.info(None, None, "mock", events, None)
         self._assert_events()
+
+    def test_batch_notification_listener_endpoint(self):
+
+        my_test_driver = MyTestDriver()
+        endpoint = DriversBatchNotificationEndpoint(
+            None,
+            self._add_event_to_actual_events,
+            enrich_workers=4)
+        endpoint._enrich_event_methods = \
+            {"mock": [my_test_driver.enrich_event]}
+        endpoint._entity_id_methods = \
+            {my_test_driver.enrich_event: my_test_driver.get_event_entity_id}
+
+        # the events are processed together, in the notifications order
+        events = self._generate_events(5)
+        endpoint.info([self._message("mock", e) for e in events])
+        self._assert_events()
+
+        # an event of an entity is superseded by its later events
+        updates = [{'entity_id': 1, 'status': 'first'},
+                   {'entity_id': 2, 'status': 'first'},
+                   {'entity_id': 1, 'status': 'second'},
+                   {'status': 'no entity id'},
+                   {'status': 'no entity id'}]
+        self._set_excepted_events(updates[1:])
+        endpoint.info([self._message("mock", e) for e in updates])
+        self._assert_events()
+
+    @staticmethod
+    def _message(event_type, payload):
+        return {'ctxt': None, 'publisher_id': None, 'event_type': event_type,
+                'payload': payload, 'metadata': None}
@@ -28,6 +28,7 @@ from vitrage.entity_graph.processor.processor import Processor
 from vitrage.evaluator.scenario_evaluator import ScenarioEvaluator
 from vitrage.evaluator.scenario_repository import ScenarioRepository
 from vitrage.graph.driver.networkx_graph import NXGraph
+from vitrage.graph.utils import update_sample_timestamp
 from vitrage.tests.functional.base import TestFunctionalBase
 from vitrage.tests.functional.test_configuration import TestConfiguration
 from vitrage.tests.mocks import utils
@@ -233,8 +234,9 @@ class TestConsistencyFunctional(TestFunctionalBase, TestConfiguration):
         # set part of the instances as deleted
         for i in range(6, 9):
             instance_vertices[i][VProps.VITRAGE_IS_DELETED] = True
-            instance_vertices[i][VProps.VITRAGE_SAMPLE_TIMESTAMP] = str(
-                current_time + timedelta(seconds=2 * consistency_interval + 1))
+            timestamp = current_time + timedelta(
+                seconds=2 * consistency_interval + 1)
+            update_sample_timestamp(instance_vertices[i], str(timestamp))
             self.processor.entity_graph.update_vertex(instance_vertices[i])
 
         self._add_resources_by_type(consistency_interval=consistency_interval,
@@ -246,7 +248,7 @@ class TestConsistencyFunctional(TestFunctionalBase, TestConfiguration):
 
     def _update_timestamp(self, lst, timestamp):
         for vertex in lst:
-            vertex[VProps.VITRAGE_SAMPLE_TIMESTAMP] = str(timestamp)
+            update_sample_timestamp(vertex, str(timestamp))
             self.processor.entity_graph.update_vertex(vertex)
 
     def _process_events(self):
@@ -11,6 +11,7 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import mock
 from oslo_log import log
 from testtools import matchers
 
@@ -45,6 +46,7 @@ from vitrage.evaluator.actions.evaluator_event_transformer \
 from vitrage.evaluator.scenario_evaluator import ScenarioEvaluator
 from vitrage.evaluator.scenario_repository import ScenarioRepository
 from vitrage.graph import create_edge
+from vitrage.graph import Vertex
 from vitrage.tests.base import IsEmpty
 from vitrage.tests.functional.base import \
     TestFunctionalBase
@@ -115,6 +117,36 @@ class TestScenarioEvaluator(TestFunctionalBase, TestConfiguration):
         self.assertEqual('AVAILABLE', host_v[VProps.VITRAGE_AGGREGATED_STATE],
                          'host should be AVAILABLE when alarm disabled')
 
+    def test_run_evaluator_on_scenario_vertex_types(self):
+
+        event_queue, processor, evaluator = self._init_system()
+        vertex_types = self.scenario_repository.get_enabled_vertex_types()
+        self.assertIsNotNone(vertex_types)
+
+        def is_relevant(v):
+            return \
+                (v[VProps.VITRAGE_CATEGORY], v[VProps.VITRAGE_TYPE]) in \
+                vertex_types or \
+                (v[VProps.VITRAGE_CATEGORY], None) in vertex_types
+
+        processor.entity_graph.add_vertex(Vertex(
+            'unrelated_vertex',
+            {VProps.VITRAGE_CATEGORY: EntityCategory.RESOURCE,
+             VProps.VITRAGE_TYPE: 'unrelated_type'}))
+        all_vertices = processor.entity_graph.get_vertices()
+        relevant_ids = set(v.vertex_id for v in all_vertices
+                           if is_relevant(v))
+        self.assertThat(relevant_ids, matchers.Not(IsEmpty()))
+        self.assertNotIn('unrelated_vertex', relevant_ids)
+
+        with mock.patch.object(evaluator, 'process_event') as process_event:
+            evaluator.run_evaluator()
+
+        processed_ids = [call[0][1].vertex_id
+                         for call in process_event.call_args_list]
+        self.assertEqual(relevant_ids, set(processed_ids))
+        self.assertThat(processed_ids, matchers.HasLength(len(relevant_ids)))
+
     def test_overlapping_deduced_state_1(self):
 
         event_queue, processor, evaluator = self._init_system()
@@ -0,0 +1,52 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import json
+
+from vitrage.common.exception import VitrageError
+from vitrage.common import payload_codec
+from vitrage.common.utils import compress_obj
+from vitrage.tests import base
+
+GRAPH = {
+    'directed': True,
+    'nodes': [{'id': 'host-1', 'vitrage_type': 'nova.host'},
+              {'id': 'instance-1', 'name': u'instance \u2603'}],
+    'links': [{'source': 0, 'target': 1, 'relationship_type': 'contains'}],
+}
+
+
+class PayloadCodecTest(base.BaseTest):
+
+    def test_encode_and_decode(self):
+        for codec_name in payload_codec.CODECS:
+            payload = payload_codec.encode(GRAPH, codec_name)
+            # the payload is sent as json on the RPC wire
+            payload = json.loads(json.dumps(payload))
+
+            self.assertEqual(GRAPH, payload_codec.decode(payload))
+            self.assertEqual(GRAPH,
+                             json.loads(payload_codec.to_json(payload)))
+
+    def test_json_codec_is_not_encoded_again(self):
+        payload = payload_codec.encode(GRAPH, 'json')
+        self.assertIs(payload['data'], payload_codec.to_json(payload))
+
+    def test_decode_compressed_obj(self):
+        self.assertEqual(GRAPH,
+                         payload_codec.decode(compress_obj(GRAPH, level=1)))
+
+    def test_unknown_codec(self):
+        self.assertRaises(VitrageError, payload_codec.encode, GRAPH, 'lz')
+        self.assertRaises(VitrageError, payload_codec.decode,
+                          {'codec': 'lz', 'data': ''})
@@ -12,6 +12,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 import itertools
+import mock
 
 from vitrage.common import utils
 from vitrage.tests import base
@@ -25,6 +26,26 @@ class UtilsTest(base.BaseTest):
                                dict.fromkeys(s2, 0),
                                message)
 
+    @mock.patch('time.time')
+    def test_ttl_cache(self, mock_time):
+        mock_time.return_value = 1000
+        cache = utils.TTLCache(max_size=2, ttl=10)
+        cache.put('a', 1)
+        cache.put('b', 2, ttl=5)
+        self.assertEqual(1, cache.get('a'))
+
+        # the least recently used entry is evicted
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual(3, cache.get('c'))
+
+        # entries expire after their ttl
+        mock_time.return_value = 1011
+        self.assertEqual('expired', cache.get('a', 'expired'))
+        cache.put('d', 4, ttl=0)
+        self.assertIsNone(cache.get('d'))
+
     def test_get_portion(self):
         all_items = list(range(14))
         self._check_portions(all_items, 4)
@@ -0,0 +1,102 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+from oslo_config import cfg
+
+from vitrage.common.constants import DatasourceAction
+from vitrage.datasources.kubernetes.driver import KubernetesDriver
+from vitrage.datasources.kubernetes.properties import KubernetesProperties \
+    as kubProp
+from vitrage.tests import base
+
+
+def _node(uid, resource_version, external_id=None):
+    node = mock.Mock()
+    node.metadata.name = 'node-' + uid
+    node.metadata.uid = uid
+    node.metadata.resource_version = resource_version
+    node.metadata.creation_timestamp = '2019-01-01T00:00:00Z'
+    node.spec.external_id = external_id or 'instance-' + uid
+    node.spec.provider_id = 'openstack:///instance-' + uid
+    return node
+
+
+# noinspection PyProtectedMember
+class KubernetesDriverTest(base.BaseTest):
+
+    def setUp(self):
+        super(KubernetesDriverTest, self).setUp()
+        self.driver = KubernetesDriver(cfg.ConfigOpts())
+        self.driver._client = mock.Mock()
+
+    def test_get_all(self):
+        self._set_nodes(_node('1', '10'), _node('2', '20'))
+
+        entities = self.driver.get_all(DatasourceAction.INIT_SNAPSHOT)
+
+        self.assertEqual({'instance-1', 'instance-2'},
+                         self._get_external_ids(entities))
+
+    def test_get_changes(self):
+        self._set_nodes(_node('1', '10'), _node('2', '20'))
+        self.driver.get_all(DatasourceAction.INIT_SNAPSHOT)
+
+        # the same resourceVersions
+        self.assertEqual([], self.driver.get_changes(DatasourceAction.UPDATE))
+
+        # new resourceVersions with the same details, e.g. a status update
+        self._set_nodes(_node('1', '11'), _node('2', '21'))
+        self.assertEqual([], self.driver.get_changes(DatasourceAction.UPDATE))
+
+        # changed details
+        self._set_nodes(_node('1', '12', external_id='instance-3'),
+                        _node('2', '21'))
+        changes = self.driver.get_changes(DatasourceAction.UPDATE)
+        self.assertEqual({'instance-3', 'instance-2'},
+                         self._get_external_ids(changes))
+        self.assertEqual([], self.driver.get_changes(DatasourceAction.UPDATE))
+
+    def test_get_changes_of_added_and_removed_nodes(self):
+        self._set_nodes(_node('1', '10'), _node('2', '20'))
+        self.driver.get_all(DatasourceAction.INIT_SNAPSHOT)
+
+        # an added node
+        self._set_nodes(_node('1', '10'), _node('2', '20'), _node('3', '30'))
+        changes = self.driver.get_changes(DatasourceAction.UPDATE)
+        self.assertEqual({'instance-1', 'instance-2', 'instance-3'},
+                         self._get_external_ids(changes))
+
+        # a removed node
+        self._set_nodes(_node('1', '10'), _node('3', '30'))
+        changes = self.driver.get_changes(DatasourceAction.UPDATE)
+        self.assertEqual({'instance-1', 'instance-3'},
+                         self._get_external_ids(changes))
+
+        # a node that replaced a removed one
+        self._set_nodes(_node('1', '10'), _node('4', '40'))
+        changes = self.driver.get_changes(DatasourceAction.UPDATE)
+        self.assertEqual({'instance-1', 'instance-4'},
+                         self._get_external_ids(changes))
+
+        self.assertEqual([], self.driver.get_changes(DatasourceAction.UPDATE))
+
+    def _set_nodes(self, *nodes):
+        self.driver._client.list_node.return_value = mock.Mock(
+            items=list(nodes))
+
+    def _get_external_ids(self, entities):
+        self.assertEqual(1, len(entities))
+        return {node[kubProp.EXTERNALID]
+                for node in entities[0][kubProp.RESOURCES]}
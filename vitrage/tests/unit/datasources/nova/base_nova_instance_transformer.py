@@ -125,11 +125,11 @@ class BaseNovaInstanceTransformerTest(base.BaseTest):
                 self.assertEqual(GraphAction.UPDATE_ENTITY, wrapper.action)
 
     def _validate_snapshot_vertex_props(self, transformer, vertex, event):
-        self.assertThat(vertex.properties, matchers.HasLength(15))
+        self.assertThat(vertex.properties, matchers.HasLength(16))
         self._validate_vertex_props(transformer, vertex, event)
 
     def _validate_update_vertex_props(self, transformer, vertex, event):
-        self.assertThat(vertex.properties, matchers.HasLength(14))
+        self.assertThat(vertex.properties, matchers.HasLength(15))
         self._validate_vertex_props(transformer, vertex, event)
 
     def _validate_vertex_props(self, transformer, vertex, event):
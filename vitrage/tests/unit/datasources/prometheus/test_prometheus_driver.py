@@ -14,6 +14,7 @@
 
 # noinspection PyPackageRequirements
 import mock
+import socket
 from oslo_config import cfg
 # noinspection PyPackageRequirements
 from testtools import matchers
@@ -41,6 +42,9 @@ class PrometheusDriverTest(base.BaseTest):
             DSOpts.CONFIG_FILE,
             help='Prometheus configuration file',
             default=utils.get_resources_dir() + CONFIG_PATH),
+        cfg.IntOpt('ip_resolve_cache_ttl', default=300),
+        cfg.IntOpt('ip_resolve_negative_cache_ttl', default=60),
+        cfg.IntOpt('ip_resolve_cache_size', default=10000),
     ]
 
     # noinspection PyPep8Naming
@@ -119,6 +123,63 @@ class PrometheusDriverTest(base.BaseTest):
         self.assertEqual(expected, observed_vm_alert_1)
         self.assertEqual(expected, observed_vm_alert_2)
 
+    @mock.patch('vitrage.datasources.prometheus.driver.'
+                'PrometheusDriver.nova_client')
+    @mock.patch('socket.gethostbyaddr')
+    def test_resolve_ips_cache(self, mock_socket, mock_nova_client):
+
+        # Test setup
+        mock_socket.side_effect = socket.herror()
+        instance = mock.Mock(id='vm-1',
+                             addresses={'private': [{'addr': '1.1.1.1'}]})
+        mock_nova_client.servers.list.side_effect = \
+            lambda search_opts: [instance] \
+            if search_opts['ip'] == '1.1.1.1' else []
+        driver = PrometheusDriver(self.conf)
+
+        # Test Action
+        observed = driver._resolve_ips(['1.1.1.1', '2.2.2.2'])
+        observed_again = driver._resolve_ips(['1.1.1.1', '2.2.2.2'])
+
+        # Test assertions
+        # Every ip is looked up in nova once
+        expected = {'1.1.1.1': 'vm-1', '2.2.2.2': '2.2.2.2'}
+        self.assertEqual(expected, observed)
+        self.assertEqual(expected, observed_again)
+        self.assertEqual(2, mock_socket.call_count)
+        self.assertEqual(2, mock_nova_client.servers.list.call_count)
+        mock_nova_client.servers.list.assert_any_call(
+            search_opts={'all_tenants': 1, 'ip': '1.1.1.1'})
+        mock_nova_client.servers.list.assert_any_call(
+            search_opts={'all_tenants': 1, 'ip': '2.2.2.2'})
+
+    @mock.patch('vitrage.datasources.prometheus.driver.'
+                'PrometheusDriver.nova_client')
+    @mock.patch('socket.gethostbyaddr')
+    def test_resolve_ips_of_instances(self, mock_socket, mock_nova_client):
+
+        # Test setup
+        # nova matches the ip as a substring of the instance ips
+        mock_socket.side_effect = socket.herror()
+        instances = [
+            mock.Mock(id='vm-1', addresses={'net': [{'addr': '1.1.1.1'}]}),
+            mock.Mock(id='vm-10', addresses={'net': [{'addr': '1.1.1.10'}]}),
+            mock.Mock(id='vm-2', addresses={'net': [{'addr': '2.2.2.2'}]}),
+        ]
+        mock_nova_client.servers.list.side_effect = \
+            lambda search_opts: [i for i in reversed(instances)
+                                 if search_opts['ip'] in
+                                 i.addresses['net'][0]['addr']]
+        driver = PrometheusDriver(self.conf)
+
+        # Test Action
+        observed = driver._resolve_ips(['1.1.1.1', '1.1.1.10', '2.2.2.2'])
+
+        # Test assertions
+        expected = {'1.1.1.1': 'vm-1', '1.1.1.10': 'vm-10',
+                    '2.2.2.2': 'vm-2'}
+        self.assertEqual(expected, observed)
+
     def test_get_resource_alert_values(self):
 
         # Test setup
@@ -201,6 +262,32 @@ class PrometheusDriverTest(base.BaseTest):
         # Test assertions
         self._assert_event_equal(created_events, PROMETHEUS_EVENT_TYPE)
 
+    @mock.patch('vitrage.datasources.prometheus.driver.'
+                'PrometheusDriver.nova_client')
+    @mock.patch('socket.gethostbyaddr')
+    def test_enrich_event_resolves_ips_once(self, mock_socket,
+                                            mock_nova_client):
+
+        # Test setup
+        conf = cfg.ConfigOpts()
+        conf.register_opts(self.OPTS, group=PROMETHEUS_DATASOURCE)
+        conf.set_override('ip_resolve_cache_ttl', 0, PROMETHEUS_DATASOURCE)
+        conf.set_override('ip_resolve_negative_cache_ttl', 0,
+                          PROMETHEUS_DATASOURCE)
+        mock_socket.side_effect = socket.herror()
+        mock_nova_client.servers.list.return_value = []
+        driver = PrometheusDriver(conf)
+        event = self._generate_event()
+        ips = driver._get_alerts_ips(event[EProps.DETAILS][PProps.ALERTS])
+
+        # Test Action
+        driver.enrich_event(event, PROMETHEUS_EVENT_TYPE)
+
+        # Test assertions
+        self.assertThat(ips, matchers.HasLength(1))
+        mock_socket.assert_called_once_with(list(ips)[0])
+        self.assertEqual(1, mock_nova_client.servers.list.call_count)
+
     def _assert_event_equal(self,
                             created_events,
                             expected_event_type):
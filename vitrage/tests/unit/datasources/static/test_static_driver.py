@@ -12,7 +12,11 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import mock
+import os
 from oslo_config import cfg
+import shutil
+import tempfile
 from testtools import matchers
 
 from vitrage.common.constants import DatasourceAction
@@ -152,6 +156,42 @@ class TestStaticDriver(base.BaseTest):
 
         self._validate_static_changes(expected_changes, changes)
 
+    def test_get_changes_reads_modified_files_only(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        resources_dir = utils.get_resources_dir() + \
+            '/static_datasources' + self.CHANGES_DIR
+        path = os.path.join(folder, 'static.yaml')
+        shutil.copy(resources_dir + '/baseline/static.yaml', path)
+        self._set_conf(directory=folder)
+
+        entities = self.static_driver.get_all(DatasourceAction.UPDATE)
+        self.assertThat(entities, matchers.HasLength(4))
+
+        # Action - nothing changed
+        with mock.patch.object(driver.file_utils, 'load_yaml_file') as load:
+            changes = self.static_driver.get_changes(
+                GraphAction.UPDATE_ENTITY)
+
+        # Test Assertions
+        self.assertEqual([], changes)
+        self.assertFalse(load.called)
+
+        # Action - the file was modified
+        shutil.copy(resources_dir + '/changed_resources/static.yaml', path)
+        mtime = os.path.getmtime(path) + 10
+        os.utime(path, (mtime, mtime))
+        changes = self.static_driver.get_changes(GraphAction.UPDATE_ENTITY)
+
+        # Test Assertions
+        expected_changes = [
+            {'static_id': 's1', 'type': 'switch', 'name': 'switch-1',
+             'id': '12345', 'state': 'error'},
+            {'static_id': 'r1', 'type': 'router',
+             'name': 'router-1 is the best!', 'id': '45678'},
+        ]
+        self._validate_static_changes(expected_changes, changes)
+
     def _validate_static_entity(self, entity):
         self.assertIsInstance(entity[StaticFields.METADATA], dict)
         for rel in entity[StaticFields.RELATIONSHIPS]:
@@ -190,8 +230,8 @@ class TestStaticDriver(base.BaseTest):
                                      change.get(StaticFields.STATE))
             self.assertTrue(found)
 
-    def _set_conf(self, sub_dir=None):
-        default_dir = utils.get_resources_dir() + \
+    def _set_conf(self, sub_dir=None, directory=None):
+        default_dir = directory or utils.get_resources_dir() + \
             '/static_datasources' + (sub_dir if sub_dir else '')
 
         opts = [
@@ -0,0 +1,78 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+from oslo_config import cfg
+
+from vitrage.common.constants import DatasourceAction
+from vitrage.common.constants import DatasourceProperties as DSProps
+from vitrage.common.constants import GraphAction
+from vitrage.datasources.trove.cluster.driver import TroveClusterDriver
+from vitrage.datasources.trove.properties import \
+    TroveClusterProperties as TProps
+from vitrage.tests import base
+
+
+# noinspection PyProtectedMember
+class TroveClusterDriverTest(base.BaseTest):
+
+    def setUp(self):
+        super(TroveClusterDriverTest, self).setUp()
+        self.driver = TroveClusterDriver(cfg.ConfigOpts())
+
+    def test_get_changes(self):
+        # Test setup
+        self._set_clusters(self._cluster('c1', 'NONE'),
+                           self._cluster('c2', 'NONE'),
+                           self._cluster('c3', 'NONE'))
+        self.driver.get_all(DatasourceAction.INIT_SNAPSHOT)
+
+        # Test action - nothing changed
+        changes = self.driver.get_changes(DatasourceAction.UPDATE)
+
+        # Test assertions
+        self.assertEqual([], changes)
+
+        # Test action - c2 changed its state, c3 was removed, c4 was added
+        self._set_clusters(self._cluster('c1', 'NONE'),
+                           self._cluster('c2', 'BUILDING'),
+                           self._cluster('c4', 'NONE'))
+        changes = self.driver.get_changes(DatasourceAction.UPDATE)
+
+        # Test assertions
+        changes = {c[TProps.ID]: c for c in changes}
+        self.assertEqual({'c2', 'c3', 'c4'}, set(changes))
+        self.assertEqual('BUILDING', changes['c2']['task']['name'])
+        self.assertNotIn(DSProps.EVENT_TYPE, changes['c2'])
+        self.assertEqual(GraphAction.DELETE_ENTITY,
+                         changes['c3'][DSProps.EVENT_TYPE])
+        self.assertNotIn(DSProps.EVENT_TYPE, changes['c4'])
+
+        # Test action - the changes are not emitted again
+        changes = self.driver.get_changes(DatasourceAction.UPDATE)
+
+        # Test assertions
+        self.assertEqual([], changes)
+
+    def _set_clusters(self, *clusters):
+        self.driver._get_all_entities = mock.Mock(
+            return_value=[dict(c) for c in clusters])
+
+    @staticmethod
+    def _cluster(cluster_id, state):
+        return {
+            TProps.ID: cluster_id,
+            TProps.NAME: 'cluster-' + cluster_id,
+            'task': {'name': state},
+        }
@@ -0,0 +1,62 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from vitrage.common.constants import VertexProperties as VProps
+from vitrage.entity_graph.consistency.expiry_index import ExpiryIndex
+from vitrage.graph.utils import create_vertex
+from vitrage.tests import base
+
+
+class ExpiryIndexTest(base.BaseTest):
+
+    @staticmethod
+    def _vertex(vitrage_id, timestamp, is_deleted=False):
+        return create_vertex(vitrage_id,
+                             vitrage_sample_timestamp=timestamp,
+                             vitrage_is_deleted=is_deleted)
+
+    def test_pop_expired(self):
+        index = ExpiryIndex()
+        index.update(self._vertex('a', '2019-01-01 10:00:00'))
+        index.update(self._vertex('b', '2019-01-01 11:00:00'))
+        index.update(self._vertex('c', '2019-01-01 09:00:00', True))
+        index.update(self._vertex('d', None))
+        self.assertEqual(3, len(index))
+
+        epoch = self._vertex('t', '2019-01-01 10:30:00')[
+            VProps.VITRAGE_SAMPLE_EPOCH]
+        self.assertEqual(['a'], index.pop_expired(False, epoch))
+        self.assertEqual(['c'], index.pop_expired(True, epoch))
+        self.assertEqual([], index.pop_expired(False, epoch))
+        self.assertEqual(1, len(index))
+
+    def test_outdated_entries(self):
+        index = ExpiryIndex()
+        index.update(self._vertex('a', '2019-01-01 10:00:00'))
+        index.update(self._vertex('b', '2019-01-01 10:00:00'))
+        index.update(self._vertex('c', '2019-01-01 10:00:00'))
+
+        # a was sampled again, b was marked deleted and c was removed
+        index.update(self._vertex('a', '2019-01-01 12:00:00'))
+        index.update(self._vertex('b', '2019-01-01 10:10:00', True))
+        index.remove('c')
+
+        epoch = self._vertex('t', '2019-01-01 11:00:00')[
+            VProps.VITRAGE_SAMPLE_EPOCH]
+        self.assertEqual([], index.pop_expired(False, epoch))
+        self.assertEqual(['b'], index.pop_expired(True, epoch))
+
+        # an older copy of a does not override its newer update
+        index.add(self._vertex('a', '2019-01-01 10:00:00'))
+        self.assertEqual([], index.pop_expired(False, epoch))
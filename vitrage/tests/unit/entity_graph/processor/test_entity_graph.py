@@ -15,8 +15,12 @@ from testtools import matchers
 
 from vitrage.common.constants import EdgeLabel
 from vitrage.common.constants import EntityCategory
+from vitrage.common.constants import VertexProperties as VProps
 from vitrage.entity_graph.processor import processor_utils as PUtils
 from vitrage.graph.driver.networkx_graph import NXGraph
+from vitrage.graph import Vertex
+from vitrage.graph.utils import get_sample_epoch
+from vitrage.graph.utils import update_sample_timestamp
 from vitrage.tests.unit.entity_graph.processor import base
 
 
@@ -68,6 +72,24 @@ class TestEntityGraphManager(base.TestBaseProcessor):
         PUtils.mark_deleted(entity_graph, vertex)
         self.assertTrue(PUtils.is_deleted(vertex))
 
+    def test_is_newer_vertex(self):
+        prev_vertex = Vertex('123', {})
+        new_vertex = Vertex('123', {})
+        update_sample_timestamp(prev_vertex, '2019-01-01T10:00:00Z')
+        update_sample_timestamp(new_vertex, '2019-01-01 10:00:00.5+00:00')
+
+        # timestamps of different formats are compared by their epoch
+        self.assertEqual(1546336800.0, get_sample_epoch(prev_vertex))
+        self.assertTrue(PUtils.is_newer_vertex(prev_vertex, new_vertex))
+        self.assertFalse(PUtils.is_newer_vertex(new_vertex, prev_vertex))
+
+        # vertices of older graphs have no pre-parsed epoch
+        old_vertex = Vertex(
+            '123', {VProps.VITRAGE_SAMPLE_TIMESTAMP: '2019-01-01T11:00:00Z'})
+        self.assertEqual(1546340400.0, get_sample_epoch(old_vertex))
+        self.assertTrue(PUtils.is_newer_vertex(new_vertex, old_vertex))
+        self.assertTrue(PUtils.is_newer_vertex(Vertex('123', {}), new_vertex))
+
     def test_mark_edge_as_deleted(self):
         entity_graph = NXGraph("Entity Graph")
 
@@ -13,6 +13,7 @@
 # under the License.
 import threading
 
+from vitrage.common.constants import DatasourceProperties as DSProps
 from vitrage.entity_graph.graph_init import EventsCoordination
 from vitrage.tests import base
 
@@ -65,6 +66,24 @@ class EventsCoordinationTest(base.BaseTest):
         self._start_and_join(t1, t2, t3, t4)
         self.assertEqual(20000, self.calc_result, explain)
 
+    def test_low_priority_coalescing(self):
+        handled_events = []
+        priority_listener = EventsCoordination(
+            None, handled_events.append, lambda event: event['id'])
+
+        events = [
+            {'id': 1, DSProps.SAMPLE_DATE: '2019-01-01T00:00:01Z'},
+            {'id': 2, DSProps.SAMPLE_DATE: '2019-01-01T00:00:01Z'},
+            {'id': 1, DSProps.SAMPLE_DATE: '2019-01-01T00:00:02Z'},
+            {'id': 1, DSProps.SAMPLE_DATE: '2019-01-01T00:00:00Z'},
+            {'id': 2},
+        ]
+        count = priority_listener.handle_multiple_low_priority(iter(events))
+
+        # the newest event of an entity replaces the queued one in place
+        self.assertEqual(5, count)
+        self.assertEqual([events[2], events[1], events[4]], handled_events)
+
     def _start_and_join(self, *args):
         for t in args:
             t.start()
@@ -0,0 +1,236 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import mock
+
+from vitrage.common.constants import EdgeLabel
+from vitrage.common.constants import EntityCategory
+from vitrage.common.constants import VertexProperties as VProps
+from vitrage.entity_graph import workers
+from vitrage.graph.driver.networkx_graph import NXGraph
+from vitrage.graph import Edge
+from vitrage.graph import Vertex
+from vitrage.tests import base
+
+ALARM = EntityCategory.ALARM
+RESOURCE = EntityCategory.RESOURCE
+
+HOST = (RESOURCE, 'nova.host')
+INSTANCE = (RESOURCE, 'nova.instance')
+ZABBIX = (ALARM, 'zabbix')
+
+
+def _vertex(vertex_id, vertex_type):
+    return Vertex(vertex_id, {VProps.VITRAGE_CATEGORY: vertex_type[0],
+                              VProps.VITRAGE_TYPE: vertex_type[1]})
+
+
+# noinspection PyProtectedMember
+class IsRelevantTest(base.BaseTest):
+
+    def test_vertex(self):
+        host = _vertex('1', HOST)
+
+        self.assertTrue(workers._is_relevant({HOST}, [[None, host]]))
+        self.assertTrue(workers._is_relevant({HOST}, [[host, None]]))
+        self.assertFalse(workers._is_relevant({INSTANCE}, [[None, host]]))
+        self.assertFalse(workers._is_relevant(set(), [[None, host]]))
+
+    def test_vertex_that_changed_its_type(self):
+        before = _vertex('1', HOST)
+        current = _vertex('1', INSTANCE)
+
+        self.assertTrue(workers._is_relevant({HOST}, [[before, current]]))
+        self.assertTrue(workers._is_relevant({INSTANCE}, [[before, current]]))
+        self.assertFalse(workers._is_relevant({ZABBIX}, [[before, current]]))
+
+    def test_category_only_type(self):
+        alarm = _vertex('1', ZABBIX)
+        host = _vertex('2', HOST)
+
+        self.assertTrue(workers._is_relevant({(ALARM, None)}, [[alarm]]))
+        self.assertFalse(workers._is_relevant({(ALARM, None)}, [[host]]))
+        self.assertTrue(workers._is_relevant({(ALARM, None), HOST},
+                                             [[alarm], [host]]))
+
+    def test_any_type(self):
+        host = _vertex('1', HOST)
+
+        self.assertTrue(workers._is_relevant(None, [[None, host]]))
+        self.assertTrue(workers._is_relevant(None, [[None], [None]]))
+        self.assertTrue(workers._is_relevant(None, []))
+
+    def test_unknown_vertices(self):
+        host = _vertex('1', HOST)
+
+        self.assertTrue(workers._is_relevant({HOST}, [[None, None]]))
+        self.assertTrue(workers._is_relevant({HOST}, [[host], [None]]))
+        self.assertTrue(workers._is_relevant({HOST}, []))
+
+    def test_edge(self):
+        host = _vertex('1', HOST)
+        instance = _vertex('2', INSTANCE)
+
+        self.assertTrue(workers._is_relevant({HOST, INSTANCE},
+                                             [[host], [instance]]))
+        self.assertFalse(workers._is_relevant({HOST}, [[host], [instance]]))
+        self.assertFalse(workers._is_relevant({INSTANCE},
+                                              [[host], [instance]]))
+
+
+# noinspection PyProtectedMember
+class NeedsGraphReloadTest(base.BaseTest):
+
+    def test_first_partition(self):
+        self.assertFalse(workers._needs_graph_reload(None, {HOST}))
+        self.assertFalse(workers._needs_graph_reload(None, None))
+
+    def test_same_or_fewer_types(self):
+        self.assertFalse(workers._needs_graph_reload({HOST}, {HOST}))
+        self.assertFalse(workers._needs_graph_reload({HOST, INSTANCE},
+                                                     {HOST}))
+        self.assertFalse(workers._needs_graph_reload({HOST}, set()))
+
+    def test_more_types(self):
+        self.assertTrue(workers._needs_graph_reload({HOST},
+                                                    {HOST, INSTANCE}))
+        self.assertTrue(workers._needs_graph_reload({HOST}, {INSTANCE}))
+        self.assertTrue(workers._needs_graph_reload(set(), {HOST}))
+        self.assertTrue(workers._needs_graph_reload({HOST}, None))
+
+
+# noinspection PyProtectedMember
+class GraphUpdateRoutingTest(base.BaseTest):
+
+    def setUp(self):
+        super(GraphUpdateRoutingTest, self).setUp()
+        self.evaluator_queues = ['evaluator-0', 'evaluator-1', 'evaluator-2']
+        self.api_queues = ['api-0']
+
+        self.manager = workers.GraphWorkersManager.__new__(
+            workers.GraphWorkersManager)
+        self.manager._conf = mock.Mock()
+        self.manager._conf.evaluator.route_graph_updates = True
+        self.manager._db = None
+        self.manager._evaluator_queues = self.evaluator_queues
+        self.manager._api_queues = self.api_queues
+        self.manager._all_queues = self.evaluator_queues + self.api_queues
+        self.manager._evaluator_vertex_types = None
+        self.manager._measured_scenario_costs = mock.Mock(return_value=None)
+        self.manager._submit_and_wait = mock.Mock()
+        self.manager._submit_each_and_wait = mock.Mock()
+
+    def test_not_routed(self):
+        host = _vertex('1', HOST)
+
+        self.manager.submit_graph_update(None, host, True)
+
+        self._assert_submitted(self.manager._all_queues, workers.GRAPH_UPDATE)
+
+    def test_vertex_update(self):
+        self._reload_templates([{HOST}, {INSTANCE}, None])
+        host = _vertex('1', HOST)
+
+        self.manager.submit_graph_update(None, host, True)
+
+        self._assert_submitted(['evaluator-0', 'evaluator-2', 'api-0'],
+                               workers.GRAPH_UPDATE)
+
+    def test_edge_update(self):
+        self._reload_templates([{HOST}, {HOST, INSTANCE}, None])
+        graph = NXGraph()
+        host = _vertex('1', HOST)
+        instance = _vertex('2', INSTANCE)
+        graph.add_vertex(host)
+        graph.add_vertex(instance)
+        edge = Edge('1', '2', EdgeLabel.CONTAINS)
+
+        self.manager.submit_graph_update(None, edge, False, graph)
+
+        self._assert_submitted(['evaluator-1', 'evaluator-2', 'api-0'],
+                               workers.GRAPH_UPDATE)
+
+    def test_edge_update_without_graph(self):
+        self._reload_templates([{HOST}, {INSTANCE}, None])
+        edge = Edge('1', '2', EdgeLabel.CONTAINS)
+
+        self.manager.submit_graph_update(None, edge, False)
+
+        self._assert_submitted(self.manager._all_queues, workers.GRAPH_UPDATE)
+
+    def test_reload_templates(self):
+        # the first partition does not reload the graphs
+        self._reload_templates([{HOST}, {HOST, INSTANCE}, {ZABBIX}])
+        self.manager._submit_and_wait.assert_not_called()
+
+        # only the workers that have new vertex types reload their graphs
+        self._reload_templates([{HOST, ZABBIX}, {HOST}, None])
+        self._assert_submitted(['evaluator-0', 'evaluator-2'],
+                               workers.READ_DB_GRAPH)
+
+        # a worker that had all the vertex types has all the graph
+        self._reload_templates([{HOST, ZABBIX}, {HOST}, {INSTANCE}])
+        self.manager._submit_and_wait.assert_not_called()
+
+    def test_reload_templates_not_routed(self):
+        self.manager._conf.evaluator.route_graph_updates = False
+
+        self._reload_templates([{HOST}, {INSTANCE}, None])
+
+        self.manager._submit_and_wait.assert_not_called()
+        self.assertIsNone(self.manager._evaluator_vertex_types)
+
+    def test_template_event(self):
+        self.manager._db = mock.Mock()
+        self.manager._db.templates.query.return_value = []
+        self._reload_templates([{HOST}, {INSTANCE}, None])
+
+        # the first evaluator worker receives all the graph
+        self.manager.submit_template_event({workers.TEMPLATE_ACTION:
+                                            workers.ADD})
+        self.assertEqual(
+            mock.call(['evaluator-0'], (workers.READ_DB_GRAPH,)),
+            self.manager._submit_and_wait.call_args_list[0])
+        self.assertEqual([None, {INSTANCE}, None],
+                         self.manager._evaluator_vertex_types)
+
+        # and is not reloaded again
+        self.manager._submit_and_wait.reset_mock()
+        self.manager.submit_template_event({workers.TEMPLATE_ACTION:
+                                            workers.ADD})
+        self.assertEqual(1, self.manager._submit_and_wait.call_count)
+        self.assertEqual(workers.TEMPLATE_ACTION,
+                         self.manager._submit_and_wait.call_args[0][1][0])
+
+        host = _vertex('1', HOST)
+        self.manager._submit_and_wait.reset_mock()
+        self.manager.submit_graph_update(None, host, True)
+        self._assert_submitted(['evaluator-0', 'evaluator-2', 'api-0'],
+                               workers.GRAPH_UPDATE)
+
+    def _reload_templates(self, vertex_types):
+        self.manager._submit_and_wait.reset_mock()
+        scenario_repo = mock.Mock()
+        scenario_repo.partition.return_value = [[i] for i in
+                                                range(len(vertex_types))]
+        scenario_repo.get_vertex_types.side_effect = \
+            lambda ids: vertex_types[ids[0]]
+        with mock.patch('vitrage.entity_graph.workers.ScenarioRepository',
+                        return_value=scenario_repo):
+            self.manager.submit_evaluators_reload_templates()
+
+    def _assert_submitted(self, queues, message_type):
+        self.manager._submit_and_wait.assert_called_once_with(
+            queues, mock.ANY)
+        payload = self.manager._submit_and_wait.call_args[0][1]
+        self.assertEqual(message_type, payload[0])
@@ -12,6 +12,9 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from vitrage.evaluator.template_functions import GET_ATTR
+from vitrage.evaluator.template_functions.function_resolver import \
+    compile_properties
 from vitrage.evaluator.template_functions.v2.functions import get_attr
 from vitrage.graph.driver import Vertex
 from vitrage.tests import base
@@ -52,6 +55,32 @@ class TemplateFunctionsTest(base.BaseTest):
         attr = get_attr(match, 'non_existing_entity', 'attr1')
         self.assertIsNone(attr)
 
+    def test_compile_properties(self):
+        properties = {
+            'workflow': 'wf_1',
+            'input': {'host_name': 'get_attr(host, name)', 'retries': 5},
+            'constant': {'force': False},
+        }
+        evaluate = compile_properties(properties, {GET_ATTR: get_attr})
+
+        result = evaluate(self._create_match('host', {'name': 'host-1'}))
+        self.assertEqual({'workflow': 'wf_1',
+                          'input': {'host_name': 'host-1', 'retries': 5},
+                          'constant': {'force': False}}, result)
+        self.assertIs(properties['constant'], result['constant'])
+
+        result = evaluate(self._create_match('host', {'name': 'host-2'}))
+        self.assertEqual('host-2', result['input']['host_name'])
+        self.assertEqual('get_attr(host, name)',
+                         properties['input']['host_name'])
+
+    def test_compile_properties_without_functions(self):
+        functions = {GET_ATTR: get_attr}
+        self.assertIsNone(compile_properties({'state': 'ERROR'}, functions))
+        self.assertIsNone(compile_properties(None, functions))
+        self.assertIsNone(compile_properties(
+            {'name': 'get_attr(host, name)'}, {}))
+
     @staticmethod
     def _create_match(template_id, properties):
         entity = Vertex(vertex_id='f89fe840-b595-4010-8a09-a444c7642865',
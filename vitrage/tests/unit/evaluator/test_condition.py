@@ -12,6 +12,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from testtools import matchers
+
+from vitrage.evaluator.condition import ConditionVar
+from vitrage.evaluator.condition import parse_condition
 from vitrage.evaluator.condition import SymbolResolver
 from vitrage.evaluator.template_data import EdgeDescription
 from vitrage.evaluator.template_validation.content.v1.scenario_validator \
@@ -86,6 +90,21 @@ class ConditionTest(base.BaseTest):
         self._check_get_condition_common_targets(
             'complex_not_unsupported.yaml', [])
 
+    def test_parse_condition_is_memoized(self):
+        condition_str = 'alarm_on_host and not host_contains_instance'
+        expected = [[ConditionVar('alarm_on_host', True),
+                     ConditionVar('host_contains_instance', False)]]
+
+        condition = parse_condition(condition_str)
+        self.assertEqual(sorted(expected[0]), sorted(condition[0]))
+
+        # modifying the result should not affect the following calls
+        condition[0].pop()
+        condition.append([])
+        self.assertEqual(sorted(expected[0]),
+                         sorted(parse_condition(condition_str)[0]))
+        self.assertThat(parse_condition(condition_str), matchers.HasLength(1))
+
     def _check_get_condition_common_targets(self,
                                             template_name,
                                             valid_targets):
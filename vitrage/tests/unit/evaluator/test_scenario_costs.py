@@ -0,0 +1,51 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from vitrage.evaluator import scenario_costs
+from vitrage.metrics.registry import MetricsRegistry
+from vitrage.tests import base
+
+
+class ScenarioCostsTest(base.BaseTest):
+
+    @staticmethod
+    def _worker_snapshot(scenario_id, triggers, wall_time):
+        metrics = MetricsRegistry()
+        metrics.increment('scenario_triggers', scenario_id, triggers)
+        metrics.increment('scenario_matchings', scenario_id, 2 * triggers)
+        metrics.increment('scenario_candidates', scenario_id, 10 * triggers)
+        metrics.increment('scenario_matches', scenario_id, triggers)
+        metrics.increment('scenario_actions', scenario_id, triggers)
+        metrics.observe('evaluate_scenario', scenario_id, wall_time)
+        return metrics.snapshot()
+
+    def test_scenario_costs(self):
+        snapshots = [self._worker_snapshot('cheap', 10, 0.5),
+                     self._worker_snapshot('expensive', 1, 3.0),
+                     self._worker_snapshot('cheap', 5, 0.25)]
+
+        costs = scenario_costs.get_scenario_costs(snapshots)
+        self.assertEqual({'triggers': 15,
+                          'matchings': 30,
+                          'candidates': 150,
+                          'matches': 15,
+                          'actions': 15,
+                          'wall_time': 0.75}, costs['cheap'])
+
+        top = scenario_costs.top_scenarios(costs)
+        self.assertEqual(['expensive', 'cheap'],
+                         [c['scenario'] for c in top])
+        self.assertEqual(['expensive'],
+                         [c['scenario'] for c in
+                          scenario_costs.top_scenarios(costs, 1)])
@@ -18,6 +18,7 @@ from testtools import matchers
 from vitrage.common.constants import EntityCategory
 from vitrage.common.constants import TemplateTypes as TType
 from vitrage.common.constants import VertexProperties as VProps
+from vitrage.evaluator.scenario_repository import partition_scenarios
 from vitrage.evaluator.scenario_repository import ScenarioRepository
 from vitrage.evaluator.template_validation.template_syntax_validator import \
     syntax_validation
@@ -98,6 +99,82 @@ class ScenarioRepositoryTest(base.BaseTest, TestConfiguration):
                 self.assertTrue(equivalent_props in
                                 self.scenario_repository.entity_scenarios)
 
+    def test_compiled_scenarios_are_reused(self):
+
+        # Test Action
+        scenario_repository = ScenarioRepository(self.conf, 0, 2)
+
+        # Test assertions
+        self.assertThat(scenario_repository._all_scenarios,
+                        matchers.HasLength(
+                            len(self.scenario_repository._all_scenarios)))
+        for scenario, other in zip(
+                scenario_repository._all_scenarios,
+                self.scenario_repository._all_scenarios):
+            self.assertIsNot(scenario, other)
+            self.assertIs(scenario.subgraphs, other.subgraphs)
+            self.assertIs(scenario.actions, other.actions)
+            self.assertTrue(other.enabled)
+
+        self.assertFalse(all(s.enabled
+                             for s in scenario_repository._all_scenarios))
+
+    def test_connected_components(self):
+        for scenario in self.scenario_repository._all_scenarios:
+            self.assertThat(scenario.connected_components,
+                            matchers.HasLength(len(scenario.subgraphs)))
+            for subgraph, components in zip(scenario.subgraphs,
+                                            scenario.connected_components):
+                for action in scenario.actions:
+                    target = action.targets['target']
+                    component = components[target]
+                    self.assertIsInstance(component, frozenset)
+                    self.assertIn(target, component)
+                    self.assertTrue(component.issubset(
+                        v.vertex_id for v in subgraph.get_vertices()))
+
+    def test_partition_scenarios(self):
+        costs = {'a': 7, 'b': 5, 'c': 4, 'd': 3, 'e': 1}
+
+        # Test Action
+        partitions = partition_scenarios(costs, 2)
+
+        # Test assertions
+        self.assertEqual([{'a', 'd'}, {'b', 'c', 'e'}], partitions)
+        self.assertEqual(partitions, partition_scenarios(costs, 2))
+        self.assertEqual([set(costs), set(), set()],
+                         partition_scenarios(costs, 1) + [set(), set()])
+
+    def test_partition_by_measured_costs(self):
+        scenario_ids = sorted(set(
+            s.id for s in self.scenario_repository._all_scenarios))
+        estimated_costs = self.scenario_repository.get_scenario_costs()
+        self.assertEqual(set(scenario_ids), set(estimated_costs))
+
+        # Test Action
+        expensive_id = scenario_ids[-1]
+        measured_costs = {scenario_id: 1.0
+                          for scenario_id in scenario_ids[1:]}
+        measured_costs[expensive_id] = 1000.0
+        costs = self.scenario_repository.get_scenario_costs(measured_costs)
+        partitions = self.scenario_repository.partition(2, measured_costs)
+
+        # Test assertions
+        self.assertEqual(measured_costs[expensive_id], costs[expensive_id])
+        scale = sum(measured_costs.values()) / sum(
+            estimated_costs[scenario_id] for scenario_id in measured_costs)
+        self.assertAlmostEqual(estimated_costs[scenario_ids[0]] * scale,
+                               costs[scenario_ids[0]])
+        self.assertIn({expensive_id}, partitions)
+        self.assertEqual(set(scenario_ids), partitions[0] | partitions[1])
+
+        scenario_repository = ScenarioRepository(
+            self.conf, scenario_ids=partitions[0])
+        self.assertEqual(
+            partitions[0],
+            set(s.id for s in scenario_repository._all_scenarios
+                if s.enabled))
+
     def test_get_scenario_by_edge(self):
         pass
 
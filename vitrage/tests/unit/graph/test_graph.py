@@ -18,10 +18,14 @@ test_vitrage graph
 
 Tests for `vitrage` graph driver
 """
+import pickle
+
 from testtools import matchers
 
 from vitrage.common.constants import EdgeProperties as EProps
 from vitrage.graph import Direction
+from vitrage.graph.driver.elements import Edge
+from vitrage.graph.driver.elements import Vertex
 from vitrage.graph.filter import check_filter
 from vitrage.graph import utils
 from vitrage.tests.base import IsEmpty
@@ -505,6 +509,68 @@ class TestGraph(GraphTestBase):
         self._check_callbacks_result('update edge', e_node_to_host,
                                      updated_edge)
 
+    def test_graph_version(self):
+        g = NXGraph('test_graph_version')
+        self.assertEqual(0, g.version)
+
+        # Every change increases the version, with or without subscribers
+        g.add_vertex(v_node)
+        g.add_vertex(v_host)
+        g.add_edge(e_node_to_host)
+        self.assertEqual(3, g.version)
+
+        g.subscribe(lambda *args: None)
+        updated_vertex = g.get_vertex(v_host.vertex_id)
+        updated_vertex['ZIG'] = 'ZAG'
+        g.update_vertex(updated_vertex)
+        g.remove_edge(e_node_to_host)
+        self.assertEqual(5, g.version)
+
+        # Reads do not change the version
+        g.get_vertices()
+        g.get_vertex(v_node.vertex_id)
+        self.assertEqual(5, g.version)
+
+        NXGraph.read_gpickle(NXGraph('other').write_gpickle(), g)
+        self.assertEqual(6, g.version)
+
+    def test_elements(self):
+        v = Vertex('v1', {'a': 1})
+        e = Edge('v1', 'v2', 'label', {'b': 2})
+        self.assertFalse(hasattr(v, '__dict__'))
+        self.assertFalse(hasattr(e, '__dict__'))
+        self.assertEqual({}, Vertex('v2').properties)
+
+        # The cached hash follows the identity of the edge
+        self.assertEqual(hash(e), hash(Edge('v1', 'v2', 'label')))
+        e.label = 'other_label'
+        self.assertEqual(hash(e), hash(Edge('v1', 'v2', 'other_label')))
+        self.assertEqual(1, len({e, e.copy()}))
+
+        for element in (v, e):
+            other = pickle.loads(pickle.dumps(element,
+                                              pickle.HIGHEST_PROTOCOL))
+            self.assertEqual(element, other)
+            self.assertEqual(hash(element), hash(other))
+        self.assertNotEqual(v, Vertex('v1', {'a': 2}))
+        self.assertNotEqual(e, Edge('v2', 'v1', 'other_label', {'b': 2}))
+        self.assertNotEqual(v, e)
+
+    def test_interned_property_keys(self):
+        key = ''.join(['dynamic', '_key'])
+        other_key = ''.join(['dynamic', '_key'])
+        self.assertIsNot(key, other_key)
+
+        g = NXGraph('test_interned_property_keys')
+        g.add_vertex(Vertex('v1', {key: 1}))
+        g.add_vertex(Vertex('v2', {other_key: 2}))
+        g.update_vertex(Vertex('v3', {other_key: 3}))
+
+        keys = [list(g.get_vertex(v_id).properties)[0]
+                for v_id in ('v1', 'v2', 'v3')]
+        self.assertIs(keys[0], keys[1])
+        self.assertIs(keys[0], keys[2])
+
     def test_union(self):
         v1 = v_node
         v2 = v_host
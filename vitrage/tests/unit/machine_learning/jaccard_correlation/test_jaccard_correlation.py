@@ -15,8 +15,11 @@
 import datetime
 import os.path
 from oslo_config import cfg
+import shutil
+import tempfile
 import time
 
+import mock
 from testtools import matchers
 
 from vitrage.common.constants import EntityCategory
@@ -26,8 +29,12 @@ from vitrage.datasources.transformer_base import TIMESTAMP_FORMAT
 from vitrage.datasources.zabbix import ZABBIX_DATASOURCE
 from vitrage.evaluator.actions import evaluator_event_transformer as evaluator
 from vitrage.graph import Vertex
+from vitrage.machine_learning.plugins.jaccard_correlation import \
+    accumulation_persistor_utils as APersistor
 from vitrage.machine_learning.plugins.jaccard_correlation.\
     accumulation_persistor_utils import AccumulatedData as AData
+from vitrage.machine_learning.plugins.jaccard_correlation.\
+    accumulation_persistor_utils import AccumulationStore
 from vitrage.machine_learning.plugins.jaccard_correlation.\
     alarm_data_accumulator import AlarmDataAccumulator as ADAccumulator
 from vitrage.machine_learning.plugins.jaccard_correlation.\
@@ -195,6 +202,150 @@ class JaccardCorrelationTest(base.BaseTest):
         self._test_correlation_collection()
         self._test_correlation_manager()
 
+    def test_max_active_alarms(self):
+        data_manager = ADAccumulator(AData({}, {}), max_active_alarms=2)
+        start = datetime.datetime.utcnow()
+        end = start + datetime.timedelta(minutes=10)
+
+        for alarm_id in self.alarm_ids:
+            data_manager.append_active(alarm_id, start)
+        for alarm_id in self.alarm_ids:
+            data_manager.append_inactive(alarm_id, end)
+
+        # all the alarms accumulate activity, but only the first two are
+        # correlated
+        self.assertThat(data_manager.alarms_activity,
+                        matchers.HasLength(len(self.alarm_ids)))
+        self.assert_dict_equal(
+            {frozenset(self.alarm_ids[:2]): datetime.timedelta(minutes=10)},
+            data_manager.alarms_intersects)
+        self.assertEqual(
+            [(self.alarm_ids[0], self.alarm_ids[1], 1.0)],
+            list(data_manager.jaccard_scores()))
+
+    def test_accumulation_store(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        store = AccumulationStore(folder, compaction_interval=3)
+        data_manager = ADAccumulator(store.load())
+        start = datetime.datetime.utcnow()
+
+        # the first save writes a snapshot, the next ones are journaled
+        for minutes in (1, 2, 3):
+            end = start + datetime.timedelta(minutes=minutes)
+            data_manager.append_active(self.alarm_ids[0], start)
+            data_manager.append_active(self.alarm_ids[1], start)
+            data_manager.append_inactive(self.alarm_ids[0], end)
+            data_manager.append_inactive(self.alarm_ids[1], end)
+            store.save(data_manager)
+
+        self.assertTrue(os.path.isfile(store.snapshot_path))
+        self.assertThat(os.path.getsize(store.journal_path),
+                        matchers.GreaterThan(0))
+        self._assert_accumulations_equal(
+            data_manager, AccumulationStore(folder, 3).load())
+
+        # a partially written journal record is discarded
+        journal_size = os.path.getsize(store.journal_path)
+        with open(store.journal_path, 'ab') as journal_f:
+            journal_f.write(b'\x80\x02}q')
+        self._assert_accumulations_equal(
+            data_manager, AccumulationStore(folder, 3).load())
+        self.assertEqual(journal_size, os.path.getsize(store.journal_path))
+
+        # the third save since the compaction compacts the journal
+        store.save(data_manager)
+        self.assertEqual(0, os.path.getsize(store.journal_path))
+        self._assert_accumulations_equal(
+            data_manager, AccumulationStore(folder, 3).load())
+
+    def test_accumulation_store_crash_during_compaction(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        store = AccumulationStore(folder, compaction_interval=3)
+        data_manager = ADAccumulator(store.load())
+        start = datetime.datetime.utcnow()
+
+        def save(minutes):
+            end = start + datetime.timedelta(minutes=minutes)
+            data_manager.append_active(self.alarm_ids[0], start)
+            data_manager.append_active(self.alarm_ids[1], start)
+            data_manager.append_inactive(self.alarm_ids[0], end)
+            data_manager.append_inactive(self.alarm_ids[1], end)
+            store.save(data_manager)
+
+        # a snapshot, and two journal records
+        for minutes in (1, 2, 3):
+            save(minutes)
+
+        # crash after replacing the snapshot, before emptying the journal
+        atomic_write = APersistor._atomic_write
+
+        def crashing_atomic_write(path, content):
+            if path == store.journal_path:
+                raise IOError('crash')
+            atomic_write(path, content)
+
+        with mock.patch.object(APersistor, '_atomic_write',
+                               side_effect=crashing_atomic_write):
+            save(4)
+        self.assertThat(os.path.getsize(store.journal_path),
+                        matchers.GreaterThan(0))
+
+        # the older journal records are not replayed over the snapshot
+        self._assert_accumulations_equal(
+            data_manager, AccumulationStore(folder, 3).load())
+
+        # and neither after more records are journaled
+        store = AccumulationStore(folder, 3)
+        data_manager = ADAccumulator(store.load())
+        save(5)
+        self._assert_accumulations_equal(
+            data_manager, AccumulationStore(folder, 3).load())
+
+    def test_incremental_correlations_report(self):
+        conf = cfg.ConfigOpts()
+        conf.register_opts(self.OPTS, group='jaccard_correlation')
+        conf.set_override('correlation_threshold', 0.3,
+                          group='jaccard_correlation')
+        # the last two alarms are of the same types as the first two
+        alarm_ids = [AlarmID('r%s' % i, 'type%s' % (i % 4), 'alarm%s' % i)
+                     for i in range(6)]
+        data_manager = ADAccumulator(AData({}, {}))
+        incremental_manager = CManager(conf)
+        full_manager = CManager(conf)
+        start = datetime.datetime(2019, 1, 1)
+
+        for round_index in range(8):
+            for i, alarm_id in enumerate(alarm_ids):
+                if (round_index + i) % 3:
+                    begin = start + datetime.timedelta(
+                        minutes=10 * round_index + i)
+                    data_manager.append_active(alarm_id, begin)
+            for i, alarm_id in enumerate(alarm_ids):
+                end = start + datetime.timedelta(
+                    minutes=10 * round_index + 5 + (round_index * i) % 4)
+                data_manager.append_inactive(alarm_id, end)
+            changes = data_manager.pop_changes()
+
+            incremental_report = dict(incremental_manager._generate_report(
+                data_manager, changes))
+            full_report = dict(full_manager._generate_report(data_manager))
+
+            self.assertEqual(set(full_report), set(incremental_report))
+            for level, correlations in full_report.items():
+                expected = dict(correlations)
+                observed = dict(incremental_report[level])
+                self.assertEqual(set(expected), set(observed))
+                for key, score in expected.items():
+                    self.assertAlmostEqual(score, observed[key])
+
+    def _assert_accumulations_equal(self, data_manager, accumulated_data):
+        self.assert_dict_equal(data_manager.alarms_activity,
+                               accumulated_data.activity)
+        self.assert_dict_equal(data_manager.alarms_intersects,
+                               accumulated_data.intersection)
+
     def _test_alarm_data_accumulations(self):
         self._test_append_active()
         self._test_flush_accumulations()
@@ -237,8 +388,8 @@ class JaccardCorrelationTest(base.BaseTest):
         time.sleep(2)
         self.data_manager.flush_accumulations()
 
-        self.assert_dict_equal(prev_active_start_dict,
-                               self.data_manager.active_start_times)
+        self.assertEqual(set(prev_active_start_dict),
+                         set(self.data_manager.active_start_times))
 
         expected_activity_dict_len = len(ACTIVE_ALARMS)
         self.assertThat(self.data_manager.alarms_activity,
@@ -336,7 +487,11 @@ class JaccardCorrelationTest(base.BaseTest):
                                         correlation)
                     cnt += 1
 
-        self.assert_list_equal(alarms_pairs, self.collection.correlation_list)
+        # every pair of alarms is of a different pair of alarm types
+        expected_totals = {
+            CCollection._get_key(pair[:3], pair[3:6]): [pair[7], 1]
+            for pair in alarms_pairs}
+        self.assert_dict_equal(expected_totals, self.collection._totals)
 
     def _test_correlations_aggregation(self):
 
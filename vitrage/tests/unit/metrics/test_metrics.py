@@ -0,0 +1,113 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import gc
+import os
+import shutil
+import tempfile
+import time
+
+from vitrage.metrics import registry
+from vitrage.metrics.sampling_profiler import SamplingProfiler
+from vitrage.tests import base
+from vitrage.utils import gc as gc_utils
+
+
+class MetricsTest(base.BaseTest):
+
+    def test_registry(self):
+        metrics = registry.MetricsRegistry()
+        metrics.increment('events', 'nova.host')
+        metrics.increment('events', 'nova.host', 2)
+        metrics.observe('transform', 'nova.host', 0.002)
+        metrics.observe('transform', 'nova.host', 0.02)
+        with metrics.timer('transform', 'zabbix'):
+            pass
+        metrics.set_gauge('queue_depth', 'worker', lambda: 7)
+        metrics.set_gauge('queue_depth', 'broken', lambda: 1 / 0)
+
+        result = metrics.snapshot()
+        self.assertEqual({'nova.host': 3}, result['counters']['events'])
+        self.assertEqual({'worker': 7, 'broken': None},
+                         result['gauges']['queue_depth'])
+
+        histogram = result['histograms']['transform']['nova.host']
+        self.assertEqual(2, histogram['count'])
+        self.assertAlmostEqual(0.022, histogram['sum'])
+        self.assertAlmostEqual(0.02, histogram['max'])
+        self.assertEqual({'<=0.005': 1, '<=0.05': 1}, histogram['buckets'])
+        self.assertEqual(
+            1, result['histograms']['transform']['zabbix']['count'])
+
+        metrics.enabled = False
+        metrics.increment('events', 'nova.host')
+        with metrics.timer('transform', 'zabbix'):
+            pass
+        result = metrics.snapshot()
+        self.assertEqual({'nova.host': 3}, result['counters']['events'])
+        self.assertEqual(
+            1, result['histograms']['transform']['zabbix']['count'])
+
+    def test_dump_and_load(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+
+        registry.dump(folder)
+        dumps = registry.load_dumps(folder, 60)
+        self.assertEqual(1, len(dumps))
+        self.assertEqual(os.getpid(), dumps[0]['pid'])
+
+        # dumps of processes that are gone are ignored
+        old_time = time.time() - 120
+        os.utime(registry.dump_path(folder), (old_time, old_time))
+        self.assertEqual([], registry.load_dumps(folder, 60))
+
+    def test_sampling_profiler(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+
+        profiler = SamplingProfiler(0.001)
+        profiler.start()
+        self.assertTrue(profiler.running)
+        time.sleep(0.05)
+        profiler.stop()
+        self.assertFalse(profiler.running)
+
+        path = os.path.join(folder, 'profile.stacks')
+        profiler.dump(path)
+        with open(path) as f:
+            stacks = f.read()
+        self.assertIn('test_sampling_profiler', stacks)
+
+    def test_gc_pause_metrics(self):
+        if not hasattr(gc, 'callbacks'):
+            self.skipTest('gc callbacks are not supported')
+        self.addCleanup(registry.REGISTRY.reset)
+        self.addCleanup(gc.callbacks.remove, gc_utils._on_collection)
+
+        gc_utils.register_pause_metrics()
+        gc_utils.register_pause_metrics()
+        gc.collect()
+
+        self.assertEqual(1, gc.callbacks.count(gc_utils._on_collection))
+        pauses = registry.REGISTRY.snapshot()['gauges']['gc_pause']
+        self.assertEqual(1, pauses['generation2']['count'])
+        self.assertGreater(pauses['generation2']['max'], 0)
+
+    def test_interval_collector(self):
+        collector = gc_utils.IntervalCollector(0)
+        self.assertTrue(collector.maybe_collect())
+        self.assertTrue(collector.maybe_collect())
+
+        collector = gc_utils.IntervalCollector(3600)
+        self.assertFalse(collector.maybe_collect())
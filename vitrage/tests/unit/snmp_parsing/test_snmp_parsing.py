@@ -13,6 +13,7 @@
 # under the License.
 
 import copy
+import mock
 from oslo_config import cfg
 
 from pysnmp.proto.rfc1902 import Integer
@@ -21,6 +22,7 @@ from pysnmp.proto.rfc1902 import ObjectName
 from pysnmp.proto.rfc1902 import OctetString
 from pysnmp.proto.rfc1902 import TimeTicks
 
+from vitrage.metrics import registry as metrics
 from vitrage.snmp_parsing.service import SnmpParsingService
 from vitrage.tests import base
 
@@ -116,6 +118,9 @@ class TestSnmpParsing(base.BaseTest):
                    default='vitrage/tests/resources/snmp_parsing/'
                            'snmp_parsing_conf.yaml',
                    help='The default path of oid_mapping yaml file'),
+        cfg.IntOpt('workers', default=2),
+        cfg.IntOpt('queue_size', default=2),
+        cfg.IntOpt('publish_batch_size', default=100),
     ]
 
     # noinspection PyPep8Naming
@@ -145,3 +150,66 @@ class TestSnmpParsing(base.BaseTest):
         parsing_service = SnmpParsingService(1, self.conf)
         event_type = parsing_service._get_event_type(converted_trap_diff_sys)
         self.assertIsNone(event_type)
+
+    def test_get_event_type_by_mapping_order(self):
+        parsing_service = SnmpParsingService(1, self.conf)
+        parsing_service.oid_mapping = [
+            {'system_oid': u'1.3.6.1.4.1.3902.4101.1.3.1.2',
+             'system': 'other', 'event_type': 'other.event'},
+            {'system_oid': u'1.3.6.1.4.1.3902.4101.1.3.1.12',
+             'system': 'Tecs Director', 'event_type': 'first.event'},
+            {'system_oid': u'1.3.6.1.4.1.3902.4101.1.3.1.2',
+             'system': 'host', 'event_type': 'second.event'},
+        ]
+        parsing_service._oid_index = \
+            parsing_service._build_oid_index(parsing_service.oid_mapping)
+        event_type = parsing_service._get_event_type(DICT_EXPECTED)
+        self.assertEqual('first.event', event_type)
+
+    def test_callback_drops_traps_when_queue_is_full(self):
+        parsing_service = SnmpParsingService(1, self.conf)
+        for i in range(3):
+            parsing_service.callback_func(None, None, None, b'trap')
+
+        stats = parsing_service.stats()
+        self.assertEqual(2, stats['received'])
+        self.assertEqual(1, stats['dropped'])
+        self.assertEqual(2, stats['trap_queue_depth'])
+
+    def test_send_snmp_to_queue(self):
+        parsing_service = SnmpParsingService(1, self.conf)
+        parsing_service.oslo_notifier = mock.Mock()
+        event = parsing_service._create_event(DICT_EXPECTED)
+        parsing_service._send_snmp_to_queue([event, event])
+
+        self.assertEqual(2, parsing_service.oslo_notifier.info.call_count)
+        self.assertEqual(2, parsing_service.stats()['published'])
+
+    def test_stats_gauges(self):
+        self.addCleanup(metrics.REGISTRY.reset)
+        parsing_service = SnmpParsingService(1, self.conf)
+        parsing_service.register_stats_gauges()
+        for i in range(3):
+            parsing_service.callback_func(None, None, None, b'trap')
+
+        gauges = metrics.snapshot()['gauges']
+        self.assertEqual(2, gauges['snmp_traps']['received'])
+        self.assertEqual(1, gauges['snmp_traps']['dropped'])
+        self.assertEqual(0, gauges['snmp_traps']['unmapped'])
+        self.assertEqual(2, gauges['queue_depth']['snmp_traps'])
+        self.assertEqual(0, gauges['queue_depth']['snmp_events'])
+
+    @mock.patch('vitrage.snmp_parsing.service.LOG')
+    @mock.patch('time.sleep')
+    def test_stats_are_logged_without_publishing(self, mock_sleep, mock_log):
+        # the second sleep stops the logging loop
+        mock_sleep.side_effect = [None, StopIteration()]
+        parsing_service = SnmpParsingService(1, self.conf)
+        parsing_service._count('unmapped', 5)
+
+        self.assertRaises(StopIteration,
+                          parsing_service._log_stats_periodically)
+
+        mock_log.info.assert_called_once_with('Snmp parsing stats: %s',
+                                              parsing_service.stats())
+        self.assertEqual(5, mock_log.info.call_args[0][1]['unmapped'])
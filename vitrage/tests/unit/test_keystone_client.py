@@ -0,0 +1,61 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import os
+
+import mock
+from oslo_config import cfg
+
+from vitrage import keystone_client
+from vitrage.tests import base
+
+
+class KeystoneClientSessionTest(base.BaseTest):
+
+    def setUp(self):
+        super(KeystoneClientSessionTest, self).setUp()
+        self.conf = self._create_conf(pool_size=3)
+
+    @staticmethod
+    def _create_conf(pool_size):
+        conf = cfg.ConfigOpts()
+        conf.register_opts(keystone_client.OPTS,
+                           group=keystone_client.CFG_GROUP)
+        keystone_client.register_keystoneauth_opts(conf)
+        conf.set_override('connection_pool_size', pool_size,
+                          group=keystone_client.CFG_GROUP)
+        conf([])
+        return conf
+
+    def test_session_is_shared(self):
+        session = keystone_client.get_session(self.conf)
+
+        self.assertIs(session, keystone_client.get_session(self.conf))
+        self.assertIsNot(session, keystone_client.get_session(
+            self._create_conf(pool_size=3)))
+
+    def test_session_connection_pool(self):
+        session = keystone_client.get_session(self.conf)
+
+        for scheme in ('https://', 'http://'):
+            adapter = session.session.get_adapter(scheme + 'example.com')
+            self.assertEqual(3, adapter._pool_maxsize)
+            self.assertEqual(3, adapter._pool_connections)
+
+    def test_forked_process_creates_a_session(self):
+        session = keystone_client.get_session(self.conf)
+
+        with mock.patch('os.getpid', return_value=os.getpid() + 1):
+            forked_session = keystone_client.get_session(self.conf)
+
+        self.assertIsNot(session, forked_session)
@@ -0,0 +1,98 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import threading
+import time
+
+from vitrage import messaging
+from vitrage.tests import base
+
+
+class RecordingEndpoint(object):
+
+    filter_rule = 'some rule'
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.handled = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def info(self, ctxt, publisher_id, event_type, payload, metadata):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+            self.handled.append((event_type, payload))
+
+
+class KeyedExecutorTest(base.BaseTest):
+
+    def test_keyed_endpoint(self):
+        endpoint = RecordingEndpoint()
+        keyed_endpoint = messaging.KeyedEndpoint(
+            endpoint, messaging.KeyedExecutor(2), lambda t, p: p['key'])
+
+        self.assertEqual('some rule', keyed_endpoint.filter_rule)
+        self.assertTrue(hasattr(keyed_endpoint, 'info'))
+        self.assertFalse(hasattr(keyed_endpoint, 'error'))
+
+    def test_order_per_key(self):
+        endpoint = RecordingEndpoint(delay=0.001)
+        executor = messaging.KeyedExecutor(4, queue_size=2)
+        keyed_endpoint = messaging.KeyedEndpoint(
+            endpoint, executor, lambda t, p: p['key'])
+
+        for i in range(40):
+            keyed_endpoint.info({}, 'publisher', 'event',
+                                {'key': i % 5, 'seq': i}, {})
+        executor.join()
+
+        self.assertEqual(40, len(endpoint.handled))
+        self.assertGreater(endpoint.max_running, 1)
+        for key in range(5):
+            sequence = [p['seq'] for _, p in endpoint.handled
+                        if p['key'] == key]
+            self.assertEqual(sorted(sequence), sequence)
+
+    def test_event_without_key(self):
+        endpoint = RecordingEndpoint(delay=0.01)
+        executor = messaging.KeyedExecutor(4)
+        keyed_endpoint = messaging.KeyedEndpoint(
+            endpoint, executor, lambda t, p: p.get('key'))
+
+        for i in range(8):
+            keyed_endpoint.info({}, 'publisher', 'event', {'key': i}, {})
+        keyed_endpoint.info({}, 'publisher', 'barrier', {}, {})
+
+        # handled after all the preceding events, by the calling thread
+        self.assertEqual(9, len(endpoint.handled))
+        self.assertEqual('barrier', endpoint.handled[-1][0])
+
+    def test_failure_does_not_stop_the_worker(self):
+        handled = []
+
+        def handle(value):
+            if value == 0:
+                raise Exception('failure')
+            handled.append(value)
+
+        executor = messaging.KeyedExecutor(1)
+        for i in range(3):
+            executor.submit('key', handle, i)
+        executor.join()
+
+        self.assertEqual([1, 2], handled)
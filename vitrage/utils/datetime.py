@@ -14,6 +14,7 @@
 
 from __future__ import absolute_import
 
+import calendar
 from datetime import datetime
 from datetime import timedelta
 from dateutil import parser
@@ -22,6 +23,11 @@ from oslo_utils import timeutils
 
 TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
 
+# Many entities share the same sample timestamp, so parsed timestamps
+# are cached
+MAX_CACHED_EPOCHS = 10000
+_epochs = {}
+
 
 def utcnow(with_timezone=True):
     """Better version of utcnow() that returns utcnow with a correct TZ."""
@@ -52,3 +58,22 @@ def format_unix_timestamp(timestamp, date_format=TIMESTAMP_FORMAT):
 def format_timestamp(timestamp_str, new_format=TIMESTAMP_FORMAT):
     return parser.parse(timestamp_str).strftime(new_format) if timestamp_str \
         else None
+
+
+def datetime_to_epoch(timestamp):
+    """Seconds since the epoch. A naive datetime is considered UTC"""
+    return calendar.timegm(timestamp.utctimetuple()) + \
+        timestamp.microsecond / 1000000.0
+
+
+def to_epoch(timestamp_str):
+    """Seconds since the epoch of a timestamp string, in any format"""
+    if isinstance(timestamp_str, datetime):
+        return datetime_to_epoch(timestamp_str)
+    epoch = _epochs.get(timestamp_str)
+    if epoch is None:
+        if len(_epochs) >= MAX_CACHED_EPOCHS:
+            _epochs.clear()
+        epoch = datetime_to_epoch(parser.parse(timestamp_str))
+        _epochs[timestamp_str] = epoch
+    return epoch
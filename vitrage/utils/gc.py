@@ -0,0 +1,94 @@
+# Copyright 2019 - Nokia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from __future__ import absolute_import
+
+import gc
+import time
+
+from oslo_log import log
+
+from vitrage.metrics import registry as metrics
+
+LOG = log.getLogger(__name__)
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class IntervalCollector(object):
+    """Runs a full collection at most once in an interval
+
+    The generational thresholds collect the short lived garbage anyway, so
+    a full collection is needed only to bound the memory of cyclic garbage
+    that survived to the oldest generation.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._last_collection = _clock()
+
+    def maybe_collect(self):
+        now = _clock()
+        if now - self._last_collection < self.interval:
+            return False
+        self._last_collection = now
+        gc.collect()
+        return True
+
+
+def freeze():
+    """Exclude all the existing objects from the future collections
+
+    Called after loading large long lived structures, such as the entity
+    graph and the scenario repository, so that the collections do not walk
+    them over and over. Frozen objects are still freed once unreferenced,
+    unless they are part of a reference cycle.
+    """
+    if not hasattr(gc, 'freeze'):
+        return
+    gc.unfreeze()
+    gc.collect()
+    gc.freeze()
+    LOG.info('Froze %s objects', gc.get_freeze_count())
+
+
+_pauses = {}
+_pause_start = [None]
+
+
+def register_pause_metrics():
+    """Measure the pauses of the collections, per generation
+
+    The pauses are kept apart from the metrics registry, since a collection
+    may start while the registry lock is held, and are reported as gauges.
+    Called after metrics.setup(), that removes the gauges.
+    """
+    if not hasattr(gc, 'callbacks'):
+        return
+    if _on_collection not in gc.callbacks:
+        gc.callbacks.append(_on_collection)
+    for generation in range(len(gc.get_threshold())):
+        histogram = _pauses[generation] = metrics.Histogram()
+        metrics.set_gauge('gc_pause', 'generation%s' % generation,
+                          histogram.to_dict)
+
+
+def _on_collection(phase, info):
+    if phase == 'start':
+        _pause_start[0] = _clock()
+    elif phase == 'stop' and _pause_start[0] is not None:
+        histogram = _pauses.get(info.get('generation'))
+        if histogram is not None:
+            histogram.observe(_clock() - _pause_start[0])
+        _pause_start[0] = None